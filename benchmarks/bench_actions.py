@@ -0,0 +1,248 @@
+# benchmarks/bench_actions.py
+"""
+Micro-benchmarks de las estrategias de utils/actions/ (una operación por Action).
+
+Levanta la app local (mock_app/server.py, sin latencia por defecto) y, para
+cada operación, carga el formulario suelto `/fixture/<form>` en Chrome
+headless, prepara lo necesario (p.ej. el "Si" que habilita '°C') y mide solo
+la llamada a la Action: tiempo de pared y número de comandos WebDriver
+(utils/driver_profiler.py). Tras cada repetición comprueba en
+`window.MOCK.values` que el valor quedó puesto.
+
+Operaciones:
+    text, text_bulk      TextActions.campo_texto_por_label / llenar_campos
+    select, select_multi SelectActions.seleccion_simple / seleccion_multiple
+    endpoint             SelectActions.campo_endpoint (lupa + red)
+    date                 DateActions.escribir_fecha
+    numeric              NumericActions.campo_numerico
+    table                TableActions.marcar_tabla_riesgos
+    signature            SignatureActions.campo_firma
+    file                 FileActions.subir_archivo
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_actions --reps 5 --out artifacts/bench_actions.json
+    python -m benchmarks.bench_actions --only select,select_multi --render-ms 150
+    python -m benchmarks.bench_actions --compare artifacts/bench_actions.json   # contra un JSON previo
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from benchmarks.bench_upload import _commit, _percentil
+from mock_app.server import start_server
+from utils.actions.date_actions import DateActions
+from utils.actions.file_actions import FileActions
+from utils.actions.form_index import FormIndex
+from utils.actions.numeric_actions import NumericActions
+from utils.actions.select_actions import SelectActions
+from utils.actions.signature_actions import SignatureActions
+from utils.actions.table_actions import TableActions
+from utils.actions.text_actions import TextActions
+from utils.browser import build_driver
+from utils.driver_profiler import DriverProfiler, profiler_de
+from utils.fixture_files import imagen_png
+
+TABLA = "//*[@id='auto-fields']/div[1]/div[1]/div/div/table"
+LUPA_EMPRESA = "//*[@id='auto-fields']/div[1]/div[7]/button"
+TRABAJADORES = ["KATE BULA - 123654", "ANA GOMEZ - 556677"]
+
+# nombre → (Action, formulario, preparar(ctx) | None, operación(ctx), valores esperados)
+# En los esperados, True = "hay algún valor" (firma, foto).
+OPERACIONES = {
+    "text": (
+        "TextActions", "f1a", None,
+        lambda c: TextActions(c["driver"], c["wait"]).campo_texto_por_label("Orden de trabajo", "OT-bench"),
+        {"Orden de trabajo": "OT-bench"},
+    ),
+    "text_bulk": (
+        "TextActions", "f1a", None,
+        lambda c: TextActions(c["driver"], c["wait"]).llenar_campos({
+            "Orden de trabajo": "OT-bench", "Responsable del trabajo": "CESAR SIERRA",
+            "Descripcion del trabajo": "revision de chimeneas"}),
+        {"Orden de trabajo": "OT-bench", "Responsable del trabajo": "CESAR SIERRA",
+         "Descripcion del trabajo": "revision de chimeneas"},
+    ),
+    "select": (
+        "SelectActions", "f1a", None,
+        lambda c: SelectActions(c["driver"], c["wait"]).seleccion_simple("Supervisor TEBSA", "ALBERTO ESCAÑO"),
+        {"Supervisor TEBSA": "ALBERTO ESCAÑO"},
+    ),
+    "select_multi": (
+        "SelectActions", "f10n", None,
+        lambda c: SelectActions(c["driver"], c["wait"]).seleccion_multiple("Trabajadores", TRABAJADORES),
+        {"Trabajadores": TRABAJADORES},
+    ),
+    "endpoint": (
+        "SelectActions", "f1a", None,
+        lambda c: SelectActions(c["driver"], c["wait"]).campo_endpoint(
+            LUPA_EMPRESA, "Empresa que ejecuta el trabajo", "Metales"),
+        {"Empresa que ejecuta el trabajo": "Metales"},
+    ),
+    "date": (
+        "DateActions", "f1a", None,
+        lambda c: DateActions(c["driver"], c["wait"]).escribir_fecha("Vigente desde", "01/09/2025 10:25 AM"),
+        {"Vigente desde": "2025-09-01T10:25"},
+    ),
+    "numeric": (
+        "NumericActions", "f7n",
+        lambda c: SelectActions(c["driver"], c["wait"]).seleccion_simple("Temperaturas extremas", "Si"),
+        lambda c: NumericActions(c["driver"], c["wait"]).campo_numerico("°C", 55),
+        {"°C": "55"},
+    ),
+    "table": (
+        "TableActions", "f7n", None,
+        lambda c: TableActions(c["driver"], c["wait"]).marcar_tabla_riesgos(TABLA, {"Trabajos en Altura": "Si"}),
+        {"Riesgos": {"Trabajos en Altura": "Si", "Espacios Confinados": "No"}},
+    ),
+    "signature": (
+        "SignatureActions", "f10ac", None,
+        lambda c: SignatureActions(c["driver"], c["wait"]).campo_firma("Firma"),
+        {"Firma": True},
+    ),
+    "file": (
+        "FileActions", "f11", None,
+        lambda c: FileActions(c["driver"], c["wait"]).subir_archivo("Seleccionar una foto", c["png"], timeout=60),
+        {"Foto del permiso firmado": True},
+    ),
+}
+
+
+def _cumple(valores: dict, esperado: dict) -> bool:
+    for clave, v in esperado.items():
+        real = valores.get(clave)
+        if v is True:
+            if not real:
+                return False
+        elif isinstance(v, dict):
+            if not isinstance(real, dict) or not _cumple(real, v):
+                return False
+        elif real != v:
+            return False
+    return True
+
+
+def _cargar_fixture(driver, wait, url: str):
+    driver.get(url)
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#auto-fields label, #auto-fields table")))
+    FormIndex.invalidate_for(driver)
+
+
+def medir(ctx: dict, base_url: str, nombre: str, reps: int, warmup: int) -> dict:
+    action, form, preparar, operacion, esperado = OPERACIONES[nombre]
+    driver, wait, prof = ctx["driver"], ctx["wait"], ctx["prof"]
+    url = f"{base_url}/fixture/{form}"
+    tiempos, comandos, fallos = [], [], []
+    for i in range(warmup + reps):
+        _cargar_fixture(driver, wait, url)
+        if preparar:
+            preparar(ctx)
+            FormIndex.invalidate_for(driver)
+        prof.reset()
+        t0 = time.perf_counter()
+        try:
+            operacion(ctx)
+            error = None
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        dur_ms = (time.perf_counter() - t0) * 1000
+        n_cmd = prof.total[0]
+        if error is None and not _cumple(driver.execute_script("return window.MOCK.values || {};"), esperado):
+            error = "valor no aplicado"
+        if i < warmup:
+            continue
+        if error:
+            fallos.append(error)
+            continue
+        tiempos.append(dur_ms)
+        comandos.append(n_cmd)
+
+    res = {"name": nombre, "action": action, "form": form, "reps": reps, "ok": len(tiempos)}
+    if tiempos:
+        res["ms"] = {"min": round(min(tiempos), 1), "median": round(statistics.median(tiempos), 1),
+                     "p95": round(_percentil(tiempos, 95), 1), "max": round(max(tiempos), 1)}
+        res["commands"] = {"median": statistics.median(comandos), "max": max(comandos)}
+    if fallos:
+        res["failures"] = sorted(set(fallos))
+    return res
+
+
+def comparar(resultados: list, ruta_previa: str):
+    """Imprime la diferencia de mediana (ms y comandos) contra un JSON previo de este benchmark."""
+    with open(ruta_previa, "r", encoding="utf-8") as f:
+        previo = json.load(f)
+    antes = {r["name"]: r for r in previo.get("results", []) if r.get("ms")}
+    print(f"📊 Comparación con {ruta_previa} (commit {previo.get('commit')})")
+    for r in resultados:
+        a = antes.get(r["name"])
+        if not a or not r.get("ms"):
+            continue
+        ms0, ms1 = a["ms"]["median"], r["ms"]["median"]
+        delta = f"{100 * (ms1 / ms0 - 1):+.0f}%" if ms0 else "n/a"
+        print(f"   {r['name']:<13} {ms0:8.1f} → {ms1:8.1f} ms ({delta})   "
+              f"{a['commands']['median']:g} → {r['commands']['median']:g} cmd")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Micro-benchmarks de las Actions (utils/actions/)")
+    ap.add_argument("--only", help=f"Operaciones separadas por coma (defecto: todas): {','.join(OPERACIONES)}")
+    ap.add_argument("--reps", type=int, default=5)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--latency-ms", type=float, default=0, help="Latencia de la app local en cada petición /api")
+    ap.add_argument("--render-ms", type=float, default=0, help="Retardo de pintado de opciones en la app local")
+    ap.add_argument("--headed", action="store_true", help="Chrome con ventana (por defecto headless)")
+    ap.add_argument("--out", help="Ruta del JSON de resultados (por defecto solo stdout)")
+    ap.add_argument("--compare", help="JSON previo de este benchmark para mostrar la diferencia")
+    args = ap.parse_args(argv)
+
+    nombres = [n.strip() for n in args.only.split(",")] if args.only else list(OPERACIONES)
+    desconocidas = [n for n in nombres if n not in OPERACIONES]
+    if desconocidas:
+        ap.error(f"operaciones desconocidas: {', '.join(desconocidas)}")
+
+    servidor, url = start_server(latency_ms=args.latency_ms, render_ms=args.render_ms, toast_ms=0, roles={})
+    driver = build_driver(headless=not args.headed)
+    prof = profiler_de(driver) or DriverProfiler(driver).install()
+    resultados = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_actions_") as tmp:
+            ctx = {"driver": driver, "wait": WebDriverWait(driver, 15), "prof": prof,
+                   "png": imagen_png(50, directorio=tmp)}
+            for nombre in nombres:
+                r = medir(ctx, url, nombre, args.reps, args.warmup)
+                resultados.append(r)
+                if r.get("ms"):
+                    print(f"📊 {nombre:<13} {r['ms']['median']:8.1f} ms (mediana)  "
+                          f"{r['commands']['median']:g} cmd  {r['ok']}/{r['reps']} ok")
+                else:
+                    print(f"❌ {nombre:<13} sin repeticiones válidas: {r.get('failures')}")
+    finally:
+        driver.quit()
+        servidor.shutdown()
+
+    salida = {
+        "benchmark": "actions",
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "latency_ms": args.latency_ms,
+        "render_ms": args.render_ms,
+        "results": resultados,
+    }
+    if args.compare:
+        comparar(resultados, args.compare)
+    texto = json.dumps(salida, indent=2, ensure_ascii=False)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(texto)
+    print(texto)
+
+
+if __name__ == "__main__":
+    main()
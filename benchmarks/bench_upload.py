@@ -0,0 +1,167 @@
+# benchmarks/bench_upload.py
+"""
+Benchmark de subida de archivos (FileActions.subir_archivo) por tamaño.
+
+Levanta un servidor local (http.server) que imita el campo de foto de F11:
+un botón "Seleccionar una foto" que inyecta un <input type='file'>; al
+elegir archivo el front hace POST /upload. Para cada tamaño genera un PNG
+(utils/fixture_files.py), lo sube N veces en Chrome y mide latencia
+(click → fin de la petición) y throughput.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_upload --sizes 50,200,1000,5000 --reps 5
+    python -m benchmarks.bench_upload --latency-ms 150 --out artifacts/bench_upload.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.actions.file_actions import FileActions
+from utils.browser import build_driver
+from utils.fixture_files import imagen_png
+
+BOTON = "Seleccionar una foto"
+
+PAGINA = """<!doctype html>
+<html><head><meta charset="utf-8"><title>bench upload</title></head>
+<body>
+  <div class="photo-field">
+    <button type="button" id="btn">Seleccionar una foto</button>
+    <div class="selected-photos">No hay fotos seleccionadas</div>
+  </div>
+<script>
+document.getElementById('btn').addEventListener('click', () => {
+  if (document.querySelector('input[type=file]')) return;
+  const inp = document.createElement('input');
+  inp.type = 'file';
+  inp.accept = 'image/*';
+  inp.style.display = 'none';
+  inp.addEventListener('change', () => {
+    const f = inp.files[0];
+    fetch('/upload', {method: 'POST', body: f}).then(r => r.json()).then(() => {
+      document.querySelector('.selected-photos').textContent = '1 fotos seleccionadas';
+    });
+  });
+  document.querySelector('.photo-field').appendChild(inp);
+});
+</script>
+</body></html>
+"""
+
+
+def _handler(latencia_s: float):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, codigo: int, tipo: str, cuerpo: bytes):
+            self.send_response(codigo)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            self._responder(200, "text/html; charset=utf-8", PAGINA.encode("utf-8"))
+
+        def do_POST(self):
+            restante = int(self.headers.get("Content-Length") or 0)
+            recibidos = 0
+            while restante > 0:
+                trozo = self.rfile.read(min(restante, 1 << 16))
+                if not trozo:
+                    break
+                recibidos += len(trozo)
+                restante -= len(trozo)
+            if latencia_s:
+                time.sleep(latencia_s)
+            self._responder(200, "application/json", json.dumps({"bytes": recibidos}).encode())
+
+    return Handler
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "desconocido"
+
+
+def _percentil(valores, p):
+    orden = sorted(valores)
+    k = max(0, min(len(orden) - 1, round(p / 100 * (len(orden) - 1))))
+    return orden[k]
+
+
+def medir(driver, url: str, kb: int, reps: int, warmup: int, directorio: str) -> dict:
+    ruta = imagen_png(kb, directorio=directorio)
+    tam = os.path.getsize(ruta)
+    tiempos, vias = [], set()
+    for i in range(warmup + reps):
+        driver.get(url)
+        info = FileActions(driver, WebDriverWait(driver, 15)).subir_archivo(BOTON, ruta, timeout=120)
+        if i < warmup:
+            continue
+        vias.add(info.get("via"))
+        if info.get("elapsed_ms") is not None and not info.get("timed_out"):
+            tiempos.append(info["elapsed_ms"])
+
+    res = {"kb": kb, "bytes": tam, "reps": reps, "ok": len(tiempos), "via": sorted(v for v in vias if v)}
+    if tiempos:
+        mediana = statistics.median(tiempos)
+        res["ms"] = {"min": min(tiempos), "median": mediana, "p95": _percentil(tiempos, 95), "max": max(tiempos)}
+        res["mb_s_median"] = round(tam / (1024 * 1024) / (mediana / 1000.0), 2) if mediana else None
+    return res
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de subida de archivos por tamaño")
+    ap.add_argument("--sizes", default="50,200,1000,5000", help="Tamaños en KB separados por coma")
+    ap.add_argument("--reps", type=int, default=3)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--latency-ms", type=int, default=0, help="Latencia simulada del servidor por subida")
+    ap.add_argument("--headed", action="store_true", help="Chrome con ventana (por defecto headless)")
+    ap.add_argument("--out", help="Ruta del JSON de resultados (por defecto solo stdout)")
+    args = ap.parse_args(argv)
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _handler(args.latency_ms / 1000.0))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+
+    driver = build_driver(headless=not args.headed)
+    resultados = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_upload_") as tmp:
+            for kb in [int(x) for x in args.sizes.split(",") if x.strip()]:
+                r = medir(driver, url, kb, args.reps, args.warmup, tmp)
+                resultados.append(r)
+                print(f"📊 {kb} KB → {r.get('ms', {}).get('median')} ms (mediana), {r.get('mb_s_median')} MB/s")
+    finally:
+        driver.quit()
+        servidor.shutdown()
+
+    salida = {
+        "benchmark": "upload",
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "latency_ms": args.latency_ms,
+        "results": resultados,
+    }
+    texto = json.dumps(salida, indent=2, ensure_ascii=False)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(texto)
+    print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+# flows/engine.py
+"""
+STEP ENGINE - Motor declarativo de pasos para los flujos de proceso
+
+Un flujo (P1, P2, P3...) se describe como una lista de `Step`: qué tarea abrir,
+qué page object la completa, con qué clave de datos, qué rol debe estar activo,
+cómo se envía y cuánto se espera después. `StepEngine` los ejecuta en orden y
+aporta, para todos por igual:
+
+- Cambio de rol perezoso (solo cuando el paso lo requiere)
+- Reintentos por paso (reabre la tarea y repite el paso completo)
+- Medición de tiempos por paso (StepResult)
+- Parada en `stop_after` (nombre del paso o alias)
+- Notificación a listeners (journal, perf budgets, trazas...)
+- Ejecución por lotes agrupada en fases de rol (run_batch): K ítems con un
+  solo cambio de rol por fase, resultado y aislamiento de fallos por ítem
+
+El flujo (contexto) solo debe ofrecer:
+    ctx.driver, ctx.wait
+    ctx.open_task(texto)              → abre la tarea de la lista
+    ctx.switch_role(rol)              → activa la sesión/contexto del rol
+    ctx.<step.page>                   → page object del paso
+    ctx.<step.open>()                 → (opcional) apertura propia del paso
+    ctx.retry_strategy.robust_send_confirm()   → para submit="robust"
+
+Uso:
+    from flows.engine import Step, StepEngine, REQUESTER
+
+    PASOS = [
+        Step("f1a", task="TEBSA - F1a. Permisos de Trabajo", page="f1a",
+             method="fill_form", fill="data", submit="confirm"),
+        ...
+    ]
+    resultados = StepEngine(flow, PASOS).run(data, stop_after="f7n")
+
+Listeners: cualquier objeto con (alguno de) los métodos
+    on_step_start(step, role), on_step_end(step, result), on_role_switch(old, new, seconds)
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils import tracing
+from utils.elements import enviar_y_confirmar, esperar_notificaciones_y_cargas
+
+# Rol del usuario que inicia el flujo (el que hace login al principio)
+REQUESTER = "solicitante"
+
+
+@dataclass
+class Step:
+    """
+    Un paso del flujo.
+
+    Args:
+        name: Identificador ("f1a", "f10a_4"...); se usa en stop_after/start_at
+        task: Texto de la tarea a abrir en la lista (None si `open` lo resuelve)
+        page: Atributo del contexto con el page object
+        data_key: Clave en el dict de datos (por defecto = name)
+        method: Método del page object a invocar
+        fill: "data"   → method(data) solo si hay datos
+              "always" → method(data or default_data) siempre
+              "no_args"→ method()
+        run_if: "always" | "data" (datos no vacíos) | "not_none" (clave presente)
+        role: Rol requerido (REQUESTER = usuario inicial)
+        submit: "none" (el page ya envía) | "confirm" (enviar_y_confirmar) | "robust"
+        post_wait: Segundos para esperar_notificaciones_y_cargas tras el envío
+        stop_aliases: Otros nombres válidos en stop_after (p.ej. "operador")
+        retries: Reintentos adicionales si el paso lanza excepción
+        optional: Si True, un fallo se registra y el flujo continúa
+        default_data: Datos si no se pasaron (con fill="always")
+        open: Nombre de un método del contexto que abre la tarea (en lugar de `task`)
+        label: Texto para logs (por defecto name)
+    """
+    name: str
+    task: Optional[str] = None
+    page: Optional[str] = None
+    data_key: Optional[str] = None
+    method: str = "completar_y_enviar"
+    fill: str = "always"
+    run_if: str = "always"
+    role: str = REQUESTER
+    submit: str = "none"
+    post_wait: Optional[float] = None
+    stop_aliases: Tuple[str, ...] = ()
+    retries: int = 0
+    optional: bool = False
+    default_data: Optional[dict] = None
+    open: Optional[str] = None
+    label: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return self.data_key or self.name
+
+    def matches(self, nombre: Optional[str]) -> bool:
+        return nombre is not None and (nombre == self.name or nombre in self.stop_aliases)
+
+
+@dataclass
+class StepResult:
+    """Resultado de un paso ejecutado (o saltado)."""
+    name: str
+    status: str                      # "ok" | "skipped" | "failed"
+    role: str
+    seconds: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    # excepción original del último intento (traceback para StepFailed/pytest)
+    exception: Optional[BaseException] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class BatchResult:
+    """Resultado de un ítem (p.ej. un permiso) dentro de run_batch."""
+    item: str
+    status: str = "ok"               # "ok" | "failed"
+    failed_step: Optional[str] = None
+    error: Optional[str] = None
+    steps: List[StepResult] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return round(sum(r.seconds for r in self.steps), 3)
+
+
+class StepFailed(Exception):
+    """Un paso obligatorio agotó sus reintentos."""
+
+    def __init__(self, result: StepResult, results: List[StepResult]):
+        super().__init__(f"Paso '{result.name}' falló: {result.error}")
+        self.result = result
+        self.results = results
+
+
+class StepEngine:
+    """Ejecuta una lista de Step sobre un contexto (p.ej. FlowP1)."""
+
+    SUBMITS: Dict[str, Callable[[Any], Any]] = {
+        "none": lambda ctx: None,
+        "confirm": lambda ctx: enviar_y_confirmar(ctx.driver, ctx.wait),
+        "robust": lambda ctx: ctx.retry_strategy.robust_send_confirm(),
+    }
+
+    # listeners que se añaden a todo engine creado a partir de ahora
+    # (p.ej. el registro de tiempos del plugin de pytest utils/perf_budgets.py)
+    GLOBAL_LISTENERS: List[Any] = []
+
+    def __init__(self, ctx, steps: Iterable[Step], listeners: Iterable[Any] = ()):
+        self.ctx = ctx
+        self.steps: List[Step] = list(steps)
+        self.listeners: List[Any] = list(self.GLOBAL_LISTENERS) + list(listeners)
+        self.current_role: str = REQUESTER
+        nombres = [s.name for s in self.steps]
+        if len(nombres) != len(set(nombres)):
+            raise ValueError(f"Nombres de paso duplicados: {nombres}")
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def step(self, nombre: str) -> Step:
+        for s in self.steps:
+            if s.matches(nombre):
+                return s
+        raise KeyError(f"Paso desconocido: {nombre}")
+
+    def run(self, data: Dict[str, Any], stop_after: Optional[str] = None,
+            start_at: Optional[str] = None) -> List[StepResult]:
+        """
+        Ejecuta los pasos en orden.
+
+        Args:
+            data: {data_key: datos} para los pasos
+            stop_after: Termina tras el paso con ese nombre/alias
+            start_at: Empieza en ese paso (los anteriores no se ejecutan)
+
+        Returns:
+            Lista de StepResult (uno por paso considerado).
+
+        Raises:
+            StepFailed: si un paso no opcional falla tras sus reintentos
+        """
+        if stop_after is not None:
+            self.step(stop_after)
+        pasos = self.steps
+        if start_at is not None:
+            inicio = self.steps.index(self.step(start_at))
+            pasos = self.steps[inicio:]
+
+        resultados: List[StepResult] = []
+        for step in pasos:
+            res = self.run_step(step, data)
+            resultados.append(res)
+            if res.status == "failed" and not step.optional:
+                raise StepFailed(res, resultados) from res.exception
+            if step.matches(stop_after):
+                break
+        self._resumen(resultados)
+        return resultados
+
+    def phases(self, steps: Optional[List[Step]] = None) -> List[Tuple[str, List[Step]]]:
+        """Agrupa pasos consecutivos del mismo rol: [(rol, [pasos]), ...]."""
+        fases: List[Tuple[str, List[Step]]] = []
+        for s in (self.steps if steps is None else steps):
+            if fases and fases[-1][0] == s.role:
+                fases[-1][1].append(s)
+            else:
+                fases.append((s.role, [s]))
+        return fases
+
+    def run_batch(self, items: List[Tuple[str, Dict[str, Any]]], stop_after: Optional[str] = None,
+                  bind: Optional[Callable[[str], Any]] = None,
+                  recover: Optional[Callable[[], Any]] = None,
+                  detener_fase: Optional[Callable[[StepResult], bool]] = None) -> Dict[str, BatchResult]:
+        """
+        Ejecuta los pasos para varios ítems, fase de rol por fase de rol.
+
+        Cada fase activa su rol UNA vez y recorre todos los ítems aún vivos.
+        Un ítem que falla queda marcado y no ejecuta más pasos; los demás siguen.
+
+        Args:
+            items: [(id, data)] — data como en run()
+            stop_after: Último paso a ejecutar (para todos los ítems)
+            bind: Se llama con el id antes de los pasos de cada ítem en una fase
+            recover: Se llama tras el fallo de un ítem (p.ej. volver a la lista)
+            detener_fase: Si devuelve True para el paso fallido, el resto de ítems
+                de la fase se marca fallido sin ejecutarse (p.ej. cuando ya no se
+                sabe qué tarea pendiente es de cada ítem)
+
+        Returns:
+            {id: BatchResult}
+        """
+        pasos = self.steps
+        if stop_after is not None:
+            pasos = self.steps[:self.steps.index(self.step(stop_after)) + 1]
+
+        resultados = {item_id: BatchResult(item_id) for item_id, _ in items}
+        cambios = 0
+        for rol, fase in self.phases(pasos):
+            vivos = [(i, d) for i, d in items if resultados[i].status == "ok"]
+            # no cambiar de rol si ningún ítem vivo tiene algo que hacer en la fase
+            if not any(self._debe_ejecutar(s, d) for _, d in vivos for s in fase):
+                continue
+            if rol != self.current_role:
+                cambios += 1
+            self.ensure_role(rol)
+            detenida = None
+            for item_id, data in vivos:
+                if detenida is not None:
+                    resultados[item_id].status = "failed"
+                    resultados[item_id].error = detenida
+                    continue
+                if bind is not None:
+                    bind(item_id)
+                for step in fase:
+                    res = self.run_step(step, data)
+                    resultados[item_id].steps.append(res)
+                    if res.status == "failed" and not step.optional:
+                        resultados[item_id].status = "failed"
+                        resultados[item_id].failed_step = step.name
+                        resultados[item_id].error = res.error
+                        if detener_fase is not None and detener_fase(res):
+                            detenida = f"fase '{rol}' detenida en {step.name} de '{item_id}'"
+                            print(f"⛔ {detenida}: {res.error}")
+                        if recover is not None:
+                            try:
+                                recover()
+                            except Exception as e:
+                                print(f"⚠️ No se pudo recuperar tras fallo de '{item_id}': {e}")
+                        break
+
+        ok = sum(1 for r in resultados.values() if r.status == "ok")
+        print(f"📦 Lote: {ok}/{len(resultados)} ítem(s) OK, {cambios} cambio(s) de rol")
+        for r in resultados.values():
+            if r.status != "ok":
+                print(f"   ❌ {r.item}: falló en {r.failed_step} ({r.error})")
+        return resultados
+
+    def run_step(self, step: Step, data: Dict[str, Any]) -> StepResult:
+        """Ejecuta un paso (cambio de rol + abrir + completar + enviar + espera) con reintentos."""
+        datos = data.get(step.key)
+        if not self._debe_ejecutar(step, data):
+            return StepResult(step.name, "skipped", step.role)
+
+        self.ensure_role(step.role)
+        self._notificar("on_step_start", step, step.role)
+        print(f"➡️ {self._label(step)}: completando…")
+
+        t0 = time.time()
+        res = StepResult(step.name, "ok", step.role)
+        with tracing.span(step.name, "step", role=step.role) as sp:
+            for intento in range(1, step.retries + 2):
+                res.attempts = intento
+                try:
+                    self._ejecutar(step, datos)
+                    res.error = res.exception = None
+                    break
+                except Exception as e:
+                    res.error = f"{e.__class__.__name__}: {e}"
+                    res.exception = e
+                    if intento <= step.retries:
+                        print(f"⚠️ {self._label(step)}: intento {intento} falló ({e.__class__.__name__}); reintentando")
+                        continue
+                    res.status = "failed"
+                    print(f"❌ {self._label(step)}: {res.error}")
+            sp.set(status=res.status, attempts=res.attempts)
+        res.seconds = round(time.time() - t0, 3)
+        if res.status == "ok":
+            print(f"⏱️ {self._label(step)}: {res.seconds:.1f}s")
+        self._notificar("on_step_end", step, res)
+        return res
+
+    def ensure_role(self, rol: str):
+        """Activa `rol` si no es el actual."""
+        if rol == self.current_role:
+            return
+        t0 = time.time()
+        with tracing.span(f"rol → {rol}", "role", desde=self.current_role):
+            self.ctx.switch_role(rol)
+        anterior, self.current_role = self.current_role, rol
+        self._notificar("on_role_switch", anterior, rol, round(time.time() - t0, 3))
+
+    # ---------- internos ----------
+
+    @staticmethod
+    def _debe_ejecutar(step: Step, data: Dict[str, Any]) -> bool:
+        if step.run_if == "data":
+            return bool(data.get(step.key))
+        if step.run_if == "not_none":
+            return data.get(step.key) is not None
+        return True
+
+    def _ejecutar(self, step: Step, datos):
+        ctx = self.ctx
+        if step.open:
+            with tracing.span(step.open, "open"):
+                getattr(ctx, step.open)()
+        elif step.task:
+            with tracing.span("abrir tarea", "open", tarea=step.task):
+                ctx.open_task(step.task)
+
+        if step.page:
+            page = getattr(ctx, step.page)
+            fn = getattr(page, step.method)
+            with tracing.span(f"{page.__class__.__name__}.{step.method}", "page"):
+                if step.fill == "no_args":
+                    fn()
+                elif step.fill == "always":
+                    fn(datos if datos is not None else step.default_data)
+                elif datos:
+                    fn(datos)
+
+        with tracing.span(f"submit:{step.submit}", "submit"):
+            self.SUBMITS[step.submit](ctx)
+        if step.post_wait:
+            esperar_notificaciones_y_cargas(ctx.driver, ctx.wait, timeout=step.post_wait)
+
+    @staticmethod
+    def _label(step: Step) -> str:
+        return step.label or step.name
+
+    def _notificar(self, evento: str, *args):
+        for l in self.listeners:
+            fn = getattr(l, evento, None)
+            if fn is None:
+                continue
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"⚠️ Listener {l.__class__.__name__}.{evento} falló: {e}")
+
+    @staticmethod
+    def _resumen(resultados: List[StepResult]):
+        hechos = [r for r in resultados if r.status != "skipped"]
+        if not hechos:
+            return
+        total = sum(r.seconds for r in hechos)
+        lento = max(hechos, key=lambda r: r.seconds)
+        print(f"📋 {len(hechos)} paso(s) en {total:.1f}s (más lento: {lento.name} {lento.seconds:.1f}s)")
@@ -53,10 +53,38 @@ La clase FlowP1 NO es un Facade. Es un **Orchestrator** que:
 17. **Cambio de sesión → Usuario inicial**
 18. F11: Permiso Firmado (documento físico) → enviar
 
+## Motor de pasos
+
+La secuencia anterior está declarada como datos en `P1_STEPS` (ver
+flows/engine.py): cada Step indica tarea, page object, clave de datos, rol,
+estrategia de envío y espera posterior. `run()` solo hace el login inicial y
+delega en `StepEngine`, que aporta cambios de rol, reintentos, tiempos por
+paso y `stop_after`.
+
+## Checkpoint / reanudación
+
+Cada paso completado se anota en un journal JSONL (flows/journal.py) con el
+id del permiso (`f1a.orden_trabajo`), el paso, el rol y la hora.
+`run(..., resume=True)` continúa desde el primer paso pendiente de la última
+ejecución de ese permiso, y `run(..., start_at="f10a_4")` empieza en el paso
+indicado. En ambos casos el login inicial se hace con el rol del paso y la
+tarea se abre prefiriendo la que menciona el id del permiso.
+
+## Lotes de permisos
+
+`run_batch(creds, permisos, data_roles)` lleva K permisos por el proceso
+fase a fase: el solicitante crea y completa los K hasta F10a(3), luego un solo
+cambio a operador firma los K, luego jefe de turno, gerencia y de vuelta al
+solicitante para F11. Los cambios de rol pasan de 4K a 4; cada permiso tiene
+su propio resultado y un fallo no detiene a los demás, salvo que la tarea
+pendiente del permiso fallido ya no se distinga de la del siguiente (varias
+tareas iguales sin el id del permiso): entonces se detiene la fase entera.
+
 ## Métodos Privados de Soporte
 
 - `_abrir_con_reintento()`: Retry pattern para abrir tareas con backoff exponencial
-- `_cambiar_sesion()`: Gestión de logout/login multi-usuario
+- `_cambiar_sesion()`: Gestión multi-usuario (restaura snapshot del rol o limpia la sesión y hace login;
+  con `FlowP1(driver, role_contexts=True)` cambia al browser context aislado del rol)
 - `_esperar_lista_tareas()`: Sincronización de navegación post-submit
 - `_enviar_confirmar_robusto()`: Envío resiliente con manejo de overlays
 
@@ -77,9 +105,11 @@ La clase FlowP1 NO es un Facade. Es un **Orchestrator** que:
         }
     )
 """
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 
+from selenium.common.exceptions import TimeoutException
+
 from pages.login_page import LoginPage
 from pages.tasks_page import TasksPage
 from pages.forms.f1_nuevo_permiso_page import F1NuevoPermisoPage
@@ -94,16 +124,52 @@ from pages.forms.f10a_firma_permiso_page import F10aFirmaPermisoPage
 from pages.forms.f10_firma_gerencia_page import F10FirmaGerenciaPage
 from pages.forms.f11_permiso_firmado_page import F11PermisoFirmadoPage
 
-
-
-
-
-from utils.elements import enviar_y_confirmar
+from flows.engine import REQUESTER, BatchResult, Step, StepEngine, StepResult
+from flows.journal import Journal
 
 # Importar clases helper refactorizadas
 from utils.session_manager import SessionManager
 from utils.retry_strategy import RetryStrategy
+from utils.command_recorder import grabador_de
+from utils.elements import TareaAmbigua
+from utils.driver_profiler import profiler_de
 from utils.navigation_helper import NavigationHelper
+from utils.role_context_manager import RoleContextManager
+
+
+F10A = "TEBSA - F10a. Firma Permiso de Trabajo"
+
+# Secuencia del proceso P1 (orden = orden de ejecución)
+P1_STEPS: List[Step] = [
+    Step("f1", page="f1", open="_abrir_nuevo_permiso", fill="no_args", label="F1"),
+    Step("f1a", task="TEBSA - F1a. Permisos de Trabajo", page="f1a", method="fill_form",
+         fill="data", submit="confirm", label="F1a"),
+    Step("f7n", task="TEBSA - F7n. Análisis de Riesgos", page="f7n", method="fill_form",
+         fill="data", submit="confirm", label="F7n"),
+    Step("f8n", task="TEBSA - F8n. EPP Requerido", page="f8n", method="completar",
+         fill="data", submit="confirm", label="F8n"),
+    Step("f9n", task="TEBSA - F9n. Condiciones de Seguridad", page="f9n", method="completar",
+         default_data={"otros": "No"}, submit="confirm", label="F9n"),
+    Step("f10n", task="Trabajadores autorizados", page="f10n", label="F10n"),
+    Step("f10_2", task="Trabajador autorizado", page="f10_2", label="F10_2"),
+    Step("f10ac", task="TEBSA - F10a.c. Firma Permiso de Trabajo (Trabajador autorizado)",
+         page="f10ac", label="F10a.c"),
+    Step("f10a_1", task=F10A, page="f10a", run_if="data", post_wait=20,
+         label="F10a(1) Responsable plan de emergencia"),
+    Step("f10a_2", task=F10A, page="f10a", run_if="data", post_wait=20,
+         label="F10a(2) Responsable del trabajo"),
+    Step("f10a_3", task=F10A, page="f10a", run_if="data", post_wait=20,
+         label="F10a(3) Supervisor"),
+    Step("f10a_4", task=F10A, page="f10a", run_if="data", role="operador",
+         submit="confirm", post_wait=10, stop_aliases=("operador",), label="F10a(4) Operador"),
+    Step("f10a_5", task=F10A, page="f10a", run_if="data", role="jefe_turno",
+         submit="confirm", post_wait=10, stop_aliases=("jefe_turno",), label="F10a(5) Jefe de turno"),
+    Step("f10_gerencia", task="TEBSA - F10. Firma Gerencia", page="f10_gerencia", run_if="data",
+         role="gerencia", submit="confirm", post_wait=10, stop_aliases=("gerencia",),
+         label="F10 (Gerencia)"),
+    Step("f11", task="TEBSA - F11. Permiso de Trabajo Firmado (Documento físico)", page="f11",
+         run_if="not_none", submit="robust", post_wait=10, label="F11 (Documento físico)"),
+]
 
 
 class FlowP1:
@@ -118,7 +184,18 @@ class FlowP1:
 
     Ver docstring del módulo para detalles arquitectónicos completos.
     """
-    def __init__(self, driver):
+    STEPS: List[Step] = P1_STEPS
+
+    def __init__(self, driver, role_contexts: bool = False, journal: Optional[Journal] = None):
+        """
+        Args:
+            driver: WebDriver de Selenium
+            role_contexts: Si True, cada rol de data_roles vive en su propio
+                browser context aislado (mismo Chrome), todos logueados al
+                inicio; cambiar de rol es cambiar de pestaña, no de sesión.
+            journal: Bitácora de pasos completados (por defecto
+                artifacts/journal_p1.jsonl o $MAP_JOURNAL)
+        """
         self.driver = driver
         self.login_page = LoginPage(driver)
         self.tasks_page = TasksPage(driver)
@@ -142,14 +219,64 @@ class FlowP1:
         self.session_manager = SessionManager(driver, self.wait, self.login_page)
         self.retry_strategy = RetryStrategy(driver, self.wait)
         self.navigation = NavigationHelper(driver, self.wait, self.login_page.base_url)
+        self.role_contexts = RoleContextManager(driver, self.wait, self.login_page) if role_contexts else None
+
+        self.engine = StepEngine(self, self.STEPS)
+        profiler = profiler_de(driver)
+        if profiler is not None:
+            self.engine.add_listener(profiler)  # atribuye los comandos WebDriver al paso
+        grabador = grabador_de(driver)
+        if grabador is not None:
+            self.engine.add_listener(grabador)
+        self.journal = journal or Journal()
+        self.permit_id: Optional[str] = None
+        self._creds: Optional[dict] = None
+        self._roles: dict = {}
+        self._en_lote = False
+        self._traspaso_pendiente = False
 
     def _abrir_con_reintento(self, texto: str, descripcion: Optional[str] = None,
                              intentos: int = 3, backoff=(0.8, 1.2, 2.0)):
         """Delegado a RetryStrategy para mantener compatibilidad con código existente."""
         return self.retry_strategy.retry_open_task(texto, descripcion, intentos, backoff)
 
+    # ---- contrato con StepEngine ----
+    def open_task(self, texto: str):
+        if self._traspaso_pendiente:
+            # primera tarea tras cambiar de rol: puede no haberse asignado aún; se
+            # observa la lista en la página (recarga solo cada RECARGA_CADA s)
+            self._traspaso_pendiente = False
+            try:
+                self.navigation.wait_for_task_to_appear(texto)
+            except TimeoutException:
+                pass  # retry_open_task informa el fallo con su propio mensaje
+        # prefiere la tarea del permiso en curso si la lista tiene varias; en un
+        # lote, si ninguna lo menciona no se abre la de otro permiso (TareaAmbigua)
+        return self.retry_strategy.retry_open_task(texto, contexto=self.permit_id,
+                                                   exigir_contexto=self._en_lote)
+
+    def _cred_de_rol(self, rol: str) -> dict:
+        cred = self._creds if rol == REQUESTER else self._roles.get(rol)
+        if not cred:
+            raise KeyError(f"Sin credenciales para el rol '{rol}' en data_roles")
+        return cred
+
+    def switch_role(self, rol: str):
+        """Activa el rol `rol` (REQUESTER = usuario del login inicial)."""
+        cred = self._cred_de_rol(rol)
+        print(f"🔁 Cambio de rol → {rol}")
+        self._cambiar_sesion(email=cred["email"], password=cred["password"])
+        self._traspaso_pendiente = True
+
+    def _abrir_nuevo_permiso(self):
+        self.tasks_page.abrir_boton_nuevo_formulario()
+        self.tasks_page.seleccionar_formulario_inicio_proceso()
+        self.tasks_page.entrar_a_formulario_nuevo_permiso()
+
     def _cambiar_sesion(self, email: str, password: str):
-        """Delegado a SessionManager para mantener compatibilidad con código existente."""
+        """Delegado a RoleContextManager (modo contextos) o SessionManager."""
+        if self.role_contexts is not None:
+            return self.role_contexts.activate(email, password)
         return self.session_manager.change_session(email, password)
 
     def _esperar_lista_tareas(self, texto_expected: str | None = None, timeout: int = 30):
@@ -199,128 +326,161 @@ class FlowP1:
         data_f11: Optional[dict] = None,  # Documento físico
         data_roles: Optional[dict] = None,
         stop_after: Optional[str] = None,
+        start_at: Optional[str] = None,
+        resume: bool = False,
     ):
-        # --- LOGIN INICIAL ---
-        self.login_page.open()
-        self.login_page.login(creds["email"], creds["password"])
-
-        # --- F1 ---
-        self.tasks_page.abrir_boton_nuevo_formulario()
-        self.tasks_page.seleccionar_formulario_inicio_proceso()
-        self.tasks_page.entrar_a_formulario_nuevo_permiso()
-        self.f1.completar_y_enviar()
-
-        # --- F1a ---
-        self._abrir_con_reintento("TEBSA - F1a. Permisos de Trabajo")
-        self.f1a.llenar_campos_basicos(data_f1a)
-        self.f1a.seleccionar_aks_kks(data_f1a)
-        self.f1a.seleccionar_empresa_e_supervisor(data_f1a)
-        self.f1a.responsables_y_descripcion(data_f1a)
-        self.f1a.respuestas_seguridad(data_f1a)
-        enviar_y_confirmar(self.driver, self.wait)
-        if stop_after == "f1a": return
-
-        # --- F7n ---
-        self._abrir_con_reintento("TEBSA - F7n. Análisis de Riesgos")
-        if data_f7n:
-            self.f7n.completar(data_f7n)
-        enviar_y_confirmar(self.driver, self.wait)
-        if stop_after == "f7n": return
-
-        # --- F8n ---
-        self._abrir_con_reintento("TEBSA - F8n. EPP Requerido")
-        if data_f8n:
-            self.f8n.completar(data_f8n)
-        enviar_y_confirmar(self.driver, self.wait)
-        if stop_after == "f8n": return
-
-        # --- F9n ---
-        self._abrir_con_reintento("TEBSA - F9n. Condiciones de Seguridad")
-        self.f9n.completar(data_f9n or {"otros": "No"})
-        enviar_y_confirmar(self.driver, self.wait)
-
-        # --- F10n ---
-        self._abrir_con_reintento("Trabajadores autorizados")
-        self.f10n.completar_y_enviar(data_f10n)
-        if stop_after == "f10n": return
-
-        # --- F10_2 ---
-        self._abrir_con_reintento("Trabajador autorizado")
-        self.f10_2.completar_y_enviar(None)
-        if stop_after == "f10_2": return
-
-        # --- F10a.c ---
-        self._abrir_con_reintento("TEBSA - F10a.c. Firma Permiso de Trabajo (Trabajador autorizado)")
-        self.f10ac.completar_y_enviar(data_f10ac)
-        if stop_after == "f10ac": return
-
-        # --- F10a (1/2/3) con usuario actual ---
-        for idx, data_fx in enumerate([data_f10a_1, data_f10a_2, data_f10a_3], start=1):
-            if data_fx:
-                self._abrir_con_reintento("TEBSA - F10a. Firma Permiso de Trabajo")
-                print(f"➡️ F10a({idx}): Cargo = {(data_fx or {}).get('cargo')}")
-                self.f10a.completar_y_enviar(data_fx)
-                esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=20)
-                if stop_after == f"f10a_{idx}": return
-
-
-
-
-        # === Cambio a OPERADOR ===
-        if data_f10a_4:
-            self._cambiar_sesion(
-                email=data_roles["operador"]["email"],
-                password=data_roles["operador"]["password"]
-            )
-            self._abrir_con_reintento("TEBSA - F10a. Firma Permiso de Trabajo")
-            print("➡️ F10a(4) Operador: completando…")
-            self.f10a.completar_y_enviar(data_f10a_4)         # firma
-            enviar_y_confirmar(self.driver, self.wait)        # confirmar explícito
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=10)
-            # salir directo; no seguir buscando tareas como operador
-            if stop_after in ("f10a_4", "operador"):
-                return
-
-
-        # === Cambio a JEFE DE TURNO ===
-        if data_f10a_5:
-            self._cambiar_sesion(
-                email=data_roles["jefe_turno"]["email"],
-                password=data_roles["jefe_turno"]["password"]
-            )
-            self._abrir_con_reintento("TEBSA - F10a. Firma Permiso de Trabajo")
-            print("➡️ F10a(5) Jefe de turno: completando…")
-            self.f10a.completar_y_enviar(data_f10a_5)
-            enviar_y_confirmar(self.driver, self.wait)
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=10)
-            if stop_after in ("f10a_5", "jefe_turno"):
-                return
-
-        # === Cambio a GERENCIA: F10. Firma Gerencia ===
-        if data_f10_gerencia:
-            self._cambiar_sesion(
-                email=data_roles["gerencia"]["email"],
-                password=data_roles["gerencia"]["password"]
-            )
-            self._abrir_con_reintento("TEBSA - F10. Firma Gerencia")
-            print("➡️ F10 (Gerencia): completando…")
-            self.f10_gerencia.completar_y_enviar(data_f10_gerencia)
-            enviar_y_confirmar(self.driver, self.wait)
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=10)
-
-            # volver al usuario inicial para cerrar con F11
-            self._cambiar_sesion(email=creds["email"], password=creds["password"])
-            if stop_after in ("f10_gerencia", "gerencia"):
-                return
-
-
-        # === F11: Permiso de Trabajo Firmado (usuario inicial) ===
-        if data_f11 is not None:
-            self._abrir_con_reintento("TEBSA - F11. Permiso de Trabajo Firmado (Documento físico)")
-            print("➡️ F11 (Documento físico): completando…")
-            self.f11.completar_y_enviar(data_f11)   # prepara la vista (sin adjunto)
-            self._enviar_confirmar_robusto()        # reintentos tolerantes
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=10)
-            if stop_after == "f11":
-                return
+        """
+        Ejecuta el proceso P1 completo (o hasta `stop_after`) con StepEngine.
+
+        Args:
+            start_at: Empieza en ese paso (p.ej. "f10a_4")
+            resume: Empieza en el primer paso pendiente según el journal
+
+        Returns:
+            List[StepResult] con estado y duración de cada paso.
+        """
+        data = {
+            "f1a": data_f1a,
+            "f7n": data_f7n,
+            "f8n": data_f8n,
+            "f9n": data_f9n,
+            "f10n": data_f10n,
+            "f10ac": data_f10ac,
+            "f10a_1": data_f10a_1,
+            "f10a_2": data_f10a_2,
+            "f10a_3": data_f10a_3,
+            "f10a_4": data_f10a_4,
+            "f10a_5": data_f10a_5,
+            "f10_gerencia": data_f10_gerencia,
+            "f11": data_f11,
+        }
+        self.permit_id = (data_f1a or {}).get("orden_trabajo")
+        self._creds = creds
+        self._roles = data_roles or {}
+
+        if resume and start_at is None:
+            start_at = self._paso_pendiente()
+            if start_at is None:
+                print(f"✅ Permiso '{self.permit_id}': todos los pasos ya constan en el journal")
+                return []
+        rol_inicial = self.engine.step(start_at).role if start_at else REQUESTER
+        if start_at:
+            print(f"⏩ Reanudando permiso '{self.permit_id}' en '{start_at}' como {rol_inicial}")
+        elif self.permit_id:
+            self.journal.start(self.permit_id)
+
+        self._login_inicial(rol_inicial)
+        listener = self.journal.listener(self.permit_id) if self.permit_id else None
+        if listener:
+            self.engine.add_listener(listener)
+        try:
+            return self.engine.run(data, stop_after=stop_after, start_at=start_at)
+        finally:
+            if listener:
+                self.engine.listeners.remove(listener)
+
+    def run_batch(
+        self,
+        creds: dict,
+        permisos: List[dict],
+        data_roles: Optional[dict] = None,
+        stop_after: Optional[str] = None,
+    ) -> Dict[str, BatchResult]:
+        """
+        Ejecuta varios permisos en un solo navegador, agrupando por rol.
+
+        Args:
+            creds: Credenciales del solicitante
+            permisos: Lista de dicts con los mismos argumentos data_* de run()
+                (p.ej. kwargs_desde_yaml(data)); el id es data_f1a.orden_trabajo
+            data_roles: Credenciales por rol (comunes a todos los permisos)
+            stop_after: Último paso a ejecutar para todos los permisos
+
+        Returns:
+            {id_permiso: BatchResult}
+        """
+        items = []
+        for i, kw in enumerate(permisos, start=1):
+            data = {k[len("data_"):]: v for k, v in kw.items() if k.startswith("data_") and k != "data_roles"}
+            permit = (data.get("f1a") or {}).get("orden_trabajo") or f"permiso_{i}"
+            if permit in dict(items):
+                raise ValueError(f"Permiso duplicado en el lote: '{permit}'")
+            items.append((permit, data))
+
+        self._creds = creds
+        self._roles = data_roles or {}
+        for permit, _ in items:
+            self.journal.start(permit)
+        self._login_inicial(REQUESTER)
+
+        listeners = {permit: self.journal.listener(permit) for permit, _ in items}
+
+        def bind(permit: str):
+            # la tarea a abrir y el journal siguen al permiso en curso
+            for l in listeners.values():
+                if l in self.engine.listeners:
+                    self.engine.listeners.remove(l)
+            self.permit_id = permit
+            self.engine.add_listener(listeners[permit])
+
+        def recover():
+            self.driver.get(self.login_page.base_url)
+
+        def detener_fase(res) -> bool:
+            # la tarea pendiente del ítem fallido ya no se distingue de la del siguiente
+            return isinstance(res.exception, TareaAmbigua)
+
+        self._en_lote = True
+        try:
+            return self.engine.run_batch(items, stop_after=stop_after, bind=bind, recover=recover,
+                                         detener_fase=detener_fase)
+        finally:
+            self._en_lote = False
+            for l in listeners.values():
+                if l in self.engine.listeners:
+                    self.engine.listeners.remove(l)
+
+    def _paso_pendiente(self) -> Optional[str]:
+        """Primer paso pendiente del permiso actual según el journal."""
+        if not self.permit_id:
+            raise ValueError("resume requiere f1a.orden_trabajo para identificar el permiso")
+        pendiente = self.journal.next_step(self.permit_id, [s.name for s in self.engine.steps])
+        ultimo = self.journal.last_completed(self.permit_id)
+        if ultimo:
+            print(f"📓 Último paso registrado de '{self.permit_id}': {ultimo['step']} ({ultimo['ts']})")
+        return pendiente
+
+    def _login_inicial(self, rol: str = REQUESTER):
+        """Login con el rol `rol` (el solicitante salvo al reanudar en un paso de otro rol)."""
+        cred = self._cred_de_rol(rol)
+        self.engine.current_role = rol
 
+        self.login_page.open()
+        self.login_page.login(cred["email"], cred["password"])
+        # snapshot del usuario para volver a él sin logout/login (F11)
+        self.session_manager.capture_snapshot(cred["email"])
+        if self.role_contexts is not None:
+            # todos los roles logueados por adelantado, cada uno en su contexto
+            self.role_contexts.adopt_current(cred["email"])
+            self.role_contexts.open_all(self._roles)
+            self.role_contexts.activate(cred["email"])
+
+
+def kwargs_desde_yaml(data: dict) -> dict:
+    """Argumentos de FlowP1.run a partir de data/p1_permiso_trabajo.yaml."""
+    return {
+        "data_f1a": data["f1a"],
+        "data_f7n": data.get("f7n"),
+        "data_f8n": data.get("f8n"),
+        "data_f9n": data.get("f9n", {"otros": "No"}),
+        "data_f10n": data.get("f10n"),
+        "data_f10ac": data.get("f10ac", {"etiqueta_firma": "Firma"}),
+        "data_f10a_1": data.get("f10a_1"),
+        "data_f10a_2": data.get("f10a_2"),
+        "data_f10a_3": data.get("f10a_3"),
+        "data_f10a_4": data.get("f10a_4"),
+        "data_f10a_5": data.get("f10a_5"),
+        "data_f10_gerencia": data.get("f10_gerencia"),
+        "data_f11": data.get("f11", {}),
+        "data_roles": data.get("roles"),
+    }
@@ -0,0 +1,98 @@
+# flows/journal.py
+"""
+Journal - Bitácora de pasos completados para reanudar flujos interrumpidos
+
+Cada paso terminado con éxito se añade como una línea JSON a un archivo local:
+
+    {"permit": "Tebsa2025 - 100", "step": "f10a_3", "role": "solicitante", "ts": "2025-06-01T10:22:13"}
+
+Al iniciar una ejecución desde el principio se escribe un marcador
+(step="__inicio__"), así una reanudación solo tiene en cuenta los pasos de la
+última ejecución de ese permiso.
+
+Uso:
+    from flows.journal import Journal
+
+    journal = Journal("artifacts/journal_p1.jsonl")
+    engine.add_listener(journal.listener("Tebsa2025 - 100"))   # registra on_step_end
+    journal.next_step("Tebsa2025 - 100", [s.name for s in steps])  # → "f10a_4"
+"""
+import json
+import os
+import time
+from typing import List, Optional
+
+INICIO = "__inicio__"
+DEFAULT_PATH = os.path.join("artifacts", "journal_p1.jsonl")
+
+
+class Journal:
+    """Bitácora JSONL (append-only) de pasos completados por permiso."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MAP_JOURNAL", DEFAULT_PATH)
+
+    def record(self, permit: str, step: str, role: Optional[str] = None, **extra):
+        """Añade una línea al journal."""
+        linea = {"permit": permit, "step": step, "role": role,
+                 "ts": time.strftime("%Y-%m-%dT%H:%M:%S"), **extra}
+        carpeta = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(carpeta, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+    def start(self, permit: str):
+        """Marca el inicio de una ejecución completa del permiso."""
+        self.record(permit, INICIO)
+
+    def entries(self, permit: str) -> List[dict]:
+        """Pasos de la última ejecución de `permit` (posteriores al último marcador de inicio)."""
+        if not os.path.exists(self.path):
+            return []
+        out: List[dict] = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    e = json.loads(linea)
+                except ValueError:
+                    continue  # línea truncada por una interrupción
+                if e.get("permit") != permit:
+                    continue
+                if e.get("step") == INICIO:
+                    out = []
+                else:
+                    out.append(e)
+        return out
+
+    def last_completed(self, permit: str) -> Optional[dict]:
+        entries = self.entries(permit)
+        return entries[-1] if entries else None
+
+    def next_step(self, permit: str, steps: List[str]) -> Optional[str]:
+        """
+        Primer paso de `steps` posterior al último completado.
+
+        Returns:
+            Nombre del paso pendiente; steps[0] si no hay nada registrado;
+            None si el último completado es el final.
+        """
+        hechos = {e["step"] for e in self.entries(permit)}
+        ultimo = -1
+        for i, nombre in enumerate(steps):
+            if nombre in hechos:
+                ultimo = i
+        return steps[ultimo + 1] if ultimo + 1 < len(steps) else None
+
+    def listener(self, permit: str) -> "_JournalListener":
+        """Listener para StepEngine que registra cada paso terminado con éxito."""
+        return _JournalListener(self, permit)
+
+
+class _JournalListener:
+    def __init__(self, journal: Journal, permit: str):
+        self.journal = journal
+        self.permit = permit
+
+    def on_step_end(self, step, result):
+        if result.status == "ok":
+            self.journal.record(self.permit, step.name, result.role, seconds=result.seconds)
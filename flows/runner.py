@@ -0,0 +1,332 @@
+# flows/runner.py
+"""
+RUNNER - Ejecución concurrente de escenarios de permiso con un pool de workers
+
+Cada worker es un PROCESO con su propio Chrome (perfil --user-data-dir aislado),
+sus propias sesiones de rol y su carpeta de artefactos. Los workers toman
+escenarios de una cola compartida hasta vaciarla; el proceso principal recoge
+los resultados y arma un resumen agregado (pass/fail y tiempos).
+
+Un escenario es un dict:
+    {"id": "p1-base", "data": <dict como data/p1_permiso_trabajo.yaml>,
+     "creds": {"email": ..., "password": ...},   # opcional, solo con workers=1
+     "stop_after": "f7n"}                          # opcional
+
+Aislamiento entre workers: la lista de tareas es del usuario en el servidor,
+así que cada worker necesita su PROPIA cuenta de solicitante (`worker_creds`,
+--worker-creds); con varios workers y una sola cuenta el runner se niega a
+arrancar. Los roles posteriores (data.roles) sí se comparten: para que
+open_task distinga los permisos, la orden de trabajo de cada escenario debe
+ser única en la ejecución (a las repetidas se les añade el id del escenario).
+
+Uso:
+    from flows.runner import run_scenarios, escenarios_desde_yaml
+
+    resumen = run_scenarios(escenarios_desde_yaml(["data/p1_permiso_trabajo.yaml"]), workers=4)
+
+    # o desde la línea de comandos
+    python main.py runner --workers 4 --worker-creds data/cuentas_workers.yaml data/p1_permiso_trabajo.yaml
+"""
+import json
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import statistics
+import tempfile
+import time
+import traceback
+from typing import Iterable, List, Optional
+
+import yaml
+
+_FIN = None  # centinela de la cola de escenarios
+
+
+def escenarios_desde_yaml(rutas: List[str]) -> List[dict]:
+    """Un escenario por YAML de datos (id = nombre del archivo)."""
+    out, vistos = [], {}
+    for ruta in rutas:
+        with open(ruta, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        base = os.path.splitext(os.path.basename(ruta))[0]
+        vistos[base] = vistos.get(base, 0) + 1
+        out.append({"id": base if vistos[base] == 1 else f"{base}#{vistos[base]}", "data": data})
+    return out
+
+
+def cuentas_por_worker(workers: int, creds: Optional[dict] = None,
+                       worker_creds: Optional[List[dict]] = None) -> List[dict]:
+    """
+    Cuenta de solicitante de cada worker (índice 0 → worker 1).
+
+    Raises:
+        ValueError: si varios workers compartirían la misma cuenta
+    """
+    if worker_creds:
+        cuentas, emails = [], set()
+        for c in worker_creds:
+            email = (c.get("email") or "").strip().lower()
+            if email and email not in emails:
+                emails.add(email)
+                cuentas.append(c)
+        if len(cuentas) < workers:
+            raise ValueError(f"{workers} workers necesitan {workers} cuentas de solicitante distintas "
+                             f"y hay {len(cuentas)}: compartirían la lista de tareas")
+        return cuentas[:workers]
+    if workers > 1:
+        raise ValueError(f"{workers} workers con una sola cuenta ({(creds or {}).get('email')}): "
+                         "compartirían la lista de tareas; indica una cuenta por worker (--worker-creds)")
+    return [creds or {}]
+
+
+def cuentas_desde_yaml(ruta: str) -> List[dict]:
+    """Lista de {email, password} de un YAML (lista directa o bajo la clave `cuentas:`)."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or []
+    return list(data.get("cuentas") or []) if isinstance(data, dict) else list(data)
+
+
+def orden_unica(esc: dict, usadas: set) -> dict:
+    """
+    Devuelve el escenario con una orden de trabajo no usada aún en la ejecución
+    (si se repite se le añade el id del escenario). Registra la orden en `usadas`.
+    """
+    f1a = (esc.get("data") or {}).get("f1a") or {}
+    orden = f1a.get("orden_trabajo")
+    if not orden:
+        return esc
+    if orden in usadas:
+        orden = f"{orden} - {esc['id']}"
+        esc = dict(esc, data=dict(esc["data"], f1a=dict(f1a, orden_trabajo=orden)))
+    usadas.add(orden)
+    return esc
+
+
+def _no_ejecutado(esc_id: str, motivo: str) -> dict:
+    return {"id": esc_id, "status": "not_run", "seconds": 0.0, "error": motivo, "steps": [], "worker": None}
+
+
+def _guardar_evidencia(driver, carpeta: str, escenario_id: str):
+    seguro = "".join(c if c.isalnum() or c in "-_." else "_" for c in escenario_id)
+    try:
+        driver.save_screenshot(os.path.join(carpeta, f"{seguro}.png"))
+        with open(os.path.join(carpeta, f"{seguro}.html"), "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar evidencia de '{escenario_id}': {e}")
+
+
+def _ejecutar_escenario(driver, esc: dict, carpeta: str, defaults: dict) -> dict:
+    from flows.engine import StepFailed
+    from flows.flow_p1 import FlowP1, kwargs_desde_yaml
+    from flows.journal import Journal
+
+    creds = esc.get("creds") or defaults["creds"]  # la cuenta del worker salvo en serie
+    res = {"id": esc["id"], "status": "passed", "seconds": 0.0, "failed_step": None,
+           "error": None, "steps": []}
+    t0 = time.time()
+    try:
+        flow = FlowP1(driver, journal=Journal(os.path.join(carpeta, "journal.jsonl")))
+        pasos = flow.run(creds, stop_after=esc.get("stop_after", defaults.get("stop_after")),
+                         **kwargs_desde_yaml(esc["data"]))
+        res["steps"] = [{"name": p.name, "status": p.status, "seconds": p.seconds} for p in pasos]
+    except StepFailed as e:
+        res.update(status="failed", failed_step=e.result.name, error=e.result.error,
+                   steps=[{"name": p.name, "status": p.status, "seconds": p.seconds} for p in e.results])
+        causa = e.result.exception
+        if causa is not None:
+            res["traceback"] = "".join(traceback.format_exception(type(causa), causa, causa.__traceback__))
+    except Exception as e:
+        res.update(status="failed", error=f"{e.__class__.__name__}: {e}")
+    res["seconds"] = round(time.time() - t0, 3)
+    if res["status"] != "passed":
+        _guardar_evidencia(driver, carpeta, esc["id"])
+    return res
+
+
+def _worker(worker_id: int, tareas, resultados, opciones: dict):
+    """Proceso worker: un Chrome propio; toma escenarios de `tareas` hasta el centinela."""
+    from utils.browser import build_driver, reset_driver
+
+    carpeta = os.path.abspath(os.path.join(opciones["artifacts_dir"], f"worker_{worker_id}"))
+    os.makedirs(carpeta, exist_ok=True)
+    perfil = tempfile.mkdtemp(prefix=f"map_w{worker_id}_")
+    try:
+        driver = build_driver(headless=opciones["headless"], user_data_dir=perfil, download_dir=carpeta)
+    except Exception as e:
+        resultados.put({"worker": worker_id, "worker_error": f"{e.__class__.__name__}: {e}"})
+        shutil.rmtree(perfil, ignore_errors=True)
+        return
+
+    try:
+        while True:
+            esc = tareas.get()
+            if esc is _FIN:
+                break
+            print(f"🧵 worker {worker_id} → {esc['id']}")
+            try:
+                res = _ejecutar_escenario(driver, esc, carpeta, opciones)
+            except Exception:
+                res = {"id": esc["id"], "status": "failed", "seconds": 0.0,
+                       "error": traceback.format_exc(limit=3), "steps": []}
+            res["worker"] = worker_id
+            resultados.put(res)
+            try:
+                reset_driver(driver)
+            except Exception:
+                # driver inservible: se reemplaza para el siguiente escenario
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                driver = build_driver(headless=opciones["headless"], user_data_dir=perfil, download_dir=carpeta)
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(perfil, ignore_errors=True)
+
+
+def resumir(resultados: List[dict], wall: float) -> dict:
+    """Resumen agregado: pass/fail, tiempos por escenario y aceleración frente a serie."""
+    tiempos = [r["seconds"] for r in resultados if r.get("seconds")]
+    pasados = [r for r in resultados if r["status"] == "passed"]
+    resumen = {
+        "total": len(resultados),
+        "passed": len(pasados),
+        "failed": len([r for r in resultados if r["status"] == "failed"]),
+        "not_run": len([r for r in resultados if r["status"] == "not_run"]),
+        "wall_seconds": round(wall, 3),
+        "serial_seconds": round(sum(tiempos), 3),
+        "speedup": round(sum(tiempos) / wall, 2) if wall and tiempos else None,
+        "scenario_seconds": {
+            "median": round(statistics.median(tiempos), 3),
+            "max": round(max(tiempos), 3),
+        } if tiempos else {},
+        "results": sorted(resultados, key=lambda r: r["id"]),
+    }
+    return resumen
+
+
+def run_scenarios(escenarios: Iterable[dict], workers: int = 2, headless: bool = True,
+                  artifacts_dir: str = os.path.join("artifacts", "runs"),
+                  creds: Optional[dict] = None, stop_after: Optional[str] = None,
+                  timeout: Optional[float] = None, worker_creds: Optional[List[dict]] = None) -> dict:
+    """
+    Ejecuta los escenarios con `workers` procesos en paralelo.
+
+    Args:
+        escenarios: Iterable de escenarios ({"id", "data", ...}); se consume de forma perezosa
+        workers: Nivel de concurrencia (procesos/navegadores)
+        headless: Chrome sin ventana
+        artifacts_dir: Carpeta raíz; cada worker usa artifacts_dir/worker_<n>
+        creds: Credenciales por defecto (APP_EMAIL/APP_PASSWORD si None); solo con workers=1
+        worker_creds: Una cuenta de solicitante distinta por worker (obligatorio si workers > 1)
+        stop_after: Paso final por defecto para todos los escenarios
+        timeout: Límite global en segundos (None = sin límite)
+
+    Returns:
+        dict de resumir(): totales, tiempos y resultados por escenario.
+
+    Raises:
+        ValueError: si varios workers compartirían la cuenta de solicitante
+    """
+    creds = creds or {"email": os.getenv("APP_EMAIL"), "password": os.getenv("APP_PASSWORD")}
+    workers = max(1, int(workers))
+    cuentas = cuentas_por_worker(workers, creds, worker_creds)
+    opciones = {"headless": headless, "artifacts_dir": artifacts_dir, "stop_after": stop_after}
+    os.makedirs(artifacts_dir, exist_ok=True)
+
+    ctx = mp.get_context("spawn")
+    tareas = ctx.Queue(maxsize=workers * 2)
+    resultados_q = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(i, tareas, resultados_q, dict(opciones, creds=cuentas[i - 1])),
+                         name=f"map-worker-{i}", daemon=True)
+             for i in range(1, workers + 1)]
+    t0 = time.time()
+    for p in procs:
+        p.start()
+
+    enviados, resultados, vivos = [], [], workers
+
+    def recoger(bloquear: float):
+        nonlocal vivos
+        try:
+            r = resultados_q.get(timeout=bloquear)
+        except queue.Empty:
+            return
+        if "worker_error" in r:
+            vivos -= 1
+            print(f"⚠️ worker {r['worker']} no pudo arrancar: {r['worker_error']}")
+            return
+        resultados.append(r)
+        icono = "✅" if r["status"] == "passed" else "❌"
+        print(f"{icono} {r['id']} ({r['seconds']:.1f}s, worker {r['worker']})")
+
+    def hay_workers() -> bool:
+        return vivos > 0 and any(p.is_alive() for p in procs)
+
+    # alimentar la cola de forma perezosa (maxsize) mientras se recogen resultados
+    ordenes: set = set()
+    pendientes = iter(escenarios)
+    for esc in pendientes:
+        if workers > 1 and esc.get("creds"):
+            resultados.append(_no_ejecutado(esc["id"], "creds por escenario no admitidas con varios workers"))
+            continue
+        esc = orden_unica(esc, ordenes)
+        while hay_workers():
+            try:
+                tareas.put(esc, timeout=0.5)
+                enviados.append(esc["id"])
+                break
+            except queue.Full:
+                recoger(0.1)
+        else:
+            # sin workers vivos: el escenario en mano y el resto quedan sin ejecutar
+            resultados.append(_no_ejecutado(esc["id"], "sin worker disponible"))
+            resultados.extend(_no_ejecutado(e["id"], "sin worker disponible") for e in pendientes)
+            break
+    for _ in procs:
+        try:
+            tareas.put(_FIN, timeout=5)
+        except queue.Full:
+            pass
+
+    while len(resultados) < len(enviados) and hay_workers():
+        if timeout is not None and time.time() - t0 > timeout:
+            print(f"⏰ Límite global de {timeout}s alcanzado")
+            break
+        recoger(0.5)
+    # últimos resultados en vuelo
+    while True:
+        antes = len(resultados)
+        recoger(0.2)
+        if len(resultados) == antes:
+            break
+
+    for p in procs:
+        p.join(timeout=10)
+        if p.is_alive():
+            p.terminate()
+
+    hechos = {r["id"] for r in resultados}
+    resultados += [_no_ejecutado(i, "sin worker disponible") for i in enviados if i not in hechos]
+
+    resumen = resumir(resultados, time.time() - t0)
+    with open(os.path.join(artifacts_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
+    imprimir_resumen(resumen)
+    return resumen
+
+
+def imprimir_resumen(resumen: dict):
+    print("=" * 60)
+    print(f"📊 {resumen['passed']}/{resumen['total']} escenarios OK, {resumen['failed']} fallidos"
+          + (f", {resumen['not_run']} sin ejecutar" if resumen["not_run"] else ""))
+    print(f"⏱️ Pared {resumen['wall_seconds']:.1f}s vs serie {resumen['serial_seconds']:.1f}s"
+          + (f" (x{resumen['speedup']})" if resumen["speedup"] else ""))
+    for r in resumen["results"]:
+        if r["status"] != "passed":
+            print(f"   ❌ {r['id']}: {r.get('failed_step') or ''} {r.get('error') or ''}".rstrip())
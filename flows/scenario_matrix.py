@@ -0,0 +1,216 @@
+# flows/scenario_matrix.py
+"""
+SCENARIO MATRIX - Expansión combinatoria de escenarios a partir del YAML base
+
+Toma el YAML del camino feliz (data/p1_permiso_trabajo.yaml) y una definición
+de ejes (data/p1_matrix.yaml) y genera escenarios:
+
+- mode "full":     producto cartesiano completo (itertools.product, perezoso)
+- mode "pairwise": cobertura por pares con un greedy determinista (cada par de
+                   valores de dos ejes aparece en al menos un escenario)
+
+Cada escenario es {"id", "axes", "data"} — el mismo formato que consume
+flows/runner.py. Todo se genera de forma perezosa (generadores), así se puede
+repartir entre workers (`shard`) sin materializar la matriz.
+
+ID estable: sha1 de la asignación de ejes (JSON canónico), independiente del
+orden de generación y del modo; sirve para comparar tiempos entre ejecuciones.
+
+Campos condicionales: `dependents` declara qué campos solo tienen sentido con
+cierto valor de un eje (p.ej. `f7n.temp_c` solo si `f7n.temp_extremas: Si`);
+en el resto de escenarios se eliminan de los datos.
+
+Formato de la definición:
+    base: data/p1_permiso_trabajo.yaml
+    mode: pairwise
+    id_prefix: p1
+    id_field: f1a.orden_trabajo          # opcional: se le añade el id del escenario
+    axes:
+      f1a.area_clasificada: ["Si", "No"]
+      f7n.temp_extremas: ["Si", "No"]
+    dependents:
+      f7n.temp_extremas:
+        when: "Si"
+        fields: [f7n.temp_c]
+
+Uso:
+    from flows.scenario_matrix import ScenarioMatrix, shard
+
+    matriz = ScenarioMatrix.from_yaml("data/p1_matrix.yaml")
+    for esc in shard(matriz.scenarios(), index=0, count=4):
+        ...
+"""
+import copy
+import hashlib
+import itertools
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+_FALTA = object()
+
+
+def _get(data: dict, ruta: str, defecto=_FALTA):
+    actual = data
+    for parte in ruta.split("."):
+        if not isinstance(actual, dict) or parte not in actual:
+            return defecto
+        actual = actual[parte]
+    return actual
+
+
+def _set(data: dict, ruta: str, valor):
+    partes = ruta.split(".")
+    actual = data
+    for parte in partes[:-1]:
+        if not isinstance(actual.get(parte), dict):
+            actual[parte] = {}
+        actual = actual[parte]
+    actual[partes[-1]] = valor
+
+
+def _del(data: dict, ruta: str):
+    partes = ruta.split(".")
+    padre = _get(data, ".".join(partes[:-1])) if len(partes) > 1 else data
+    if isinstance(padre, dict):
+        padre.pop(partes[-1], None)
+
+
+def _norm(valor) -> str:
+    return str(valor).strip().lower()
+
+
+def scenario_id(axes: Dict[str, Any], prefix: str = "") -> str:
+    """Id estable: sha1 del JSON canónico de la asignación de ejes (10 hex)."""
+    canon = json.dumps(axes, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    h = hashlib.sha1(canon.encode("utf-8")).hexdigest()[:10]
+    return f"{prefix}-{h}" if prefix else h
+
+
+def pairwise(ejes: List[Tuple[str, List[Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Genera asignaciones que cubren todos los pares de valores entre ejes.
+
+    Greedy determinista: cada caso arranca con el primer par sin cubrir y
+    completa los demás ejes eligiendo el valor que cubre más pares nuevos
+    (empate → el primero declarado). Perezoso: produce caso a caso.
+    """
+    nombres = [n for n, _ in ejes]
+    valores = [list(v) for _, v in ejes]
+    if len(ejes) < 2:
+        for combo in itertools.product(*valores):
+            yield dict(zip(nombres, combo))
+        return
+
+    sin_cubrir = set()
+    for i, j in itertools.combinations(range(len(ejes)), 2):
+        for a in range(len(valores[i])):
+            for b in range(len(valores[j])):
+                sin_cubrir.add((i, a, j, b))
+
+    while sin_cubrir:
+        i0, a0, j0, b0 = min(sin_cubrir)
+        caso: Dict[int, int] = {i0: a0, j0: b0}
+        for k in range(len(ejes)):
+            if k in caso:
+                continue
+            mejor, mejor_n = 0, -1
+            for v in range(len(valores[k])):
+                n = 0
+                for m, w in caso.items():
+                    par = (m, w, k, v) if m < k else (k, v, m, w)
+                    if par in sin_cubrir:
+                        n += 1
+                if n > mejor_n:
+                    mejor, mejor_n = v, n
+            caso[k] = mejor
+        for m, n in itertools.combinations(sorted(caso), 2):
+            sin_cubrir.discard((m, caso[m], n, caso[n]))
+        yield {nombres[k]: valores[k][caso[k]] for k in range(len(ejes))}
+
+
+def shard(escenarios, index: int, count: int) -> Iterator[dict]:
+    """Subconjunto estable para el worker `index` de `count` (por hash del id)."""
+    if count <= 1:
+        yield from escenarios
+        return
+    if not 0 <= index < count:
+        raise ValueError(f"shard index fuera de rango: {index}/{count}")
+    for esc in escenarios:
+        h = int(hashlib.sha1(esc["id"].encode("utf-8")).hexdigest(), 16)
+        if h % count == index:
+            yield esc
+
+
+class ScenarioMatrix:
+    """Expande un YAML base según ejes y dependencias."""
+
+    MODES = ("full", "pairwise")
+
+    def __init__(self, base: dict, axes: Dict[str, List[Any]], mode: str = "pairwise",
+                 dependents: Optional[Dict[str, dict]] = None, id_prefix: str = "",
+                 id_field: Optional[str] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"mode debe ser uno de {self.MODES}: {mode}")
+        vacios = [k for k, v in axes.items() if not v]
+        if vacios:
+            raise ValueError(f"Ejes sin valores: {vacios}")
+        self.base = base
+        self.axes = list(axes.items())
+        self.mode = mode
+        self.dependents = dependents or {}
+        self.id_prefix = id_prefix
+        self.id_field = id_field
+
+    @classmethod
+    def from_yaml(cls, ruta: str, mode: Optional[str] = None) -> "ScenarioMatrix":
+        with open(ruta, "r", encoding="utf-8") as f:
+            spec = yaml.safe_load(f) or {}
+        base = spec.get("base") or {}
+        if isinstance(base, str):
+            with open(base, "r", encoding="utf-8") as f:
+                base = yaml.safe_load(f)
+        return cls(base, spec.get("axes") or {}, mode=mode or spec.get("mode", "pairwise"),
+                   dependents=spec.get("dependents"), id_prefix=spec.get("id_prefix", ""),
+                   id_field=spec.get("id_field"))
+
+    def size(self) -> Optional[int]:
+        """Número de escenarios en modo full (en pairwise no se conoce sin generarlos)."""
+        if self.mode != "full":
+            return None
+        n = 1
+        for _, valores in self.axes:
+            n *= len(valores)
+        return n
+
+    def assignments(self) -> Iterator[Dict[str, Any]]:
+        if self.mode == "full":
+            nombres = [n for n, _ in self.axes]
+            for combo in itertools.product(*(v for _, v in self.axes)):
+                yield dict(zip(nombres, combo))
+        else:
+            yield from pairwise(self.axes)
+
+    def scenarios(self) -> Iterator[dict]:
+        """Escenarios {"id", "axes", "data"} de forma perezosa."""
+        for asignacion in self.assignments():
+            yield self.build(asignacion)
+
+    def build(self, asignacion: Dict[str, Any]) -> dict:
+        """Datos del escenario: base + valores de los ejes − campos condicionales apagados."""
+        data = copy.deepcopy(self.base)
+        for ruta, valor in asignacion.items():
+            _set(data, ruta, valor)
+        for ruta, dep in self.dependents.items():
+            valor = _get(data, ruta, None)
+            activos = dep.get("when", "Si")
+            activos = activos if isinstance(activos, list) else [activos]
+            if valor is None or _norm(valor) not in {_norm(a) for a in activos}:
+                for campo in dep.get("fields", []):
+                    _del(data, campo)
+        sid = scenario_id(asignacion, self.id_prefix)
+        if self.id_field:
+            actual = _get(data, self.id_field, "")
+            _set(data, self.id_field, f"{actual} [{sid}]".strip())
+        return {"id": sid, "axes": dict(asignacion), "data": data}
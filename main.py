@@ -1,23 +1,125 @@
+import argparse
 import os
 import yaml
-from utils.browser import build_driver
-from flows.flow_p1 import FlowP1
+from utils.browser import BrowserPool
+from flows.flow_p1 import FlowP1, kwargs_desde_yaml
+from flows.journal import Journal
+from utils.actions.select_actions import resumen_endpoints
 
 def read_yaml(path):
     with open(path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Ejecuta el flujo P1 (Permiso de Trabajo)")
+    ap.add_argument("--data", default="data/p1_permiso_trabajo.yaml", help="YAML de datos del permiso")
+    ap.add_argument("--resume", action="store_true",
+                    help="Continúa desde el primer paso pendiente según el journal")
+    ap.add_argument("--start-at", help="Empieza en el paso indicado (p.ej. f10a_4)")
+    ap.add_argument("--stop-after", help="Termina tras el paso indicado (p.ej. f7n)")
+    ap.add_argument("--journal", help="Ruta del journal (por defecto artifacts/journal_p1.jsonl)")
+
+    sub = ap.add_subparsers(dest="cmd")
+    rn = sub.add_parser("runner", help="Ejecuta varios escenarios en paralelo (un Chrome por worker)")
+    rn.add_argument("escenarios", nargs="*", help="YAML(s) de datos, uno por escenario")
+    rn.add_argument("--matrix", help="Definición de ejes (p.ej. data/p1_matrix.yaml) a expandir en escenarios")
+    rn.add_argument("--mode", choices=["full", "pairwise"], help="Modo de expansión (por defecto el del YAML)")
+    rn.add_argument("--shard", default="0/1", help="Porción de la matriz para esta máquina: <índice>/<total>")
+    rn.add_argument("--workers", type=int, default=int(os.getenv("MAP_WORKERS", "0")),
+                    help="Workers en paralelo (por defecto uno por cuenta de --worker-creds, o 1)")
+    rn.add_argument("--worker-creds", default=os.getenv("MAP_WORKER_CREDS"),
+                    help="YAML con una cuenta de solicitante por worker (obligatorio con --workers > 1)")
+    rn.add_argument("--headed", action="store_true", help="Chrome con ventana (por defecto headless)")
+    rn.add_argument("--artifacts", default=os.path.join("artifacts", "runs"))
+
+    rp = sub.add_parser("replay", help="Reproduce una grabación de comandos WebDriver (MAP_RECORD)")
+    rp.add_argument("grabacion", help="Fichero .jsonl.gz grabado con MAP_RECORD")
+    destino = rp.add_mutually_exclusive_group()
+    destino.add_argument("--base-url", help="Redirige los get del origen grabado a esta URL")
+    destino.add_argument("--page", help="Página guardada (ruta o URL) a la que van todos los get")
+    destino.add_argument("--mock", action="store_true", help="Levanta la app local (mock_app) y reproduce contra ella")
+    rp.add_argument("--pace", choices=["asap", "recorded"], default="asap",
+                    help="asap: comandos seguidos; recorded: respeta las pausas grabadas")
+    rp.add_argument("--headed", action="store_true", help="Chrome con ventana (por defecto headless)")
+    rp.add_argument("--out", default=os.path.join("artifacts", "replay_report.json"))
+    return ap.parse_args(argv)
+
+def main_runner(args):
+    import itertools
+    from flows.runner import cuentas_desde_yaml, escenarios_desde_yaml, run_scenarios
+    from flows.scenario_matrix import ScenarioMatrix, shard
+
+    escenarios = escenarios_desde_yaml(args.escenarios)
+    if args.matrix:
+        indice, total = (int(x) for x in args.shard.split("/"))
+        matriz = ScenarioMatrix.from_yaml(args.matrix, mode=args.mode)
+        escenarios = itertools.chain(escenarios, shard(matriz.scenarios(), indice, total))
+    elif not escenarios:
+        raise SystemExit("runner: indica YAML(s) de escenarios o --matrix")
+    cuentas = cuentas_desde_yaml(args.worker_creds) if args.worker_creds else None
+    try:
+        resumen = run_scenarios(
+            escenarios,
+            workers=args.workers or (len(cuentas) if cuentas else 1),
+            headless=not args.headed,
+            artifacts_dir=args.artifacts,
+            stop_after=args.stop_after,
+            worker_creds=cuentas,
+        )
+    except ValueError as e:
+        raise SystemExit(f"runner: {e}")
+    raise SystemExit(0 if resumen["failed"] == 0 and resumen["not_run"] == 0 else 1)
+
+def main_replay(args):
+    from pathlib import Path
+    from utils.browser import build_driver
+    from utils.command_replay import CommandReplayer, guardar_informe, imprimir_informe
+
+    servidor, destino = None, args.base_url
+    if args.mock:
+        from mock_app.server import roles_desde_yaml, start_server
+        servidor, destino = start_server(roles=roles_desde_yaml(args.data))
+    pagina = args.page
+    if pagina and "://" not in pagina:
+        pagina = Path(pagina).resolve().as_uri()
+
+    driver = build_driver(headless=not args.headed)
+    try:
+        replayer = CommandReplayer.desde_archivo(driver, args.grabacion, destino=destino,
+                                                 pagina=pagina, pace=args.pace)
+        informe = replayer.run()
+    finally:
+        driver.quit()
+        if servidor is not None:
+            servidor.shutdown()
+    imprimir_informe(informe)
+    print(f"🎞️ Informe: {guardar_informe(informe, args.out)}")
+    raise SystemExit(0)
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.cmd == "runner":
+        main_runner(args)
+    if args.cmd == "replay":
+        main_replay(args)
+
     # Lee .env si quieres (opcional)
     email = os.getenv("APP_EMAIL", "usuario@tebsa.com")
     password = os.getenv("APP_PASSWORD", "Tebsa2023!")
 
-    data = read_yaml("data/p1_permiso_trabajo.yaml")
-    data_f1a = data["f1a"]
-    data_f7n = data.get("f7n", {})
+    data = read_yaml(args.data)
 
-    driver = build_driver(headless=False)
+    pool = BrowserPool(size=int(os.getenv("BROWSER_POOL_SIZE", "1")), headless=False).start()
     try:
-        FlowP1(driver).run({"email": email, "password": password}, data_f1a, data_f7n)
+        with pool.lease() as driver:
+            FlowP1(driver, journal=Journal(args.journal)).run(
+                {"email": email, "password": password},
+                stop_after=args.stop_after,
+                start_at=args.start_at,
+                resume=args.resume,
+                **kwargs_desde_yaml(data),
+            )
     finally:
-        driver.quit()
+        pool.close()
+        for campo, r in resumen_endpoints().items():
+            print(f"🌐 {campo}: {r['n']} búsqueda(s), media {r['avg_ms']} ms, máx {r['max_ms']} ms")
@@ -0,0 +1,173 @@
+# mock_app/forms.py
+"""
+Definición de los formularios y del proceso P1 que emula la app local.
+
+Cada formulario es una lista de campos que el front (static/app.js) pinta con
+la misma estructura DOM que apperator (MUI): `#auto-fields > div > div[n]`,
+labels dentro de `.MuiFormControl-root`, autocomplete con listbox, chips,
+tablas Si/No, canvas de firma y botón de foto.
+
+Tipos de campo:
+    text, textarea, number, datetime      → input/textarea con label
+    select, multi                         → autocomplete simple / múltiple (chips)
+    lookup                                → input de búsqueda + lupa + autocomplete
+                                            poblado por GET /api/lookup/<endpoint>
+    cuales                                → input sin label, placeholder '¿Cuáles?'
+    table                                 → tabla Si/No (radios) por fila
+    signature                             → canvas + botón verde 'Firmar'
+    photo                                 → botón 'Seleccionar una foto' (input file dinámico)
+
+`when: [campo, valor]` → el campo solo existe si `campo` vale `valor`.
+"""
+
+SI_NO = ["Si", "No"]
+
+LOOKUPS = {
+    "aks_kks": [
+        "SIST. SUM. ACEITE MANDO - SISTEMA SUM. ACEITE DE MANDO (No usar) - 24MAX11",
+        "SIST. SUM. ACEITE MANDO - BOMBA PRINCIPAL - 24MAX12",
+        "SIST. REFRIGERACION - INTERCAMBIADOR - 24PGB10",
+        "CHIMENEA - DUCTO DE GASES - 24HNA10",
+    ],
+    "empresa": ["Metales", "Montajes Industriales", "Servicios Electricos del Caribe", "TEBSA"],
+}
+
+CARGOS = [
+    "Responsable activar el plan de emergencia",
+    "Responsable del Trabajo",
+    "Supervisor de TEBSA",
+    "Operador",
+    "Jefe de turno",
+]
+
+RIESGOS = ["Trabajos en Altura", "Espacios Confinados", "Trabajos en Caliente", "Riesgo Electrico",
+           "Sustancias Quimicas", "Izaje de Cargas"]
+EPP = ["Casco con barbuquejo", "Gafas de Seguridad", "Guantes de vaqueta", "Botas de seguridad",
+       "Protector auditivo", "Careta facial"]
+CONDICIONES = ["Area señalizada y demarcada", "Herramientas en buen estado", "Personal capacitado",
+               "Equipos de emergencia disponibles", "Permisos complementarios vigentes"]
+
+
+def _f(tipo, label=None, **kw):
+    d = {"type": tipo}
+    if label is not None:
+        d["label"] = label
+    d.update(kw)
+    return d
+
+
+def _firma(label="Firma"):
+    return _f("signature", label)
+
+
+FORMS = {
+    "f1": {"title": "TEBSA - F1. Nuevo permiso de trabajo", "fields": []},
+    "f1a": {
+        "title": "TEBSA - F1a. Permisos de Trabajo",
+        "permit_field": "Orden de trabajo",   # se muestra en los task-item del permiso
+        "fields": [
+            _f("text", "Orden de trabajo"),                                              # div[1]
+            _f("select", "Identificación permiso", options=["SIE", "SIC", "SIA"]),       # div[2]
+            _f("datetime", "Vigente desde"),                                             # div[3]
+            _f("datetime", "Vigente hasta"),                                             # div[4]
+            _f("select", "Lugar de trabajo", options=["Planta Tebsa", "Subestacion", "Patio de tanques"]),
+            _f("lookup", "AKS/KKS", input_label="kks", endpoint="aks_kks"),             # div[6]
+            _f("lookup", "Empresa que ejecuta el trabajo", endpoint="empresa"),         # div[7]
+            _f("select", "Supervisor TEBSA", options=["ALBERTO ESCAÑO", "MARIA PEREZ", "JOSE DIAZ"]),
+            _f("text", "Responsable del trabajo"),
+            _f("textarea", "Descripcion del trabajo"),
+            _f("select", "Es un area clasificada?", options=SI_NO),
+            _f("select", "Area Clasificada", options=["Estacion Reductora", "Turbinas", "Calderas"],
+               when=["Es un area clasificada?", "Si"]),
+            _f("select", "Es un area restringida? ", options=SI_NO),
+            _f("select", "Requiere LOTO? ", options=SI_NO),
+            _f("select", "Requiere espacio confinado?", options=SI_NO),
+            _f("select", "Requiere trabajo seguro en altura? ", options=SI_NO),
+            _f("select", "Requiere trabajo en caliente?", options=SI_NO),
+            _f("select", "Requiere trabajo con tension?", options=SI_NO),
+            _f("select", "Requiere autorizacion de Gerencia de planta?", options=SI_NO),
+            _f("select", "Motivo", options=["PARADA UNIDAD", "MANTENIMIENTO PREVENTIVO", "EMERGENCIA"]),
+        ],
+    },
+    "f7n": {
+        "title": "TEBSA - F7n. Análisis de Riesgos",
+        "fields": [
+            _f("table", "Riesgos", rows=RIESGOS),
+            _f("select", "Temperaturas extremas", options=SI_NO),
+            _f("number", "°C", when=["Temperaturas extremas", "Si"]),
+            _f("select", "Presiones", options=SI_NO),
+            _f("number", "Bar", when=["Presiones", "Si"]),
+            _f("select", "Eléctrico", options=SI_NO),
+            _f("number", "Volt", when=["Eléctrico", "Si"]),
+            _f("select", "Otros", options=SI_NO),
+            _f("cuales", when=["Otros", "Si"]),
+        ],
+    },
+    "f8n": {
+        "title": "TEBSA - F8n. EPP Requerido",
+        "fields": [
+            _f("table", "EPP", rows=EPP),
+            _f("select", "Traje para uso de químicos", options=SI_NO),
+            _f("text", "Nivel", when=["Traje para uso de químicos", "Si"]),
+            _f("select", "Punto de Anclaje", options=SI_NO),
+            _f("multi", "Anclaje", options=["Fijo", "Movil"], when=["Punto de Anclaje", "Si"]),
+            _f("select", "Línea de vida", options=SI_NO),
+            _f("multi", "Linea de vida", options=["Vertical", "Horizontal"], when=["Línea de vida", "Si"]),
+            _f("select", "Arnes", options=SI_NO),
+            _f("number", "¿Cuantas argollas?"),
+            _f("select", "Otros conectores", options=SI_NO),
+            _f("cuales", when=["Otros conectores", "Si"]),
+            _f("select", "Otros", options=SI_NO),
+            _f("cuales", when=["Otros", "Si"]),
+        ],
+    },
+    "f9n": {
+        "title": "TEBSA - F9n. Condiciones de Seguridad",
+        "fields": [
+            _f("table", "Condiciones", rows=CONDICIONES),
+            _f("select", "Otros", options=SI_NO),
+            _f("cuales", when=["Otros", "Si"]),
+        ],
+    },
+    "f10n": {
+        "title": "TEBSA - F10n. Trabajadores autorizados",
+        "fields": [
+            _f("multi", "Trabajadores", options=["KATE BULA - 123654", "LUIS MARTINEZ - 778812",
+                                                  "ANA GOMEZ - 556677", "PEDRO RUIZ - 990011"]),
+        ],
+    },
+    "f10_2": {"title": "TEBSA - F10_2. Trabajador autorizado", "fields": []},
+    "f10ac": {
+        "title": "TEBSA - F10a.c. Firma Permiso de Trabajo (Trabajador autorizado)",
+        "fields": [_firma()],
+    },
+    "f10a": {
+        "title": "TEBSA - F10a. Firma Permiso de Trabajo",
+        "fields": [
+            _f("text", "Nombre"),
+            _f("select", "Cargo", options=CARGOS),
+            _firma(),
+        ],
+    },
+    "f10_gerencia": {
+        "title": "TEBSA - F10. Firma Gerencia",
+        "fields": [_f("select", "Autoriza", options=SI_NO), _firma("Firma gerente")],
+    },
+    "f11": {
+        "title": "TEBSA - F11. Permiso de Trabajo Firmado (Documento físico)",
+        "fields": [_f("photo", "Foto del permiso firmado", button="Seleccionar una foto")],
+    },
+}
+
+# Proceso P1: (formulario, rol que lo recibe). None = quien creó el permiso.
+WORKFLOW = [
+    ("f1", None), ("f1a", None), ("f7n", None), ("f8n", None), ("f9n", None),
+    ("f10n", None), ("f10_2", None), ("f10ac", None),
+    ("f10a", None), ("f10a", None), ("f10a", None),
+    ("f10a", "operador"), ("f10a", "jefe_turno"),
+    ("f10_gerencia", "gerencia"),
+    ("f11", None),
+]
+
+# Formulario que inicia el proceso (lista de "nuevo formulario")
+INICIO = "f1"
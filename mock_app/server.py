@@ -0,0 +1,383 @@
+# mock_app/server.py
+"""
+Mock App - Servidor local que emula apperator para ejecutar FlowP1 sin backend real
+
+Sirve una SPA en JavaScript plano (static/app.js) con la estructura DOM que
+esperan nuestros locators (login, `#tasks` con `task-item`, formularios en
+`#auto-fields` con autocomplete MUI, tablas Si/No, canvas de firma, foto,
+toasts `.pushing` y spinners) y una API en memoria con el proceso P1
+(mock_app/forms.py): cada envío crea la siguiente tarea para el rol que toca.
+
+Latencias configurables (deterministas salvo --jitter-ms):
+    --latency-ms   toda petición /api
+    --lookup-ms    extra de las lupas (AKS/KKS, empresa)
+    --upload-ms    extra de la subida de foto
+    --render-ms    retardo del front al pintar formularios y opciones
+    --toast-ms     duración del toast 'pushing' tras enviar
+
+Uso:
+    python -m mock_app.server --port 8765 --latency-ms 150 --toast-ms 1200
+    MAP_BASE_URL=http://127.0.0.1:8765 python main.py
+
+    # desde Python (benchmarks/tests)
+    from mock_app.server import start_server
+    servidor, url = start_server(latency_ms=0)
+    ...
+    servidor.shutdown()
+
+Endpoints:
+    GET  /, /user, /task/<id>, /fixture/<form>   → SPA
+    POST /api/login {email, password}            → cookie de sesión
+    POST /api/logout                             → invalida el token (con --logout-conserva-token solo borra la cookie)
+    GET  /api/me
+    GET  /api/tasks                              → tareas del usuario
+    POST /api/permits                            → nuevo permiso (tarea F1)
+    GET  /api/tasks/<id>                         → tarea + definición del formulario
+    POST /api/tasks/<id>/submit {valores}        → guarda y crea la siguiente tarea
+    GET  /api/lookup/<endpoint>?q=               → opciones de una lupa
+    POST /api/upload                             → recibe la foto
+    GET  /api/state                              → permisos y envíos (depuración/asserts)
+    POST /api/reset                              → vacía el estado
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+from mock_app.forms import FORMS, INICIO, LOOKUPS, WORKFLOW
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+COOKIE = "map_sid"
+DEFAULT_ROLES_YAML = os.path.join("data", "p1_permiso_trabajo.yaml")
+
+_TIPOS = {".js": "application/javascript; charset=utf-8", ".css": "text/css; charset=utf-8",
+          ".html": "text/html; charset=utf-8"}
+
+
+def roles_desde_yaml(ruta: str) -> Dict[str, str]:
+    """{rol: email} a partir de la sección `roles:` del YAML de datos."""
+    if not ruta or not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return {rol: (c or {}).get("email", "").lower() for rol, c in (data.get("roles") or {}).items()}
+
+
+class MockState:
+    """Estado en memoria: sesiones, permisos y tareas."""
+
+    def __init__(self, roles: Optional[Dict[str, str]] = None):
+        self.lock = threading.Lock()
+        self.roles = roles or {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.sesiones: Dict[str, str] = {}
+            self.permisos: Dict[int, dict] = {}
+            self.tareas: Dict[int, dict] = {}
+            self.subidas = []
+            self._ids = itertools.count(1)
+
+    # ---------- sesiones ----------
+
+    def login(self, email: str) -> str:
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sesiones[token] = email.strip().lower()
+        return token
+
+    def logout(self, token: Optional[str]):
+        with self.lock:
+            self.sesiones.pop(token or "", None)
+
+    def usuario(self, token: Optional[str]) -> Optional[str]:
+        return self.sesiones.get(token or "")
+
+    # ---------- proceso ----------
+
+    def _rol_de(self, email: str) -> Optional[str]:
+        for rol, mail in self.roles.items():
+            if mail == email:
+                return rol
+        return None
+
+    def visible(self, tarea: dict, email: str) -> bool:
+        if tarea["status"] != "open":
+            return False
+        rol = tarea["role"]
+        if rol is None:
+            return tarea["owner"] == email
+        if rol in self.roles:
+            return self.roles[rol] == email
+        return self._rol_de(email) is None and tarea["owner"] != email  # rol sin mapear: otro usuario
+
+    def _crear_tarea(self, permiso: dict, paso: int) -> dict:
+        form, rol = WORKFLOW[paso]
+        tarea = {"id": next(self._ids), "permit": permiso["id"], "step": paso, "form": form,
+                 "title": FORMS[form]["title"], "role": rol, "owner": permiso["owner"],
+                 "status": "open", "created": time.time()}
+        self.tareas[tarea["id"]] = tarea
+        return tarea
+
+    def nuevo_permiso(self, email: str) -> dict:
+        with self.lock:
+            permiso = {"id": next(self._ids), "owner": email, "label": "", "submissions": [],
+                       "status": "open"}
+            self.permisos[permiso["id"]] = permiso
+            return self._crear_tarea(permiso, WORKFLOW.index((INICIO, None)))
+
+    def tareas_de(self, email: str) -> list:
+        with self.lock:
+            out = []
+            for t in self.tareas.values():
+                if self.visible(t, email):
+                    out.append(dict(t, permit_label=self.permisos[t["permit"]]["label"]))
+            return sorted(out, key=lambda t: t["id"], reverse=True)
+
+    def tarea(self, tid: int) -> Optional[dict]:
+        return self.tareas.get(tid)
+
+    def enviar(self, tid: int, email: str, valores: dict) -> Tuple[bool, Optional[dict]]:
+        """Guarda el envío y crea la siguiente tarea. (ok, siguiente tarea)."""
+        with self.lock:
+            t = self.tareas.get(tid)
+            if t is None or not self.visible(t, email):
+                return False, None
+            t["status"] = "done"
+            permiso = self.permisos[t["permit"]]
+            permiso["submissions"].append({"step": t["step"], "form": t["form"], "by": email,
+                                           "values": valores, "ts": time.time()})
+            campo = FORMS[t["form"]].get("permit_field")
+            if campo and valores.get(campo):
+                permiso["label"] = str(valores[campo])
+            if t["step"] + 1 < len(WORKFLOW):
+                return True, self._crear_tarea(permiso, t["step"] + 1)
+            permiso["status"] = "closed"
+            return True, None
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"permits": list(self.permisos.values()), "tasks": list(self.tareas.values()),
+                    "uploads": list(self.subidas)}
+
+
+def _handler(state: MockState, config: dict):
+    rng = random.Random(config.get("seed", 0))
+
+    def dormir(ms: float):
+        jitter = config.get("jitter_ms", 0)
+        total = ms + (rng.uniform(0, jitter) if jitter else 0)
+        if total > 0:
+            time.sleep(total / 1000.0)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            if config.get("verbose"):
+                BaseHTTPRequestHandler.log_message(self, *args)
+
+        # ---------- utilidades ----------
+
+        def _responder(self, codigo: int, tipo: str, cuerpo: bytes, cabeceras: Optional[dict] = None):
+            self.send_response(codigo)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.send_header("Cache-Control", "no-store")
+            for k, v in (cabeceras or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def _json(self, data, codigo: int = 200, cabeceras: Optional[dict] = None):
+            self._responder(codigo, "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8"),
+                            cabeceras)
+
+        def _leer(self) -> bytes:
+            restante = int(self.headers.get("Content-Length") or 0)
+            trozos = []
+            while restante > 0:
+                trozo = self.rfile.read(min(restante, 1 << 16))
+                if not trozo:
+                    break
+                trozos.append(trozo)
+                restante -= len(trozo)
+            return b"".join(trozos)
+
+        def _cuerpo_json(self) -> dict:
+            try:
+                return json.loads(self._leer() or b"{}")
+            except ValueError:
+                return {}
+
+        def _token(self) -> Optional[str]:
+            c = SimpleCookie(self.headers.get("Cookie") or "")
+            return c[COOKIE].value if COOKIE in c else None
+
+        def _usuario(self) -> Optional[str]:
+            return state.usuario(self._token())
+
+        # ---------- GET ----------
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.startswith("/api/"):
+                dormir(config["latency_ms"])
+                return self._api_get(url)
+            if url.path.startswith("/static/"):
+                return self._estatico(url.path[len("/static/"):])
+            if url.path == "/favicon.ico":
+                return self._responder(204, "image/x-icon", b"")
+            return self._spa()
+
+        def _spa(self):
+            with open(os.path.join(STATIC_DIR, "index.html"), "r", encoding="utf-8") as f:
+                html = f.read()
+            boot = {"config": {k: config[k] for k in ("render_ms", "toast_ms")}, "forms": FORMS, "start": INICIO}
+            js = json.dumps(boot, ensure_ascii=False).replace("</", "<\\/")
+            html = html.replace("/*__MOCK_BOOT__*/", "window.MOCK = " + js + ";")
+            self._responder(200, "text/html; charset=utf-8", html.encode("utf-8"))
+
+        def _estatico(self, nombre: str):
+            ruta = os.path.normpath(os.path.join(STATIC_DIR, nombre))
+            if not ruta.startswith(STATIC_DIR) or not os.path.isfile(ruta):
+                return self._responder(404, "text/plain", b"not found")
+            with open(ruta, "rb") as f:
+                cuerpo = f.read()
+            self._responder(200, _TIPOS.get(os.path.splitext(ruta)[1], "application/octet-stream"), cuerpo)
+
+        def _api_get(self, url):
+            partes = url.path.strip("/").split("/")[1:]
+            if partes == ["state"]:
+                return self._json(state.snapshot())
+            if partes and partes[0] == "lookup" and len(partes) == 2:
+                dormir(config["lookup_ms"])
+                q = (parse_qs(url.query).get("q") or [""])[0].strip().lower()
+                opciones = [o for o in LOOKUPS.get(partes[1], []) if not q or q in o.lower()]
+                return self._json({"options": opciones})
+
+            email = self._usuario()
+            if email is None:
+                return self._json({"error": "sin sesión"}, 401)
+            if partes == ["me"]:
+                return self._json({"email": email})
+            if partes == ["tasks"]:
+                return self._json({"tasks": state.tareas_de(email)})
+            if len(partes) == 2 and partes[0] == "tasks" and partes[1].isdigit():
+                t = state.tarea(int(partes[1]))
+                if t is None or not state.visible(t, email):
+                    return self._json({"error": "tarea no encontrada"}, 404)
+                return self._json({"task": t, "form": FORMS[t["form"]]})
+            return self._json({"error": "no existe"}, 404)
+
+        # ---------- POST ----------
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            partes = url.path.strip("/").split("/")[1:]
+            if partes == ["upload"]:
+                n = len(self._leer())
+                dormir(config["latency_ms"] + config["upload_ms"])
+                state.subidas.append({"bytes": n, "ts": time.time()})
+                return self._json({"bytes": n})
+
+            cuerpo = self._cuerpo_json()
+            dormir(config["latency_ms"])
+            if partes == ["login"]:
+                if not cuerpo.get("email") or not cuerpo.get("password"):
+                    return self._json({"error": "credenciales incompletas"}, 400)
+                token = state.login(cuerpo["email"])
+                return self._json({"email": cuerpo["email"].lower()}, cabeceras={
+                    "Set-Cookie": f"{COOKIE}={token}; Path=/; SameSite=Lax"})
+            if partes == ["logout"]:
+                # como el backend real: el token deja de valer (también para snapshots que lo guarden)
+                if config.get("logout_invalida", True):
+                    state.logout(self._token())
+                return self._json({"ok": True}, cabeceras={"Set-Cookie": f"{COOKIE}=; Path=/; Max-Age=0"})
+            if partes == ["reset"]:
+                state.reset()
+                return self._json({"ok": True})
+
+            email = self._usuario()
+            if email is None:
+                return self._json({"error": "sin sesión"}, 401)
+            if partes == ["permits"]:
+                return self._json({"task": state.nuevo_permiso(email)})
+            if len(partes) == 3 and partes[0] == "tasks" and partes[1].isdigit() and partes[2] == "submit":
+                ok, siguiente = state.enviar(int(partes[1]), email, cuerpo.get("values") or {})
+                if not ok:
+                    return self._json({"error": "tarea no disponible"}, 409)
+                return self._json({"ok": True, "next": siguiente})
+            return self._json({"error": "no existe"}, 404)
+
+    return Handler
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0, lookup_ms: float = 0,
+                 upload_ms: float = 0, render_ms: float = 0, toast_ms: float = 600, jitter_ms: float = 0,
+                 seed: int = 0, roles: Optional[Dict[str, str]] = None, verbose: bool = False,
+                 logout_invalida: bool = True):
+    """
+    Arranca el servidor en un hilo (daemon).
+
+    Con `logout_invalida=False` el logout solo borra la cookie y el token
+    sigue aceptándose (para aislar fallos que no sean de sesión).
+
+    Returns:
+        (servidor, url_base) — detener con servidor.shutdown()
+    """
+    config = {"latency_ms": latency_ms, "lookup_ms": lookup_ms, "upload_ms": upload_ms,
+              "render_ms": render_ms, "toast_ms": toast_ms, "jitter_ms": jitter_ms, "seed": seed,
+              "verbose": verbose, "logout_invalida": logout_invalida}
+    state = MockState(roles if roles is not None else roles_desde_yaml(DEFAULT_ROLES_YAML))
+    servidor = ThreadingHTTPServer((host, port), _handler(state, config))
+    servidor.daemon_threads = True
+    servidor.state = state
+    threading.Thread(target=servidor.serve_forever, name="mock-app", daemon=True).start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="App local que emula apperator (proceso P1)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0, help="Latencia de cada petición /api")
+    ap.add_argument("--lookup-ms", type=float, default=300, help="Latencia extra de las lupas")
+    ap.add_argument("--upload-ms", type=float, default=0, help="Latencia extra de la subida de foto")
+    ap.add_argument("--render-ms", type=float, default=150, help="Retardo de pintado de formularios/opciones")
+    ap.add_argument("--toast-ms", type=float, default=1200, help="Duración del toast tras enviar")
+    ap.add_argument("--jitter-ms", type=float, default=0, help="Ruido aleatorio (semilla fija) sobre la latencia")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--roles", default=DEFAULT_ROLES_YAML, help="YAML con la sección roles: (email por rol)")
+    ap.add_argument("--verbose", action="store_true", help="Log de cada petición")
+    ap.add_argument("--logout-conserva-token", action="store_true",
+                    help="El logout solo borra la cookie (el token sigue siendo válido)")
+    args = ap.parse_args(argv)
+
+    servidor, url = start_server(args.host, args.port, args.latency_ms, args.lookup_ms, args.upload_ms,
+                                 args.render_ms, args.toast_ms, args.jitter_ms, args.seed,
+                                 roles_desde_yaml(args.roles), args.verbose,
+                                 logout_invalida=not args.logout_conserva_token)
+    print(f"🧪 Mock app en {url}  (MAP_BASE_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,560 @@
+/*
+ * mock_app/static/app.js — SPA que imita apperator (ver mock_app/server.py).
+ *
+ * Vistas: pantalla sin sesión (#no-loged-screen), login, /user, lista de
+ * tareas (#tasks / #task-info / .task-item), formulario (/task/<id>) y
+ * /fixture/<form> (un formulario suelto, sin login ni envío real).
+ * Los formularios se pintan desde window.MOCK.forms con la estructura MUI
+ * que esperan los locators del repo.
+ */
+(function () {
+    'use strict';
+
+    const MOCK = window.MOCK || {config: {}, forms: {}};
+    const CFG = MOCK.config || {};
+    const app = document.getElementById('app');
+    const avisos = document.getElementById('push-notifications');
+    let usuario = null;
+    let sondeo = null;
+    let seq = 0;
+
+    // ---------- utilidades ----------
+
+    function h(tag, attrs) {
+        const el = document.createElement(tag);
+        Object.entries(attrs || {}).forEach(([k, v]) => {
+            if (v === null || v === undefined || v === false) return;
+            if (k === 'class') el.className = v;
+            else if (k.startsWith('on')) el.addEventListener(k.slice(2), v);
+            else el.setAttribute(k, v === true ? '' : v);
+        });
+        Array.prototype.slice.call(arguments, 2).flat(Infinity).forEach(c => {
+            if (c !== null && c !== undefined && c !== false) el.append(c instanceof Node ? c : String(c));
+        });
+        return el;
+    }
+
+    function mount() {
+        app.replaceChildren(...Array.from(arguments).filter(Boolean));
+    }
+
+    const esperar = ms => new Promise(r => setTimeout(r, ms || 0));
+
+    function norm(s) {
+        return (s || '').normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+            .toLowerCase().replace(/\s+/g, ' ').trim();
+    }
+
+    async function api(method, url, body) {
+        const opts = {method: method, credentials: 'same-origin', headers: {}};
+        if (body !== undefined) {
+            opts.headers['Content-Type'] = 'application/json';
+            opts.body = JSON.stringify(body);
+        }
+        const r = await fetch(url, opts);
+        const data = await r.json().catch(() => ({}));
+        if (!r.ok) {
+            const e = new Error(data.error || String(r.status));
+            e.status = r.status;
+            throw e;
+        }
+        return data;
+    }
+
+    let avisoTimer = null;
+    function aviso(texto) {
+        avisos.classList.add('pushing');
+        avisos.replaceChildren(h('div', {class: 'push-notification'}, texto));
+        clearTimeout(avisoTimer);
+        avisoTimer = setTimeout(() => {
+            avisos.classList.remove('pushing');
+            avisos.replaceChildren();
+        }, CFG.toast_ms || 0);
+    }
+
+    // ---------- rutas ----------
+
+    function go(path) {
+        if (location.pathname !== path) history.pushState({}, '', path);
+        return route();
+    }
+    window.addEventListener('popstate', route);
+
+    async function route() {
+        clearInterval(sondeo);
+        cerrarPopper();
+        const p = location.pathname;
+        let m = p.match(/^\/fixture\/(\w+)\/?$/);
+        if (m) return renderFixture(m[1]);
+
+        try {
+            usuario = (await api('GET', '/api/me')).email;
+        } catch (e) {
+            usuario = null;
+        }
+        if (!usuario) return p === '/login' ? renderLogin() : renderSinSesion();
+        if (p === '/login') {
+            history.replaceState({}, '', '/');
+            return renderTareas();
+        }
+        if (p === '/user') return renderUsuario();
+        m = p.match(/^\/task\/(\d+)$/);
+        if (m) return renderTarea(+m[1]);
+        return renderTareas();
+    }
+
+    // ---------- sesión ----------
+
+    function navbar() {
+        let menu = null;
+        const abrirMenu = () => {
+            if (menu) { menu.remove(); menu = null; return; }
+            menu = h('div', {role: 'menu'},
+                h('button', {type: 'button', id: 'logout', onclick: cerrarSesion}, 'Cerrar Sesión'));
+            barra.append(menu);
+        };
+        const barra = h('div', {id: 'navbar'},
+            h('a', {href: '/', class: 'brand', onclick: e => { e.preventDefault(); go('/'); }}, 'apperator (mock)'),
+            h('span', {class: 'spacer'}),
+            h('button', {type: 'button', class: 'user-button', 'aria-haspopup': 'menu', onclick: abrirMenu}, usuario));
+        return barra;
+    }
+
+    function renderSinSesion() {
+        mount(h('div', {id: 'no-loged-screen'},
+            h('p', {}, 'No has iniciado sesión'),
+            h('button', {type: 'button', onclick: () => go('/login')}, 'Ingresar')));
+    }
+
+    function renderLogin() {
+        const email = h('input', {type: 'email', name: 'email', autocomplete: 'username'});
+        const clave = h('input', {type: 'password', name: 'password', autocomplete: 'current-password'});
+        const error = h('p', {class: 'empty'});
+        const enviar = async e => {
+            e.preventDefault();
+            try {
+                await api('POST', '/api/login', {email: email.value, password: clave.value});
+                go('/');
+            } catch (err) {
+                error.textContent = 'No se pudo iniciar sesión: ' + err.message;
+            }
+        };
+        mount(h('div', {class: 'login-screen'},
+            h('form', {onsubmit: enviar},
+                h('label', {}, 'Correo', email),
+                h('label', {}, 'Contraseña', clave),
+                h('button', {type: 'submit'}, 'Ingresar'),
+                error)));
+    }
+
+    function renderUsuario() {
+        mount(navbar(), h('div', {id: 'user-view'},
+            h('h2', {}, 'Perfil'),
+            h('p', {}, usuario),
+            h('button', {type: 'button', onclick: cerrarSesion}, 'Cerrar Sesión')));
+    }
+
+    async function cerrarSesion() {
+        try { await api('POST', '/api/logout'); } catch (_) { /* ya sin sesión */ }
+        usuario = null;
+        go('/');
+    }
+
+    // ---------- lista de tareas ----------
+
+    function itemTarea(t) {
+        const permiso = '#' + t.permit + (t.permit_label ? ' · ' + t.permit_label : '');
+        return h('div', {class: 'task-item', 'data-id': t.id, onclick: () => go('/task/' + t.id)},
+            h('span', {}, t.title),
+            h('small', {}, permiso));
+    }
+
+    async function cargarTareas(lista) {
+        let tareas;
+        try {
+            tareas = (await api('GET', '/api/tasks')).tasks;
+        } catch (e) {
+            if (e.status === 401 && lista.isConnected) go('/');
+            return;
+        }
+        const firma = tareas.map(t => t.id + ':' + t.permit_label).join('|');
+        if (lista.dataset.firma === firma) return;
+        await esperar(CFG.render_ms);
+        if (!lista.isConnected) return;
+        lista.dataset.firma = firma;
+        lista.replaceChildren(...(tareas.length ? tareas.map(itemTarea)
+            : [h('p', {class: 'empty'}, 'No tienes tareas pendientes')]));
+    }
+
+    function renderTareas() {
+        const lista = h('div', {id: 'task-info'});
+        const inicio = MOCK.forms[MOCK.start];
+        const nuevos = h('div', {class: 'start-menu', hidden: true},
+            h('div', {class: 'form', onclick: () => crearPermiso(nuevos, lista)}, inicio.title));
+        mount(navbar(), h('div', {id: 'tasks', class: 'tasks'},
+            h('button', {type: 'button', title: 'Nuevo formulario', onclick: () => { nuevos.hidden = !nuevos.hidden; }}, '+'),
+            nuevos,
+            lista));
+        cargarTareas(lista);
+        // la app real actualiza la lista con notificaciones push; aquí, sondeo
+        sondeo = setInterval(() => cargarTareas(lista), 2000);
+    }
+
+    async function crearPermiso(nuevos, lista) {
+        nuevos.hidden = true;
+        await api('POST', '/api/permits');
+        await cargarTareas(lista);
+    }
+
+    // ---------- formulario ----------
+
+    async function renderTarea(id) {
+        let data;
+        try {
+            data = await api('GET', '/api/tasks/' + id);
+        } catch (e) {
+            aviso('La tarea ya no está disponible');
+            return go('/');
+        }
+        await esperar(CFG.render_ms);
+        renderFormulario(data.form, {taskId: id});
+    }
+
+    function renderFixture(key) {
+        const form = MOCK.forms[key];
+        if (!form) return mount(h('p', {class: 'empty'}, 'Formulario desconocido: ' + key));
+        renderFormulario(form, {fixture: true});
+    }
+
+    function clave(f) {
+        return f.label || '¿Cuáles? (' + f.when[0] + ')';
+    }
+
+    function renderFormulario(form, opts) {
+        const valores = {};
+        MOCK.values = valores;
+        const slots = form.fields.map(() => h('div', {}));
+        const pintar = () => form.fields.forEach((f, i) => {
+            const visible = !f.when || valores[f.when[0]] === f.when[1];
+            const presente = slots[i].dataset.on === '1';
+            if (visible && !presente) {
+                slots[i].replaceChildren(...[].concat(campo(f, valores, pintar)));
+                slots[i].dataset.on = '1';
+            } else if (!visible && presente) {
+                slots[i].replaceChildren();
+                slots[i].dataset.on = '';
+                delete valores[clave(f)];
+            }
+        });
+        mount(opts.fixture ? null : navbar(), h('div', {id: 'task-view'},
+            h('h2', {class: 'view-title'}, form.title),
+            h('div', {id: 'auto-fields'}, h('div', {class: 'fields'}, slots)),
+            h('div', {class: 'actions-bar'},
+                h('button', {type: 'button', class: 'btn-green', onclick: () => confirmar(valores, opts)}, 'Enviar'))));
+        pintar();
+    }
+
+    function campo(f, valores, pintar) {
+        switch (f.type) {
+            case 'text': case 'number': case 'datetime': case 'textarea':
+                return textual(f, valores);
+            case 'cuales':
+                return cuales(f, valores);
+            case 'select':
+                return autocomplete(f, valores, pintar, false, () => f.options);
+            case 'multi':
+                return autocomplete(f, valores, pintar, true, () => f.options);
+            case 'lookup':
+                return lookup(f, valores, pintar);
+            case 'table':
+                return tabla(f, valores);
+            case 'signature':
+                return firma(f, valores);
+            case 'photo':
+                return foto(f, valores);
+        }
+        return h('p', {class: 'empty'}, 'Tipo no soportado: ' + f.type);
+    }
+
+    function formControl(label, input, cuerpo, extra) {
+        input.id = 'mf' + (++seq);
+        return h('div', {class: 'MuiFormControl-root' + (extra ? ' ' + extra : '')},
+            label === null ? null : h('label', {class: 'MuiFormLabel-root MuiInputLabel-root', for: input.id}, label),
+            cuerpo || h('div', {class: 'MuiInputBase-root MuiOutlinedInput-root'}, input));
+    }
+
+    function textual(f, valores) {
+        const key = clave(f);
+        const tipo = {number: 'number', datetime: 'datetime-local'}[f.type] || 'text';
+        const input = f.type === 'textarea'
+            ? h('textarea', {rows: 3, class: 'MuiInputBase-input'})
+            : h('input', {type: tipo, class: 'MuiInputBase-input'});
+        const guardar = () => { valores[key] = input.value; };
+        input.addEventListener('input', guardar);
+        input.addEventListener('change', guardar);
+        return formControl(f.label, input, null, 'MuiTextField-root');
+    }
+
+    function cuales(f, valores) {
+        const input = h('input', {type: 'text', placeholder: '¿Cuáles?', class: 'MuiInputBase-input'});
+        input.addEventListener('input', () => { valores[clave(f)] = input.value; });
+        return formControl(null, input);
+    }
+
+    // ---------- autocomplete (popper único, como el portal de MUI) ----------
+
+    let popper = null;
+
+    function cerrarPopper() {
+        if (!popper) return;
+        popper.el.remove();
+        popper.owner.setAttribute('aria-expanded', 'false');
+        popper = null;
+    }
+
+    function mostrarPopper(inp, items, elegir, activo) {
+        cerrarPopper();
+        if (!inp.isConnected) return;
+        const r = inp.closest('.MuiAutocomplete-inputRoot').getBoundingClientRect();
+        const paper = h('div', {class: 'MuiPaper-root MuiAutocomplete-paper'});
+        if (items.length) {
+            paper.append(h('ul', {class: 'MuiAutocomplete-listbox', role: 'listbox', id: inp.id + '-listbox'},
+                items.map((o, i) => h('li', {
+                    class: 'MuiAutocomplete-option' + (i === activo ? ' Mui-focused' : ''),
+                    role: 'option', tabindex: '-1', 'data-option-index': i, onclick: () => elegir(o)
+                }, o))));
+        } else {
+            paper.append(h('div', {class: 'MuiAutocomplete-noOptions'}, 'Sin opciones'));
+        }
+        const el = h('div', {
+            class: 'MuiAutocomplete-popper', role: 'presentation',
+            style: 'position:absolute;left:' + (r.left + scrollX) + 'px;top:' + (r.bottom + scrollY) +
+                'px;width:' + r.width + 'px'
+        }, paper);
+        // como MUI: el mousedown en el popper no quita el foco al input
+        el.addEventListener('mousedown', e => e.preventDefault());
+        document.body.append(el);
+        inp.setAttribute('aria-expanded', 'true');
+        popper = {el: el, owner: inp, items: items, activo: activo};
+    }
+
+    function autocomplete(f, valores, pintar, multiple, fuente) {
+        const key = clave(f);
+        if (multiple) valores[key] = [];
+        const inp = h('input', {
+            type: 'text', role: 'combobox', autocomplete: 'off', 'aria-autocomplete': 'list',
+            'aria-expanded': 'false', class: 'MuiInputBase-input MuiAutocomplete-input'
+        });
+        const chips = h('span', {class: 'MuiAutocomplete-tags'});
+        let pendiente = null;
+
+        const candidatas = () => {
+            const q = (!multiple && inp.value === (valores[key] || '')) ? '' : norm(inp.value);
+            return fuente().filter(o => (!q || norm(o).includes(q)) && !(multiple && valores[key].includes(o)));
+        };
+        const mostrar = activo => mostrarPopper(inp, candidatas(), elegir, activo);
+        const abrir = activo => {
+            clearTimeout(pendiente);
+            pendiente = setTimeout(() => {
+                if (document.activeElement === inp) mostrar(activo === undefined ? -1 : activo);
+            }, CFG.render_ms || 0);
+        };
+        const pintarChips = () => chips.replaceChildren(...valores[key].map(v =>
+            h('div', {class: 'MuiChip-root MuiButtonBase-root'},
+                h('span', {class: 'MuiChip-label'}, v),
+                h('span', {
+                    class: 'MuiChip-deleteIcon', role: 'button', 'aria-label': 'Quitar',
+                    onclick: () => { valores[key] = valores[key].filter(x => x !== v); pintarChips(); pintar(); }
+                }, '×'))));
+        function elegir(o) {
+            if (multiple) {
+                if (!valores[key].includes(o)) valores[key].push(o);
+                pintarChips();
+                inp.value = '';
+            } else {
+                valores[key] = o;
+                inp.value = o;
+            }
+            cerrarPopper();
+            pintar();
+        }
+
+        inp.addEventListener('focus', () => abrir());
+        inp.addEventListener('click', () => abrir());
+        inp.addEventListener('input', () => abrir());
+        inp.addEventListener('blur', () => setTimeout(() => {
+            if (document.activeElement === inp) return;
+            clearTimeout(pendiente);
+            if (popper && popper.owner === inp) cerrarPopper();
+            if (!multiple) inp.value = valores[key] || '';
+        }, 0));
+        inp.addEventListener('keydown', e => {
+            const abierto = popper && popper.owner === inp;
+            if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                e.preventDefault();
+                if (!abierto) return abrir(0);
+                const n = popper.items.length;
+                if (!n) return;
+                const paso = e.key === 'ArrowDown' ? 1 : n - 1;
+                mostrar(popper.activo < 0 ? 0 : (popper.activo + paso) % n);
+            } else if (e.key === 'Enter') {
+                e.preventDefault();
+                if (abierto && popper.activo >= 0) elegir(popper.items[popper.activo]);
+            } else if (e.key === 'Escape') {
+                cerrarPopper();
+            } else if (e.key === 'Backspace' && multiple && !inp.value && valores[key].length) {
+                valores[key].pop();
+                pintarChips();
+                pintar();
+            }
+        });
+
+        const root = h('div', {class: 'MuiInputBase-root MuiOutlinedInput-root MuiAutocomplete-inputRoot'},
+            chips, inp,
+            h('button', {
+                type: 'button', class: 'MuiAutocomplete-popupIndicator', tabindex: '-1', 'aria-label': 'Open',
+                onclick: () => { inp.focus(); abrir(); }
+            }, '▾'));
+        return formControl(f.label, inp, root, 'MuiAutocomplete-root');
+    }
+
+    function lookup(f, valores, pintar) {
+        let opciones = [];
+        const partes = [];
+        let consulta = null;
+        if (f.input_label) {
+            consulta = h('input', {type: 'text', class: 'MuiInputBase-input'});
+            partes.push(formControl(f.input_label, consulta, null, 'MuiTextField-root'));
+        }
+        const lupa = h('button', {type: 'button', class: 'lookup-button', title: 'Buscar'}, '🔍');
+        lupa.addEventListener('click', async () => {
+            lupa.disabled = true;
+            try {
+                const q = encodeURIComponent(consulta ? consulta.value : '');
+                opciones = (await api('GET', '/api/lookup/' + f.endpoint + '?q=' + q)).options;
+            } catch (e) {
+                aviso('Error consultando ' + f.endpoint);
+            } finally {
+                lupa.disabled = false;
+            }
+        });
+        partes.push(lupa, autocomplete(f, valores, pintar, false, () => opciones));
+        return partes;
+    }
+
+    // ---------- tabla Si/No, firma y foto ----------
+
+    function tabla(f, valores) {
+        const estado = valores[f.label] = {};
+        const grupo = 't' + (++seq);
+        return h('div', {class: 'MuiPaper-root'}, h('div', {class: 'MuiTableContainer-root'},
+            h('table', {class: 'MuiTable-root'},
+                h('caption', {}, f.label),
+                h('thead', {}, h('tr', {}, h('th', {}, ''), h('th', {}, 'Si'), h('th', {}, 'No'))),
+                h('tbody', {}, f.rows.map((fila, i) => h('tr', {},
+                    h('td', {}, fila),
+                    ['Si', 'No'].map(v => h('td', {}, h('input', {
+                        type: 'radio', name: grupo + '-' + i, value: v,
+                        onchange: () => { estado[fila] = v; }
+                    })))))))));
+    }
+
+    function firma(f, valores) {
+        const canvas = h('canvas', {width: 400, height: 150});
+        const ctx = canvas.getContext('2d');
+        const estado = h('span', {class: 'signature-status'});
+        let trazando = false, ultimo = null, dibujado = false;
+
+        const pos = e => {
+            const r = canvas.getBoundingClientRect();
+            return [(e.clientX - r.left) * canvas.width / r.width, (e.clientY - r.top) * canvas.height / r.height];
+        };
+        canvas.addEventListener('pointerdown', e => { trazando = true; ultimo = pos(e); });
+        canvas.addEventListener('pointermove', e => {
+            if (!trazando) return;
+            const p = pos(e);
+            ctx.lineWidth = 2;
+            ctx.beginPath();
+            ctx.moveTo(ultimo[0], ultimo[1]);
+            ctx.lineTo(p[0], p[1]);
+            ctx.stroke();
+            ultimo = p;
+            dibujado = true;
+        });
+        ['pointerup', 'pointerleave'].forEach(t => canvas.addEventListener(t, () => { trazando = false; }));
+
+        const firmar = () => {
+            if (!dibujado) {
+                estado.textContent = 'Dibuje la firma antes de firmar';
+                return;
+            }
+            valores[f.label] = canvas.toDataURL('image/png').length + ' bytes';
+            estado.textContent = 'Firmado';
+        };
+        const input = canvas;  // el "control" del label es el canvas (igual que en apperator)
+        return formControl(f.label, input, h('div', {},
+            h('div', {class: 'signature-container'}, canvas),
+            h('button', {type: 'button', class: 'btn-green', onclick: firmar}, 'Firmar'),
+            estado), 'signature-field');
+    }
+
+    function foto(f, valores) {
+        const estado = h('div', {class: 'selected-photos'}, 'No hay fotos seleccionadas');
+        const cont = h('div', {class: 'photo-field'}, h('label', {}, f.label));
+        const boton = h('button', {type: 'button'}, f.button || 'Seleccionar una foto');
+        // el input file se inyecta al pulsar el botón (como el widget real)
+        boton.addEventListener('click', () => {
+            if (cont.querySelector('input[type=file]')) return;
+            const input = h('input', {type: 'file', accept: 'image/*', style: 'display:none'});
+            input.addEventListener('change', async () => {
+                const archivo = input.files[0];
+                if (!archivo) return;
+                estado.textContent = 'Subiendo ' + archivo.name + '...';
+                const r = await fetch('/api/upload', {method: 'POST', body: archivo, credentials: 'same-origin'});
+                const data = await r.json();
+                valores[f.label] = {name: archivo.name, bytes: data.bytes};
+                estado.textContent = '1 fotos seleccionadas';
+            });
+            cont.append(input);
+        });
+        cont.append(boton, estado);
+        return cont;
+    }
+
+    // ---------- envío ----------
+
+    function confirmar(valores, opts) {
+        if (document.querySelector('.MuiDialog-root')) return;
+        const dialogo = h('div', {class: 'MuiDialog-root', role: 'presentation'},
+            h('div', {class: 'MuiPaper-root MuiDialog-paper', role: 'dialog', 'aria-modal': 'true'},
+                h('p', {}, '¿Desea enviar el formulario?'),
+                h('div', {class: 'dialog-actions'},
+                    h('button', {type: 'button', onclick: () => dialogo.remove()}, 'Cancelar'),
+                    h('button', {
+                        type: 'button', class: 'btn-blue',
+                        onclick: () => { dialogo.remove(); enviar(valores, opts); }
+                    }, 'Confirmar'))));
+        document.body.append(dialogo);
+    }
+
+    async function enviar(valores, opts) {
+        cerrarPopper();
+        const spinner = h('div', {class: 'MuiBackdrop-root'}, h('span', {class: 'MuiCircularProgress-root'}));
+        document.body.append(spinner);
+        try {
+            if (opts.fixture) await esperar(CFG.render_ms);
+            else await api('POST', '/api/tasks/' + opts.taskId + '/submit', {values: valores});
+        } catch (e) {
+            spinner.remove();
+            aviso('No se pudo enviar: ' + e.message);
+            if (e.status === 409 || e.status === 401) go('/');
+            return;
+        }
+        spinner.remove();
+        aviso('Formulario enviado');
+        if (opts.fixture) route();
+        else go('/');
+    }
+
+    route();
+})();
@@ -1,4 +1,5 @@
 from utils.waits import build_wait
+from utils.elements import llenar_formulario
 
 class BasePage:
     def __init__(self, driver, timeout=15):
@@ -8,3 +9,15 @@ class BasePage:
     @property
     def d(self):
         return self.driver
+
+    def llenar_planos(self, data: dict, mapa: dict):
+        """
+        Llena en bloque los campos planos (texto/numéricos) presentes en `data`.
+
+        Args:
+            data: Datos del formulario (YAML)
+            mapa: {clave en data: label del campo}
+        """
+        campos = {label: data[key] for key, label in mapa.items() if data.get(key) is not None}
+        if campos:
+            return llenar_formulario(self.d, self.wait, campos)
@@ -2,32 +2,42 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from utils.elements import subir_archivo
+from utils.fixture_files import imagen_png
 
 class F11PermisoFirmadoPage:
     """
     TEBSA – F11. Permiso de Trabajo Firmado (Documento físico)
-    Campo de foto: opcional. Preparamos la UI para que el botón Enviar sea clickeable.
+    Campo de foto: opcional. Se sube `archivo` o, si no se indica, un PNG
+    generado de `foto_kb` KB. Preparamos la UI para que el botón Enviar sea clickeable.
     El click de Enviar/Confirmar lo hace el flow (_enviar_confirmar_robusto).
     """
 
+    BOTON_FOTO = "Seleccionar una foto"
+
     def __init__(self, driver, timeout: int = 20):
         self.d = driver
         self.driver = driver
         self.wait = WebDriverWait(driver, timeout)
         self.timeout = timeout
+        self.adjunto = None
 
     def completar(self, data: dict):
         """
-        No subimos archivo (servidor inestable / campo opcional).
+        Sube la foto (opcional: un fallo no bloquea el envío).
         Cerramos overlays, quitamos foco y desplazamos al pie.
         """
-        # Si más adelante quieres reactivar la subida, descomenta:
-        # ruta = (data or {}).get("archivo")
-        # if ruta:
-        #     try:
-        #         self.subir_foto_F11(ruta)
-        #     except Exception as e:
-        #         print(f"⚠️ F11: subida opcional falló: {e}")
+        data = data or {}
+        self.adjunto = None
+        ruta = data.get("archivo")
+        if not ruta and data.get("foto_kb"):
+            ruta = imagen_png(data["foto_kb"])
+        if ruta:
+            try:
+                self.subir_foto_F11(ruta, boton=data.get("boton_foto", self.BOTON_FOTO))
+                self.adjunto = ruta
+            except Exception as e:
+                print(f"⚠️ F11: subida opcional falló: {e}")
 
         try:
             self.d.execute_script("""
@@ -45,15 +55,16 @@ class F11PermisoFirmadoPage:
         except Exception:
             pass
 
-        print("ℹ️ F11: omitimos la carga de foto (campo opcional).")
+        if not self.adjunto:
+            print("ℹ️ F11: sin foto (campo opcional).")
 
     def completar_y_enviar(self, data: dict):
         """
         Mantiene el contrato del flow: prepara el formulario y lo deja listo.
         """
         self.completar(data)
-        print("🟢 F11 listo para enviar (sin adjunto).")
+        print(f"🟢 F11 listo para enviar ({'con' if self.adjunto else 'sin'} adjunto).")
 
-    # Placeholder para futura reactivación (opcional)
-    def subir_foto_F11(self, ruta_archivo: str):
-        print(f"ℹ️ F11: placeholder subir_foto_F11('{ruta_archivo}') (actualmente desactivado)")
+    def subir_foto_F11(self, ruta_archivo: str, boton: str = BOTON_FOTO) -> dict:
+        """Sube la foto (CDP DOM.setFileInputFiles) y espera a que termine la petición."""
+        return subir_archivo(self.d, self.wait, boton, ruta_archivo, timeout=self.timeout)
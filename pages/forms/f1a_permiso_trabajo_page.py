@@ -1,6 +1,5 @@
 from ..base_page import BasePage
 from utils.elements import (
-    campo_texto_por_label,
     seleccion_simple,
     escribir_fecha,
     campo_endpoint,
@@ -9,9 +8,25 @@ from utils.elements import (
 class F1aPermisoTrabajoPage(BasePage):
     """TEBSA - F1a. Permisos de Trabajo"""
 
-    def llenar_campos_basicos(self, data: dict):
+    # Campos de texto plano → se llenan en bloque (un solo script)
+    CAMPOS_PLANOS = {
+        "orden_trabajo": "Orden de trabajo",                 # 1
+        "responsable_trabajo": "Responsable del trabajo",    # 9
+        "descripcion_trabajo": "Descripcion del trabajo",    # 10
+    }
+
+    def fill_form(self, data: dict):
+        """F1a completo: todos los campos planos en bloque y luego selects/fechas/endpoints."""
+        self.llenar_planos(data, self.CAMPOS_PLANOS)
+        self.llenar_campos_basicos(data, incluir_texto=False)
+        self.seleccionar_aks_kks(data)
+        self.seleccionar_empresa_e_supervisor(data)
+        self.respuestas_seguridad(data)
+
+    def llenar_campos_basicos(self, data: dict, incluir_texto: bool = True):
         # 1. Orden de trabajo *
-        campo_texto_por_label(self.d, self.wait, "Orden de trabajo", data["orden_trabajo"])
+        if incluir_texto:
+            self.llenar_planos(data, {"orden_trabajo": self.CAMPOS_PLANOS["orden_trabajo"]})
         # 2. Identificación permiso
         seleccion_simple(self.d, self.wait, "Identificación permiso", data["identificacion_permiso"], opcion=1)
         # 3. Vigente desde *
@@ -43,10 +58,11 @@ class F1aPermisoTrabajoPage(BasePage):
         seleccion_simple(self.d, self.wait, "Supervisor TEBSA", data["supervisor_tebsa"], opcion=1)
 
     def responsables_y_descripcion(self, data: dict):
-        # 9. Responsable del trabajo *
-        campo_texto_por_label(self.d, self.wait, "Responsable del trabajo", data["responsable_trabajo"])
-        # 10. Descripcion del trabajo *
-        campo_texto_por_label(self.d, self.wait, "Descripcion del trabajo", data["descripcion_trabajo"])
+        # 9. Responsable del trabajo * / 10. Descripcion del trabajo *
+        self.llenar_planos(data, {
+            "responsable_trabajo": self.CAMPOS_PLANOS["responsable_trabajo"],
+            "descripcion_trabajo": self.CAMPOS_PLANOS["descripcion_trabajo"],
+        })
 
     def respuestas_seguridad(self, data: dict):
         # 11..19 flags varios
@@ -1,34 +1,36 @@
 from ..base_page import BasePage
-from utils.elements import seleccion_simple, campo_texto_por_label, marcar_tabla_riesgos,  campo_numerico
+from utils.elements import seleccion_simple, marcar_tabla_riesgos
 
 class F7nAnalisisRiesgosPage(BasePage):
     """TEBSA - F7n. Análisis de Riesgos"""
 
+    # clave del select Si/No en data → (label del select, clave del dato del campo plano,
+    #                                    label del campo plano que habilita con "Si")
+    CONDICIONALES = {
+        "temp_extremas": ("Temperaturas extremas", "temp_c", "°C"),
+        "presiones": ("Presiones", "presion_bar", "Bar"),
+        "electrico": ("Eléctrico", "volt", "Volt"),
+        "otros": ("Otros", "otros_cuales", "¿Cuáles?"),
+    }
+
     def completar(self, data: dict):
+        self.fill_form(data)
+
+    def fill_form(self, data: dict):
+        """
+        Tabla de riesgos + selects Si/No, y al final TODOS los campos planos
+        habilitados (°C, Bar, Volt, ¿Cuáles?) en un solo llenado en bloque.
+        """
         tabla_xpath = '//*[@id="auto-fields"]/div[1]/div[1]/div/div/table'
         respuestas = data.get("tabla_riesgos", {})
         marcar_tabla_riesgos(self.d, self.wait, tabla_xpath, respuestas, default="No")
 
-        # Temperaturas extremas
-        if "temp_extremas" in data:
-            seleccion_simple(self.d, self.wait, "Temperaturas extremas", data["temp_extremas"])
-            if str(data["temp_extremas"]).strip().lower() == "si" and "temp_c" in data:
-                campo_numerico(self.d, self.wait, "°C", data["temp_c"])
-
-        # Presiones
-        if "presiones" in data:
-            seleccion_simple(self.d, self.wait, "Presiones", data["presiones"])
-            if str(data["presiones"]).strip().lower() == "si" and "presion_bar" in data:
-                campo_numerico(self.d, self.wait, "Bar", data["presion_bar"])
-
-        # Eléctrico
-        if "electrico" in data:
-            seleccion_simple(self.d, self.wait, "Eléctrico", data["electrico"])
-            if str(data["electrico"]).strip().lower() == "si" and "volt" in data:
-                campo_numerico(self.d, self.wait, "Volt", data["volt"])
+        planos = {}
+        for key, (label_select, key_plano, label_plano) in self.CONDICIONALES.items():
+            if key not in data:
+                continue
+            seleccion_simple(self.d, self.wait, label_select, data[key])
+            if str(data[key]).strip().lower() == "si" and key_plano in data:
+                planos[key_plano] = label_plano
 
-        # Otros
-        if "otros" in data:
-            seleccion_simple(self.d, self.wait, "Otros", data["otros"])
-            if str(data["otros"]).strip().lower() == "si" and "otros_cuales" in data:
-                campo_texto_por_label(self.d, self.wait, "¿Cuáles?", data["otros_cuales"])
+        self.llenar_planos(data, planos)
@@ -1,11 +1,14 @@
 # pages/login_page.py
+import os
+
 from .base_page import BasePage
 from utils.elements import click_xpath
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
 class LoginPage(BasePage):
-    base_url = "https://apperator.ibisagroup.com"
+    # MAP_BASE_URL apunta la suite a otra instancia (p.ej. la app local de mock_app/server.py)
+    base_url = os.getenv("MAP_BASE_URL", "https://apperator.ibisagroup.com").rstrip("/")
 
     def open(self):
         self.d.get(self.base_url)
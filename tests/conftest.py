@@ -1,10 +1,13 @@
 # conftest.py
 import os
 import pytest
-from utils.browser import build_driver
+from utils.browser import BrowserPool
 from dotenv import load_dotenv
 from datetime import datetime
 
+# presupuestos de tiempo por paso / regresiones (opciones --perf-*)
+pytest_plugins = ["utils.perf_budgets"]
+
 # carga .env en APP_EMAIL / APP_PASSWORD
 load_dotenv()
 
@@ -18,11 +21,20 @@ def creds():
         "password": os.getenv("APP_PASSWORD", "Tebsa2023!"),
     }
 
+@pytest.fixture(scope="session")
+def browser_pool():
+    # BROWSER_POOL_SIZE=N mantiene N Chrome precalentados durante toda la sesión
+    pool = BrowserPool(
+        size=int(os.getenv("BROWSER_POOL_SIZE", "1")),
+        headless=os.getenv("HEADLESS", "0") == "1",
+    ).start()
+    yield pool
+    pool.close()
+
 @pytest.fixture
-def driver():
-    d = build_driver(headless=False)
-    yield d
-    d.quit()
+def driver(browser_pool):
+    with browser_pool.lease() as d:
+        yield d
 
 # Hook para guardar evidencia si falla la fase "call"
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -0,0 +1,46 @@
+# tests/test_browser_pool.py
+import utils.browser as browser
+from utils.browser import BrowserPool
+
+
+class _Driver:
+    def __init__(self, n):
+        self.n = n
+        self.cerrado = False
+
+    def quit(self):
+        self.cerrado = True
+
+
+def _pool(monkeypatch, size=1, reset=lambda d: None):
+    creados = []
+
+    def factory():
+        creados.append(_Driver(len(creados) + 1))
+        return creados[-1]
+
+    monkeypatch.setattr(browser, "reset_driver", reset)
+    return BrowserPool(size=size, factory=factory).start(), creados
+
+
+def test_el_driver_devuelto_se_reutiliza(monkeypatch):
+    pool, creados = _pool(monkeypatch)
+    with pool.lease(timeout=5) as d1:
+        pass
+    with pool.lease(timeout=5) as d2:
+        pass
+    pool.close()
+    assert d2 is d1 and len(creados) == 1
+
+
+def test_driver_que_no_se_limpia_se_reemplaza(monkeypatch):
+    def reset(d):
+        raise RuntimeError("chrome caído")
+
+    pool, creados = _pool(monkeypatch, reset=reset)
+    with pool.lease(timeout=5) as d1:
+        pass
+    with pool.lease(timeout=5) as d2:
+        pass
+    pool.close()
+    assert d1.cerrado and d2 is not d1
@@ -0,0 +1,84 @@
+# tests/test_command_replay.py
+from types import SimpleNamespace
+
+from utils.command_recorder import CommandRecorder, leer_grabacion
+from utils.command_replay import W3C_ELEMENT, CommandReplayer
+
+
+class _Executor:
+    """Transporte falso: cada findElement devuelve un id nuevo con el prefijo dado."""
+
+    def __init__(self, prefijo):
+        self.prefijo = prefijo
+        self.n = 0
+        self.llamadas = []
+
+    def execute(self, command, params):
+        self.llamadas.append((command, params))
+        if command == "findElement":
+            self.n += 1
+            return {"status": 0, "value": {W3C_ELEMENT: f"{self.prefijo}-{self.n}"}}
+        if command == "w3cGetCurrentWindowHandle":
+            return {"status": 0, "value": f"{self.prefijo}-ventana"}
+        return {"status": 0, "value": None}
+
+
+def _driver(prefijo):
+    return SimpleNamespace(command_executor=_Executor(prefijo), session_id=f"sesion-{prefijo}")
+
+
+def _grabar(tmp_path):
+    d = _driver("a")
+    rec = CommandRecorder(d, str(tmp_path / "run.jsonl.gz")).install()
+    ex = d.command_executor
+    ex.execute("newSession", {"capabilities": {}})
+    ex.execute("get", {"url": "https://apperator.example.com/user", "sessionId": d.session_id})
+    el = ex.execute("findElement", {"using": "css selector", "value": "#navbar", "sessionId": d.session_id})
+    ex.execute("clickElement", {"id": el["value"][W3C_ELEMENT], "sessionId": d.session_id})
+    ex.execute("executeScript", {"script": "arguments[0].click();", "args": [el["value"]]})
+    h = ex.execute("w3cGetCurrentWindowHandle", {})
+    ex.execute("switchToWindow", {"handle": h["value"]})
+    rec.close()
+    return rec.path
+
+
+def test_grabacion_cabecera_y_sin_session_id(tmp_path):
+    cabecera, comandos = leer_grabacion(_grabar(tmp_path))
+    assert cabecera["format"] == "map-commands/1"
+    assert [c["i"] for c in comandos] == list(range(7))
+    assert all("sessionId" not in c["params"] for c in comandos)
+    assert comandos[2]["resp"]["value"] == {W3C_ELEMENT: "a-1"}
+
+
+def test_replay_remapea_ids_y_url(tmp_path):
+    d = _driver("b")
+    d.command_executor.n = 40
+    informe = CommandReplayer.desde_archivo(d, _grabar(tmp_path), destino="http://127.0.0.1:8765/").run()
+    llamadas = dict(d.command_executor.llamadas)
+
+    assert "newSession" not in llamadas and informe["skipped"] == 1
+    assert llamadas["get"]["url"] == "http://127.0.0.1:8765/user"
+    assert llamadas["clickElement"] == {"id": "b-41", "sessionId": "sesion-b"}
+    assert llamadas["executeScript"]["args"] == [{W3C_ELEMENT: "b-41"}]
+    assert llamadas["switchToWindow"]["handle"] == "b-ventana"
+    assert informe["commands"] == 6 and informe["divergences"] == 0
+
+
+def test_dos_grabadores_en_un_proceso_no_se_pisan(tmp_path, monkeypatch):
+    import utils.command_recorder as cr
+
+    monkeypatch.setenv("MAP_RECORD", str(tmp_path / "run"))
+    monkeypatch.setattr(cr, "_drivers_grabados", 0)
+    monkeypatch.setattr(cr.atexit, "register", lambda f: None)
+    a, b = _driver("a"), _driver("b")
+    rec_a = cr.instalar_desde_env(a)
+    for _ in range(120):
+        a.command_executor.execute("findElement", {"using": "css selector", "value": "#x"})
+    rec_b = cr.instalar_desde_env(b)  # segundo driver, arrancado con A en uso
+    b.command_executor.execute("w3cGetCurrentWindowHandle", {})
+    rec_a.close()
+    rec_b.close()
+
+    assert rec_a.path != rec_b.path
+    assert len(leer_grabacion(rec_a.path)[1]) == 120
+    assert len(leer_grabacion(rec_b.path)[1]) == 1
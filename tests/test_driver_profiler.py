@@ -0,0 +1,28 @@
+# tests/test_driver_profiler.py
+import json
+from types import SimpleNamespace
+
+import utils.driver_profiler as dp
+
+
+class _Executor:
+    def execute(self, command, params):
+        return {"status": 0, "value": None}
+
+
+def test_un_informe_por_driver_al_hacer_quit(tmp_path, monkeypatch):
+    monkeypatch.setenv("MAP_PROFILE", str(tmp_path / "perfil"))
+    monkeypatch.setattr(dp, "_drivers_perfilados", 0)
+    monkeypatch.setattr(dp.atexit, "register", lambda f: None)
+    rutas = []
+    for n in (3, 5):
+        d = SimpleNamespace(command_executor=_Executor())
+        prof = dp.instalar_desde_env(d)
+        for _ in range(n):
+            d.command_executor.execute("findElement", {})
+        d.command_executor.execute("quit", {})
+        assert prof.al_cerrar is None
+        rutas.append(sorted(tmp_path.iterdir())[-1])
+
+    assert [r.name for r in rutas] == ["perfil.json", "perfil_2.json"]
+    assert [json.loads(r.read_text())["commands"] for r in rutas] == [4, 6]
@@ -0,0 +1,77 @@
+# tests/test_engine.py
+import pytest
+
+from flows.engine import Step, StepEngine, StepFailed
+
+
+class _Ctx:
+    def abrir(self):
+        raise ValueError("tarea no encontrada")
+
+
+def test_step_failed_encadena_la_excepcion_original():
+    engine = StepEngine(_Ctx(), [Step("f1a", open="abrir", retries=1)])
+    with pytest.raises(StepFailed) as info:
+        engine.run({})
+    causa = info.value.__cause__
+    assert isinstance(causa, ValueError) and info.value.result.exception is causa
+    assert info.value.result.attempts == 2 and info.value.result.error == "ValueError: tarea no encontrada"
+
+
+class _Lote:
+    """Contexto falso: la tarea del ítem 'b' no se distingue de la que dejó 'a'."""
+
+    def __init__(self):
+        self.item = None
+        self.abiertas = []
+
+    def switch_role(self, rol):
+        pass
+
+    def open_task(self, texto):
+        if self.item == "b":
+            raise LookupError("tarea ambigua")
+        if self.item == "a":
+            raise ValueError("formulario roto")
+        self.abiertas.append(self.item)
+
+
+def test_run_batch_detiene_la_fase_si_lo_pide_el_paso_fallido():
+    ctx = _Lote()
+    engine = StepEngine(ctx, [Step("f7n", task="F7n")])
+
+    def bind(item):
+        ctx.item = item
+
+    res = engine.run_batch([("ok1", {}), ("a", {}), ("b", {}), ("c", {})], bind=bind,
+                           detener_fase=lambda r: isinstance(r.exception, LookupError))
+
+    assert ctx.abiertas == ["ok1"]
+    assert [res[i].status for i in ("ok1", "a", "b", "c")] == ["ok", "failed", "failed", "failed"]
+    assert res["b"].failed_step == "f7n" and res["c"].steps == []
+    assert "detenida" in res["c"].error
+
+
+def test_flow_p1_run_batch_detiene_la_fase_con_tarea_ambigua(tmp_path):
+    from types import SimpleNamespace
+
+    from flows.flow_p1 import FlowP1
+    from flows.journal import Journal
+    from utils.elements import TareaAmbigua
+
+    flow = FlowP1(SimpleNamespace(get=lambda url: None), journal=Journal(str(tmp_path / "j.jsonl")))
+    flow.engine = StepEngine(flow, [Step("f7n", task="F7n")])
+    flow._login_inicial = flow.switch_role = lambda rol: None
+    abiertas = []
+
+    def open_task(texto):
+        if flow.permit_id == "b":
+            raise TareaAmbigua("Varias tareas 'F7n' y ninguna menciona 'b'")
+        abiertas.append(flow.permit_id)
+
+    flow.open_task = open_task
+    res = flow.run_batch({"email": "s@x"}, [{"data_f1a": {"orden_trabajo": p}} for p in "abc"])
+
+    assert abiertas == ["a"]
+    assert [res[p].status for p in "abc"] == ["ok", "failed", "failed"]
+    assert res["c"].steps == [] and "detenida" in res["c"].error
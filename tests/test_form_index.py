@@ -0,0 +1,45 @@
+# tests/test_form_index.py
+from utils.actions.form_index import FormIndex
+
+
+class _Driver:
+    """execute_script devuelve el formulario 'pintado' en ese momento."""
+
+    def __init__(self, *renders):
+        self.renders = list(renders)
+        self.builds = 0
+
+    def execute_script(self, script, *args):
+        if "isConnected" in script:
+            return True
+        self.builds += 1
+        return [dict(e) for e in (self.renders.pop(0) if len(self.renders) > 1 else self.renders[0])]
+
+
+def _e(label):
+    return {"label": label, "kind": "text", "control": label}
+
+
+def test_indice_viejo_se_reconstruye_antes_de_un_contains():
+    d = _Driver([_e("Otros conectores"), _e("Otros")],
+                [_e("Otros conectores"), _e("Otros"), _e("Otros")])
+    idx = FormIndex(d)
+    idx.build()
+    entry = idx.resolve("Otros", index=2)
+    assert d.builds == 2 and entry["pos"] == 2
+
+
+def test_indice_vacio_se_reconstruye_y_tolera_tildes():
+    d = _Driver([], [_e("Línea de vida *")])
+    idx = FormIndex(d)
+    idx.build()
+    assert idx.resolve("Linea de vida")["label"] == "Línea de vida *"
+
+
+def test_contains_inequivoco_usa_el_indice_cacheado():
+    d = _Driver([_e("Nombre del responsable *"), _e("Cargo")])
+    idx = FormIndex(d)
+    idx.build()
+    assert idx.resolve("Nombre")["pos"] == 0
+    assert idx.resolve("responsable")["pos"] == 0
+    assert d.builds == 1
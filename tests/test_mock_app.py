@@ -0,0 +1,63 @@
+# tests/test_mock_app.py
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+import yaml
+
+from flows.flow_p1 import FlowP1, kwargs_desde_yaml
+from mock_app.server import COOKIE, roles_desde_yaml, start_server
+from pages.login_page import LoginPage
+
+DATA = "data/p1_permiso_trabajo.yaml"
+
+
+def _api(url, metodo, ruta, cuerpo=None, token=None):
+    req = urllib.request.Request(url + ruta, method=metodo,
+                                 data=json.dumps(cuerpo or {}).encode() if metodo == "POST" else None,
+                                 headers={"Content-Type": "application/json"})
+    if token:
+        req.add_header("Cookie", f"{COOKIE}={token}")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as r:
+            return r.status, r.headers.get("Set-Cookie") or ""
+    except urllib.error.HTTPError as e:
+        return e.code, ""
+
+
+def _login(url):
+    _, cookie = _api(url, "POST", "/api/login", {"email": "solicitante@mock.local", "password": "x"})
+    return cookie.split(";")[0].split("=", 1)[1]
+
+
+@pytest.mark.parametrize("invalida, esperado", [(True, 401), (False, 200)])
+def test_logout_invalida_el_token(invalida, esperado):
+    servidor, url = start_server(roles={}, logout_invalida=invalida)
+    try:
+        token = _login(url)
+        assert _api(url, "GET", "/api/me", token=token)[0] == 200
+        _api(url, "POST", "/api/logout", token=token)
+        assert _api(url, "GET", "/api/me", token=token)[0] == esperado
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+@pytest.mark.p1
+@pytest.mark.mock
+def test_p1_contra_mock_hasta_f11(driver, monkeypatch):
+    with open(DATA, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    servidor, url = start_server(roles=roles_desde_yaml(DATA))
+    monkeypatch.setattr(LoginPage, "base_url", url)
+    try:
+        FlowP1(driver).run(creds={"email": "solicitante@mock.local", "password": "x"},
+                           stop_after="f11", **kwargs_desde_yaml(data))
+
+        permisos = servidor.state.snapshot()["permits"]
+        assert [p["status"] for p in permisos] == ["closed"]
+        assert permisos[0]["submissions"][-1]["form"] == "f11"
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,47 @@
+# tests/test_perf_budgets.py
+from types import SimpleNamespace
+
+from flows.engine import StepResult
+from utils.perf_budgets import PerfRecorder, _medible, evaluar
+
+BUDGETS = {"regression_pct": 20, "min_delta_s": 1.0, "steps": {"f1a": 20, "f7n": 15}, "role_switch": 8}
+
+
+def _grabar(rec, nombre, seg, status="ok"):
+    rec.on_step_end(SimpleNamespace(name=nombre), StepResult(nombre, status, "solicitante", seconds=seg))
+
+
+def test_recorder_mediana_maximo_y_total():
+    rec = PerfRecorder()
+    _grabar(rec, "f1a", 10.0)
+    _grabar(rec, "f1a", 14.0)
+    _grabar(rec, "f7n", 5.0)
+    _grabar(rec, "f8n", 99.0, status="failed")
+    rec.on_role_switch("solicitante", "operador", 3.0)
+    rec.on_role_switch("operador", "gerencia", 6.5)
+    assert rec.medidas() == {"f1a": 12.0, "f7n": 5.0, "role_switch": 6.5, "total": 29.0}
+
+
+def test_evaluar_presupuestos():
+    assert evaluar({"f1a": 19.0, "role_switch": 7.9}, BUDGETS) == []
+    v = evaluar({"f1a": 21.0, "role_switch": 9.0, "f9n": 100.0}, BUDGETS)
+    assert len(v) == 2 and v[0].startswith("f1a:") and v[1].startswith("role_switch:")
+
+
+def test_evaluar_regresion_contra_baseline():
+    base = {"f7n": 10.0, "f1a": 2.0}
+    # +30% y +3 s → regresión; f1a +50% pero solo +1 s (ruido) → no
+    v = evaluar({"f7n": 13.0, "f1a": 3.0}, BUDGETS, base)
+    assert len(v) == 1 and "baseline" in v[0] and v[0].startswith("f7n:")
+    assert evaluar({"f7n": 13.0}, BUDGETS, base, regression_pct=50) == []
+
+
+def _item(fixtures=(), marcas=()):
+    return SimpleNamespace(fixturenames=list(fixtures),
+                           get_closest_marker=lambda nombre: nombre if nombre in marcas else None)
+
+
+def test_solo_se_miden_tests_de_navegador():
+    assert _medible(_item(fixtures=["driver"]))
+    assert _medible(_item(marcas=["p1"])) and _medible(_item(marcas=["mock"]))
+    assert not _medible(_item(fixtures=["tmp_path"]))
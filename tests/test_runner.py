@@ -0,0 +1,26 @@
+# tests/test_runner.py
+import pytest
+
+from flows.runner import cuentas_por_worker, orden_unica
+
+A = {"email": "a@tebsa.com", "password": "x"}
+B = {"email": "B@tebsa.com", "password": "y"}
+
+
+def test_varios_workers_con_una_cuenta_no_arranca():
+    assert cuentas_por_worker(1, A) == [A]
+    with pytest.raises(ValueError):
+        cuentas_por_worker(2, A)
+    with pytest.raises(ValueError):
+        cuentas_por_worker(2, A, [A, {"email": "A@tebsa.com", "password": "z"}])
+    assert cuentas_por_worker(2, A, [A, B]) == [A, B]
+
+
+def test_orden_repetida_recibe_el_id_del_escenario():
+    usadas = set()
+    data = {"f1a": {"orden_trabajo": "OT-1", "area": "X"}}
+    e1 = orden_unica({"id": "base", "data": data}, usadas)
+    e2 = orden_unica({"id": "base#2", "data": data}, usadas)
+    assert e1["data"]["f1a"]["orden_trabajo"] == "OT-1"
+    assert e2["data"]["f1a"] == {"orden_trabajo": "OT-1 - base#2", "area": "X"}
+    assert data["f1a"]["orden_trabajo"] == "OT-1"
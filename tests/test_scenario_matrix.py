@@ -0,0 +1,76 @@
+# tests/test_scenario_matrix.py
+import itertools
+
+import pytest
+
+from flows.scenario_matrix import ScenarioMatrix, pairwise, scenario_id, shard
+
+BASE = {
+    "f1a": {"orden_trabajo": "OT-1", "area_clasificada": "Si", "tipo_area_clasificada": "Estacion Reductora"},
+    "f7n": {"temp_extremas": "Si", "temp_c": 55},
+}
+AXES = {
+    "f1a.area_clasificada": ["Si", "No"],
+    "f7n.temp_extremas": ["Si", "No"],
+    "f7n.presiones": ["Si", "No"],
+    "f8n.traje_quimicos": ["Si", "No"],
+}
+
+
+def _pares(asignaciones, ejes):
+    cubiertos = set()
+    for a in asignaciones:
+        for x, y in itertools.combinations(ejes, 2):
+            cubiertos.add((x, a[x], y, a[y]))
+    return cubiertos
+
+
+def test_pairwise_cubre_todos_los_pares_con_menos_casos():
+    ejes = [(f"e{i}", ["Si", "No"]) for i in range(9)] + [("nivel", ["A", "B", "C"])]
+    casos = list(pairwise(ejes))
+    esperados = {(x, a, y, b)
+                 for (x, vx), (y, vy) in itertools.combinations(ejes, 2) for a in vx for b in vy}
+    assert _pares(casos, [n for n, _ in ejes]) == esperados
+    assert len(casos) < 2 ** 9 * 3
+    assert casos == list(pairwise(ejes))  # determinista
+
+
+def test_full_es_el_producto_completo():
+    m = ScenarioMatrix(BASE, AXES, mode="full")
+    escenarios = list(m.scenarios())
+    assert len(escenarios) == m.size() == 16
+    assert len({e["id"] for e in escenarios}) == 16
+
+
+def test_ids_estables_e_independientes_del_modo():
+    full = {e["id"]: e["axes"] for e in ScenarioMatrix(BASE, AXES, mode="full").scenarios()}
+    for e in ScenarioMatrix(BASE, AXES, mode="pairwise").scenarios():
+        assert full[e["id"]] == e["axes"]
+    assert scenario_id({"b": 1, "a": 2}) == scenario_id({"a": 2, "b": 1})
+
+
+def test_dependientes_se_podan_y_base_intacta():
+    m = ScenarioMatrix(BASE, AXES, mode="full", id_field="f1a.orden_trabajo",
+                       dependents={"f7n.temp_extremas": {"when": "Si", "fields": ["f7n.temp_c"]},
+                                   "f1a.area_clasificada": {"fields": ["f1a.tipo_area_clasificada"]}})
+    for e in m.scenarios():
+        assert ("temp_c" in e["data"]["f7n"]) == (e["axes"]["f7n.temp_extremas"] == "Si")
+        assert ("tipo_area_clasificada" in e["data"]["f1a"]) == (e["axes"]["f1a.area_clasificada"] == "Si")
+        assert e["data"]["f1a"]["orden_trabajo"] == f"OT-1 [{e['id']}]"
+        assert e["data"]["f8n"]["traje_quimicos"] in ("Si", "No")
+    assert BASE["f7n"]["temp_c"] == 55 and "f8n" not in BASE
+
+
+def test_shards_son_una_particion():
+    m = ScenarioMatrix(BASE, AXES, mode="full")
+    ids = [e["id"] for e in m.scenarios()]
+    partes = [[e["id"] for e in shard(m.scenarios(), i, 3)] for i in range(3)]
+    assert sorted(itertools.chain(*partes)) == sorted(ids)
+    with pytest.raises(ValueError):
+        list(shard(m.scenarios(), 3, 3))
+
+
+def test_generacion_perezosa():
+    ejes = {f"e{i}": ["Si", "No"] for i in range(40)}  # 2**40 combinaciones
+    primeros = list(itertools.islice(ScenarioMatrix({}, ejes, mode="full").scenarios(), 3))
+    assert len(primeros) == 3
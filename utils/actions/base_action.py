@@ -8,6 +8,7 @@ del patrón Strategy.
 Proporciona:
 - Inicialización común (driver, wait)
 - Métodos helper comunes
+- Resolución label → control vía FormIndex (un script por render del formulario)
 - Contrato/interfaz para subclases
 
 Todas las action classes (SelectActions, TextActions, etc.) deben heredar de esta clase.
@@ -23,8 +24,9 @@ Uso:
 """
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from typing import Tuple
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from typing import Callable, Optional, Tuple
+from utils.actions.form_index import FormIndex
 
 
 class BaseAction:
@@ -132,6 +134,41 @@ class BaseAction:
 
         element.send_keys(text)
 
+    def resolve_control(self, etiqueta: str, index: int = 1, after: Optional[str] = None) -> Optional[dict]:
+        """
+        Busca el control de `etiqueta` en el índice del formulario (FormIndex).
+
+        Returns:
+            dict de FormIndex (control, container, kind, value, ...) o None
+        """
+        try:
+            return FormIndex.for_driver(self.driver).resolve(etiqueta, index=index, after=after)
+        except Exception:
+            return None
+
+    def por_indice(self, etiqueta: str, accion: Callable[[dict], object], *,
+                   index: int = 1, after: Optional[str] = None, kinds: Optional[Tuple[str, ...]] = None):
+        """
+        Ejecuta `accion(entry)` sobre el control indexado de `etiqueta`.
+
+        Si el control quedó obsoleto (re-render), reconstruye el índice y
+        reintenta una vez.
+
+        Raises:
+            LookupError: Si el índice no tiene ese campo (o no es de `kinds`);
+                el llamador debe usar su camino por XPath.
+        """
+        for intento in range(2):
+            entry = self.resolve_control(etiqueta, index=index, after=after)
+            if entry is None or (kinds and entry.get("kind") not in kinds):
+                raise LookupError(etiqueta)
+            try:
+                return accion(entry)
+            except StaleElementReferenceException:
+                FormIndex.invalidate_for(self.driver)
+                if intento:
+                    raise LookupError(etiqueta)
+
     def get_label_xpath(self, etiqueta: str, exact: bool = False) -> str:
         """
         Genera XPath para encontrar un label por texto.
@@ -1,5 +1,58 @@
 # utils/actions/common_actions.py
+"""
+Acciones comunes a todos los formularios (esperas globales, overlays, etc.).
+
+Uso desde Page Objects / helpers (a través de la facade):
+    from utils.elements import esperar_notificaciones_y_cargas
+    info = esperar_notificaciones_y_cargas(driver, wait, timeout=20)
+    # info = {"waited_on": ["spinner"], "elapsed": 0.84, "timed_out": False}
+"""
+import time
 from selenium.webdriver.common.by import By
+from utils.waits import ensure_script_timeout
+
+# Selectores de "algo está pasando": toast animándose y spinners/backdrops
+PUSHING_SELECTOR = ".pushing"
+SPINNER_SELECTOR = ".MuiBackdrop-root, .loading, .spinner, .MuiCircularProgress-root"
+
+# Espera en el navegador: MutationObserver que resuelve en cuanto no queda
+# ni toast 'pushing' ni spinner, o al vencer el plazo. Una sola ida y vuelta.
+_JS_WAIT_IDLE = """
+const selectors = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const t0 = performance.now();
+const seen = new Set();
+let finished = false, obs = null, timer = null;
+
+function pending() {
+    const p = [];
+    for (const name in selectors) {
+        if (document.querySelector(selectors[name])) p.push(name);
+    }
+    return p;
+}
+function finish(timedOut) {
+    if (finished) return;
+    finished = true;
+    if (obs) obs.disconnect();
+    clearTimeout(timer);
+    done({waited_on: Array.from(seen), elapsed_ms: performance.now() - t0, timed_out: timedOut});
+}
+function check() {
+    const p = pending();
+    p.forEach(n => seen.add(n));
+    if (!p.length) finish(false);
+}
+
+check();
+if (!finished) {
+    obs = new MutationObserver(check);
+    obs.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']
+    });
+    timer = setTimeout(() => finish(true), timeoutMs);
+}
+"""
+
 
 class CommonActions:
     def __init__(self, driver, wait):
@@ -12,5 +65,52 @@ class CommonActions:
     def escribir_xpath(self, xpath: str, texto: str):
         raise NotImplementedError
 
-    def esperar_notificaciones_y_cargas(self, timeout: int = 20):
-        raise NotImplementedError
+    def esperar_notificaciones_y_cargas(self, timeout: int = 20) -> dict:
+        """
+        Espera a que no quede ningún toast 'pushing' ni spinner en pantalla.
+
+        Se resuelve dentro del navegador con un MutationObserver (una sola
+        llamada WebDriver, sin cuantización de polling). Si el script async
+        falla (p.ej. la página navega durante la espera) cae al polling clásico.
+
+        Returns:
+            dict: {"waited_on": [...], "elapsed": segundos, "timed_out": bool}
+        """
+        t0 = time.time()
+        try:
+            ensure_script_timeout(self.driver, timeout + 5)
+            res = self.driver.execute_async_script(
+                _JS_WAIT_IDLE,
+                {"pushing": PUSHING_SELECTOR, "spinner": SPINNER_SELECTOR},
+                int(timeout * 1000),
+            )
+            return {
+                "waited_on": res.get("waited_on", []),
+                "elapsed": round(res.get("elapsed_ms", 0) / 1000.0, 3),
+                "timed_out": bool(res.get("timed_out")),
+            }
+        except Exception:
+            restante = max(0.0, timeout - (time.time() - t0))
+            return self._esperar_por_polling(restante, t0)
+
+    # ---------- internos ----------
+
+    def _esperar_por_polling(self, timeout: float, t0: float) -> dict:
+        """Camino clásico: find_elements cada 0.3 s (fallback)."""
+        driver = self.driver
+        seen = []
+        fin = time.time() + timeout
+        while time.time() < fin:
+            try:
+                pushing = driver.find_elements(By.CSS_SELECTOR, PUSHING_SELECTOR)
+                spinners = driver.find_elements(By.CSS_SELECTOR, SPINNER_SELECTOR)
+                if pushing and "pushing" not in seen:
+                    seen.append("pushing")
+                if spinners and "spinner" not in seen:
+                    seen.append("spinner")
+                if not pushing and not spinners:
+                    return {"waited_on": seen, "elapsed": round(time.time() - t0, 3), "timed_out": False}
+            except Exception:
+                pass
+            time.sleep(0.3)
+        return {"waited_on": seen, "elapsed": round(time.time() - t0, 3), "timed_out": True}
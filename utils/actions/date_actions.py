@@ -5,8 +5,15 @@ STRATEGY PATTERN - Estrategia para Campos de Fecha/Hora
 Esta clase implementa el patrón Strategy para manejar campos de fecha y hora:
 - Input type="datetime-local"
 - Inputs con máscaras de fecha en español (dd/mm/aaaa hh:mm a. m./p. m.)
+- Selectores de fecha de Material-UI
 - Conversión entre formatos de fecha
 
+Motor único: el tipo de campo se detecta UNA vez por campo (_detectar_tipo),
+el valor se asigna con el setter nativo en el formato que corresponde según
+_to_formats, el blur se hace por script y se verifica con una espera corta
+(la máscara/picker puede reformatear el valor en el siguiente render).
+El tecleo con máscara queda como respaldo.
+
 Forma parte del conjunto de estrategias especializadas en utils/actions/ que
 son utilizadas a través del Facade Pattern en utils/elements.py.
 
@@ -21,7 +28,53 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from utils.actions.base_action import BaseAction
+from utils.actions.dom_scripts import SET_NATIVE_VALUE_JS
+
+
+# Detección del tipo de campo de fecha en una sola llamada.
+_JS_DETECTAR_TIPO = """
+const el = arguments[0];
+const type = (el.getAttribute('type') || 'text').toLowerCase();
+const ph = (el.getAttribute('placeholder') || '').toLowerCase();
+if (['datetime-local', 'date', 'time'].includes(type)) return type;
+// el botón de calendario solo cuenta dentro del propio FormControl (sin él: campo plano)
+const box = el.closest('.MuiFormControl-root');
+const mui = !!el.closest('.MuiPickersTextField-root, .MuiPickersInputBase-root')
+    || !!(box && box.querySelector(
+        "button[aria-label*='date' i], button[aria-label*='fecha' i], [data-testid='CalendarIcon']"));
+if (mui) return 'mui_picker';
+if (ph.includes('dd/mm') || ph.includes('a. m.') || ph.includes('aaaa')) return 'masked_es';
+return 'text';
+"""
+
+# Asigna (setter nativo), hace blur por script y devuelve el valor final: 1 ida y vuelta.
+_JS_SET_Y_BLUR = SET_NATIVE_VALUE_JS + """
+const el = arguments[0];
+el.focus();
+setNativeValue(el, arguments[1]);
+el.blur();
+el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+return el.value;
+"""
+
+# Formato de _to_formats que espera cada tipo de campo
+_FORMATO_POR_TIPO = {
+    "datetime-local": "datetime-local",
+    "date": "date",
+    "time": "time",
+    "masked_es": "text_es_masked",
+    "mui_picker": "text_es_masked",
+    "text": "text_ddMMyyyy_hhmm_a",
+}
+
+_BLUR_JS = "if(document.activeElement&&document.activeElement.blur){document.activeElement.blur();}"
+
+
+def _comparable(valor: str) -> str:
+    """'05/03/2025 08:00 a. m.' → '050320250800am' (ignora separadores de la máscara)."""
+    return re.sub(r"[^0-9a-z]", "", (valor or "").lower())
 
 
 class DateActions(BaseAction):
@@ -37,69 +90,83 @@ class DateActions(BaseAction):
             "datetime-local": dt.strftime("%Y-%m-%dT%H:%M"),
             "text_ddMMyyyy_hhmm_a": dt.strftime("%d/%m/%Y %I:%M %p"),
             "text_ddMMyyyy_HHmm": dt.strftime("%d/%m/%Y %H:%M"),
+            "text_es_masked": self._formato_es(dt),
         }
 
+    @staticmethod
+    def _formato_es(dt: datetime) -> str:
+        """dd/mm/aaaa hh:mm a. m./p. m. (máscara de los inputs en español)."""
+        hour_12 = dt.hour % 12 or 12
+        suf = "a. m." if dt.hour < 12 else "p. m."
+        return f"{dt.day:02d}/{dt.month:02d}/{dt.year:04d} {hour_12:02d}:{dt.minute:02d} {suf}"
+
+    def _detectar_tipo(self, el, entry: dict | None = None) -> str:
+        """Tipo del campo (datetime-local/date/time/masked_es/mui_picker/text); se cachea en la entrada del FormIndex."""
+        if entry is not None and entry.get("date_kind"):
+            return entry["date_kind"]
+        tipo = self.driver.execute_script(_JS_DETECTAR_TIPO, el) or "text"
+        if entry is not None:
+            entry["date_kind"] = tipo
+        return tipo
+
     def set_date_like_a_pro(self, locator, dt_text, timeout=10):
         """Establece fecha en input type=datetime-local o similar."""
-        driver = self.driver
-        el = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(locator))
-        input_type  = (el.get_attribute("type") or "").lower()
-        placeholder = (el.get_attribute("placeholder") or "").lower()
+        el = WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
+        self._set_date_en_elemento(el, dt_text, timeout=timeout)
 
-        # --- 1) Caso nativo: datetime-local ---
-        if input_type == "datetime-local":
-            fmts = self._to_formats(dt_text)
-            iso = fmts["datetime-local"]
+    def _set_date_en_elemento(self, el, dt_text, timeout=10, entry: dict | None = None):
+        """
+        Igual que set_date_like_a_pro pero sobre un WebElement ya localizado.
 
+        Detecta el tipo, asigna + blur + lectura en un solo script y, si la
+        máscara no aceptó el valor, teclea con _type_masked_datetime_es.
+        """
+        tipo = self._detectar_tipo(el, entry)
+        fmts = self._to_formats(dt_text)
+        valor = fmts[_FORMATO_POR_TIPO.get(tipo, "text_ddMMyyyy_hhmm_a")]
+
+        if tipo == "datetime-local":
             min_attr = (el.get_attribute("min") or "").strip()
-            if min_attr and iso < min_attr:
-                iso = min_attr
-
-            driver.execute_script("""
-                const el = arguments[0], val = arguments[1];
-                el.focus();
-                const proto = Object.getPrototypeOf(el);
-                const desc  = Object.getOwnPropertyDescriptor(proto, 'value');
-                if (desc && desc.set) {
-                    desc.set.call(el, '');
-                    el.dispatchEvent(new Event('input', { bubbles: true }));
-                    desc.set.call(el, val);
-                    el.dispatchEvent(new Event('input', { bubbles: true }));
-                    el.dispatchEvent(new Event('change', { bubbles: true }));
-                } else {
-                    el.value = val;
-                    el.dispatchEvent(new Event('input', { bubbles: true }));
-                    el.dispatchEvent(new Event('change', { bubbles: true }));
-                }
-            """, el, iso)
-
-            el.send_keys(Keys.TAB)
-
-            WebDriverWait(driver, timeout).until(
-                lambda d: (el.get_attribute("value") or "").strip() == iso
-            )
+            if min_attr and valor < min_attr:
+                valor = min_attr
+
+        leido = self.driver.execute_script(_JS_SET_Y_BLUR, el, valor)
+        if self._valor_confirmado(el, leido, valor):
+            return
+
+        if tipo in ("masked_es", "mui_picker", "text"):
+            dt = datetime.strptime(dt_text, "%d/%m/%Y %I:%M %p")
+            if not self._type_masked_datetime_es(el, dt, timeout_ok=timeout):
+                print(f"⚠️ Fecha ({tipo}) sin confirmar: se leyó '{el.get_attribute('value')}'")
             return
 
+        raise TimeoutException(
+            f"El campo de fecha ({tipo}) quedó con '{leido}' en lugar de '{valor}'"
+        )
+
+    def _valor_confirmado(self, el, leido: str, valor: str, timeout: float = 1.5) -> bool:
+        """True si el input muestra `valor` (ya en `leido` o tras el re-render del componente)."""
+        esperado = _comparable(valor)
+        if _comparable(leido) == esperado:
+            return True
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: _comparable(el.get_attribute("value")) == esperado
+            )
+            return True
+        except TimeoutException:
+            return False
+
     def escribir_fecha(self, label: str, dt_text: str, timeout: int = 10):
-        """Escribe una fecha en el input etiquetado por label."""
-        driver = self.driver
-        wait = self.wait
-        
-        xp = f"(//label[contains(normalize-space(.), '{label}')]/following::input[1])"
-        self.set_date_like_a_pro((By.XPATH, xp), dt_text, timeout=timeout)
-        
-        # blur explícito en otra etiqueta del formulario
+        """Escribe una fecha en el input etiquetado por label (el blur lo hace el propio motor)."""
         try:
-            lbl = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//label[contains(normalize-space(.), 'Lugar de trabajo')]")
-            ))
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", lbl)
-            driver.execute_script("arguments[0].click();", lbl)
-        except Exception:
-            try:
-                driver.execute_script("if(document.activeElement&&document.activeElement.blur){document.activeElement.blur();}")
-            except Exception:
-                pass
+            self.por_indice(
+                label, lambda e: self._set_date_en_elemento(e["control"], dt_text, timeout=timeout, entry=e),
+                kinds=("date", "text"),
+            )
+        except LookupError:
+            xp = f"(//label[contains(normalize-space(.), '{label}')]/following::input[1])"
+            self.set_date_like_a_pro((By.XPATH, xp), dt_text, timeout=timeout)
 
     def _type_masked_datetime_es(self, el, dt: datetime, timeout_ok=5):
         """Escribe dd/mm/aaaa hh:mm a. m./p. m. en inputs con máscara ES."""
@@ -119,27 +186,12 @@ class DateActions(BaseAction):
         el.send_keys(Keys.DELETE)
         el.send_keys(Keys.HOME)
 
-        def slow(txt, delay=0.015):
-            for ch in txt:
-                el.send_keys(ch); time.sleep(delay)
-
-        slow(dd)
-        el.send_keys(Keys.ARROW_RIGHT)
-        slow(mm)
-        el.send_keys(Keys.ARROW_RIGHT)
-        slow(yyyy)
-        el.send_keys(Keys.ARROW_RIGHT)
-        el.send_keys(Keys.ARROW_RIGHT)
-        el.send_keys(Keys.ARROW_RIGHT)
-        slow(hh)
-        el.send_keys(Keys.ARROW_RIGHT)
-        slow(mi)
-        el.send_keys(Keys.SPACE)
-        slow(suf)
-
-        el.send_keys(Keys.TAB)
+        # una sola secuencia de teclas (la máscara avanza con las flechas)
+        R = Keys.ARROW_RIGHT
+        el.send_keys(dd, R, mm, R, yyyy, R, R, R, hh, R, mi, Keys.SPACE, suf)
+
         try:
-            el._parent.execute_script("if(document.activeElement&&document.activeElement.blur){document.activeElement.blur();}")
+            el._parent.execute_script(_BLUR_JS)
         except Exception:
             pass
 
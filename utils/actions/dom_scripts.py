@@ -0,0 +1,220 @@
+# utils/actions/dom_scripts.py
+"""
+Fragmentos JavaScript compartidos por las action classes.
+
+Cada constante es el cuerpo de una o más funciones JS que se anteponen al
+script de la acción, p.ej.:
+
+    driver.execute_script(SET_NATIVE_VALUE_JS + "setNativeValue(arguments[0], arguments[1]);", el, "x")
+
+Mantenerlos aquí evita que cada estrategia tenga su propia variante del
+"setter nativo" compatible con React.
+"""
+
+# Asigna el valor con el setter del prototipo (HTMLInputElement/HTMLTextAreaElement)
+# para que React detecte el cambio, y dispara input/change.
+SET_NATIVE_VALUE_JS = """
+function setNativeValue(el, val) {
+    const proto = Object.getPrototypeOf(el);
+    const desc = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (desc && desc.set) {
+        desc.set.call(el, '');
+        el.dispatchEvent(new Event('input', { bubbles: true }));
+        desc.set.call(el, val);
+    } else {
+        el.value = val;
+    }
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+}
+"""
+
+# Escribe el texto de búsqueda de un autocomplete con UN solo evento input
+# (sin tecleo carácter a carácter).
+TYPE_QUERY_JS = """
+function typeQuery(el, val) {
+    const desc = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+    if (desc && desc.set) { desc.set.call(el, val); } else { el.value = val; }
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+}
+"""
+
+# Normalización de textos: sin tildes, minúsculas, espacios colapsados.
+NORMALIZE_JS = """
+function norm(s) {
+    return (s || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '')
+        .toLowerCase().replace(/\\s+/g, ' ').trim();
+}
+"""
+
+# Resolución de opciones de autocomplete (MUI listbox), todo dentro del navegador:
+#   scoreOption(o, texto) → 3 exacto | 2 normalizado | 1 prefijo normalizado | 0
+#   bestOption(texto)     → {el, score} de la mejor opción visible (o null)
+#   visibleOptions()      → opciones visibles del listbox, en orden
+#   waitForBestOption(texto, timeoutMs, minScore) → Promise<{el, score}|null>
+#       resuelve en cuanto hay una opción exacta/normalizada; con solo
+#       coincidencias de prefijo espera a que el listbox deje de cambiar.
+#       Sin candidata resuelve null cuando el listbox (o "sin opciones") se
+#       asienta: SETTLE_MS tras repintarse, QUIET_MS si nunca se repinta; el
+#       timeout completo solo se agota si el listbox no llega a aparecer.
+#   waitForOption(texto, timeoutMs) → Promise<li|null> (sin prefijo)
+PICK_OPTION_JS = NORMALIZE_JS + """
+const OPTION_SELECTOR = "[role='listbox'] [role='option'], [role='listbox'] li, ul li[role='option']";
+
+function scoreOption(o, texto) {
+    const raw = o.textContent.trim();
+    if (raw === texto.trim()) return 3;
+    const a = norm(raw), b = norm(texto);
+    if (!b) return 0;
+    if (a === b) return 2;
+    if (a.startsWith(b)) return 1;
+    return 0;
+}
+
+function visibleOptions() {
+    return Array.from(document.querySelectorAll(OPTION_SELECTOR)).filter(o => o.getClientRects().length);
+}
+
+function bestOption(texto) {
+    let best = null;
+    visibleOptions().forEach(o => {
+        const s = scoreOption(o, texto);
+        if (s && (!best || s > best.score)) best = {el: o, score: s};
+    });
+    return best;
+}
+
+function listboxSettled() {
+    const visible = sel => Array.from(document.querySelectorAll(sel)).some(e => e.getClientRects().length);
+    if (visible('.MuiAutocomplete-loading')) return false;
+    return visibleOptions().length > 0 || visible('.MuiAutocomplete-noOptions');
+}
+
+function waitForBestOption(texto, timeoutMs, minScore) {
+    minScore = minScore || 1;
+    const SETTLE_MS = 150, QUIET_MS = 1000;
+    return new Promise(resolve => {
+        let settle = null, timer = null, obs = null, repintado = false;
+        const finish = r => {
+            if (obs) obs.disconnect();
+            clearTimeout(settle); clearTimeout(timer);
+            resolve(r && r.score >= minScore ? r : null);
+        };
+        const check = () => {
+            const b = bestOption(texto);
+            if (b && b.score >= 2 && b.score >= minScore) return finish(b);
+            clearTimeout(settle);
+            if (b && b.score >= minScore) settle = setTimeout(() => finish(bestOption(texto)), SETTLE_MS);
+            // sin candidata: el listbox que aún no reaccionó a la búsqueda puede ser el anterior
+            else if (listboxSettled()) settle = setTimeout(() => finish(bestOption(texto)),
+                                                           repintado ? SETTLE_MS : QUIET_MS);
+        };
+        obs = new MutationObserver(() => { repintado = true; check(); });
+        obs.observe(document.body, { childList: true, subtree: true, characterData: true });
+        timer = setTimeout(() => finish(bestOption(texto)), timeoutMs);
+        check();
+    });
+}
+
+function waitForOption(texto, timeoutMs) {
+    return waitForBestOption(texto, timeoutMs, 2).then(r => r ? r.el : null);
+}
+"""
+
+# Hook de red en página (fetch + XMLHttpRequest), idempotente: installNetHook()
+# deja en window.__mapNet {seq, pending, open, done[]} con cada petición
+# {id, url, method, t0, t1, status}. waitForNetwork(sinceSeq, timeoutMs, quietMs, startMs)
+# resuelve cuando ya empezó alguna petición posterior a `sinceSeq`, no queda
+# pendiente ninguna de ellas (las anteriores, p.ej. un long-poll de
+# notificaciones, no cuentan) y la red lleva `quietMs` en silencio. Si en `startMs` no
+# arrancó ninguna, resuelve con no_request=true. waitForNetworkFrom(...) añade
+# elapsed_ms medido desde un instante dado (p.ej. el click que disparó la red).
+NETWORK_HOOK_JS = """
+function installNetHook() {
+    if (window.__mapNet) return window.__mapNet;
+    const net = window.__mapNet = {seq: 0, pending: 0, open: new Map(), done: [], listeners: new Set()};
+    const notify = () => net.listeners.forEach(f => { try { f(); } catch (_) {} });
+    const start = (url, method) => {
+        const r = {id: ++net.seq, url: String(url || ''), method: (method || 'GET').toUpperCase(),
+                   t0: performance.now(), t1: null, status: null};
+        net.pending++;
+        net.open.set(r.id, r);
+        notify();
+        return r;
+    };
+    const end = (r, status) => {
+        if (r.t1 !== null) return;
+        r.t1 = performance.now();
+        r.status = status;
+        net.pending--;
+        net.open.delete(r.id);
+        net.done.push(r);
+        if (net.done.length > 200) net.done.shift();
+        notify();
+    };
+
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function (input, init) {
+            const r = start(input && input.url ? input.url : input,
+                            (init && init.method) || (input && input.method));
+            return origFetch.apply(this, arguments).then(
+                resp => { end(r, resp.status); return resp; },
+                err => { end(r, 0); throw err; });
+        };
+    }
+    const X = XMLHttpRequest.prototype, origOpen = X.open, origSend = X.send;
+    X.open = function (method, url) {
+        this.__mapReq = {method: method, url: url};
+        return origOpen.apply(this, arguments);
+    };
+    X.send = function () {
+        const info = this.__mapReq || {};
+        const r = start(info.url, info.method);
+        this.addEventListener('loadend', () => end(r, this.status));
+        return origSend.apply(this, arguments);
+    };
+    return net;
+}
+
+// Peticiones aún abiertas que empezaron después de `sinceSeq`.
+function pendingSince(net, sinceSeq) {
+    let n = 0;
+    net.open.forEach(r => { if (r.id > sinceSeq) n++; });
+    return n;
+}
+
+function waitForNetwork(sinceSeq, timeoutMs, quietMs, startMs) {
+    const net = installNetHook();
+    return new Promise(resolve => {
+        let quiet = null, timer = null, startTimer = null;
+        const finish = extra => {
+            net.listeners.delete(check);
+            clearTimeout(quiet); clearTimeout(timer); clearTimeout(startTimer);
+            const reqs = net.done.filter(r => r.id > sinceSeq);
+            resolve(Object.assign({
+                requests: reqs.map(r => ({url: r.url, method: r.method, status: r.status,
+                                          ms: Math.round(r.t1 - r.t0), t1: r.t1})),
+                pending: pendingSince(net, sinceSeq), timed_out: false, no_request: false
+            }, extra || {}));
+        };
+        const check = () => {
+            clearTimeout(quiet);
+            if (net.seq > sinceSeq && pendingSince(net, sinceSeq) === 0) quiet = setTimeout(() => finish(), quietMs);
+        };
+        net.listeners.add(check);
+        timer = setTimeout(() => finish({timed_out: true}), timeoutMs);
+        startTimer = setTimeout(() => { if (net.seq <= sinceSeq) finish({no_request: true}); }, startMs);
+        check();
+    });
+}
+
+// Igual que waitForNetwork y añade elapsed_ms: desde tStart hasta el fin de la última petición.
+function waitForNetworkFrom(sinceSeq, tStart, timeoutMs, quietMs, startMs) {
+    return waitForNetwork(sinceSeq, timeoutMs, quietMs, startMs).then(r => {
+        const fin = r.requests.length ? Math.max.apply(null, r.requests.map(x => x.t1)) : performance.now();
+        r.elapsed_ms = Math.round(fin - tStart);
+        return r;
+    });
+}
+"""
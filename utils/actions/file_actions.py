@@ -3,10 +3,15 @@
 STRATEGY PATTERN - Estrategia para Subida de Archivos
 
 Esta clase implementa el patrón Strategy para manejar la subida de archivos:
-- Inputs dinámicos (input[type=file] inyectado tras click)
+- Input ya presente junto al botón (sin click: no se abre el diálogo nativo)
+- Inputs dinámicos (input[type=file] inyectado tras click, como respaldo)
 - Archivos de foto/imagen
 - Documentos PDF
 
+Los archivos se asignan al input con CDP `DOM.setFileInputFiles` (send_keys
+como respaldo) y se espera a que termine la petición de subida que dispara
+el front, observada con el hook de red en página (NETWORK_HOOK_JS).
+
 Forma parte del conjunto de estrategias especializadas en utils/actions/ que
 son utilizadas a través del Facade Pattern en utils/elements.py.
 
@@ -14,62 +19,79 @@ Uso desde Page Objects (a través de la facade):
     from utils.elements import subir_archivo
     subir_archivo(driver, wait, "Seleccionar una foto", "C:/ruta/imagen.jpg")
 """
+import os
 import time
+import uuid
+from collections import deque
+from typing import Deque, List
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from utils.actions.base_action import BaseAction
+from utils.actions.dom_scripts import NETWORK_HOOK_JS
+from utils.waits import ensure_script_timeout
+
+
+# Instala el hook de red, marca el input para localizarlo por CDP y devuelve la secuencia actual.
+_JS_PREPARAR_SUBIDA = NETWORK_HOOK_JS + """
+arguments[0].setAttribute('data-map-upload', arguments[1]);
+return {seq: installNetHook().seq, t0: performance.now()};
+"""
+
+_JS_ESPERAR_SUBIDA = NETWORK_HOOK_JS + """
+const done = arguments[arguments.length - 1];
+waitForNetworkFrom(arguments[0], arguments[1], arguments[2], arguments[3], arguments[4]).then(done);
+"""
+
+# Registro de subidas de la ejecución (tamaño, vía y latencia); solo las últimas MAX_UPLOADS
+MAX_UPLOADS = 200
+UPLOADS: Deque[dict] = deque(maxlen=MAX_UPLOADS)
 
 class FileActions(BaseAction):
     """Hereda de BaseAction para aprovechar métodos helper comunes."""
     pass  # __init__ heredado de BaseAction
 
-    def subir_archivo(self, etiqueta_boton: str, ruta_archivo: str, timeout: int = 30):
-        """Sube un archivo usando un botón que dispara un <input type='file'> dinámico.
-        Mantiene la lógica original y los waits/reintentos.
+    def subir_archivo(self, etiqueta_boton: str, ruta_archivo: str, timeout: int = 30,
+                      espera_input: float = 3) -> dict:
+        """Sube un archivo al <input type='file'> del botón/label indicado.
+
+        Estrategia 1: input ya presente junto al botón (mismo photo-field/card),
+        sin click, de modo que no se abre el diálogo nativo.
+        Estrategia 2 (solo si no hay input): click por JS en el botón y esperar,
+        como mucho `espera_input` segundos, el input que el front inyecta junto a él.
+        El archivo se carga UNA sola vez (ver _cargar_en_input).
+
+        Returns:
+            dict con via ('cdp'/'send_keys'), bytes, elapsed_ms, requests...
         """
         driver = self.driver
         wait = self.wait
 
-        # 1) Click en el botón (por texto visible)
-        boton_xpath = f"//button[contains(normalize-space(.), '{etiqueta_boton}')]"
-        boton = wait.until(EC.element_to_be_clickable((By.XPATH, boton_xpath)))
-        try:
-            boton.click()
-        except Exception:
+        boton = self._boton_de(etiqueta_boton)
+        input_file = self._input_junto_a(boton)
+        if input_file is None:
+            # el click por JS no lleva activación de usuario: el front inyecta
+            # el input pero Chrome no abre el selector nativo
             driver.execute_script("arguments[0].click();", boton)
+            try:
+                input_file = WebDriverWait(driver, espera_input, poll_frequency=0.1).until(
+                    lambda d: self._input_junto_a(boton)
+                )
+            except TimeoutException:
+                raise TimeoutException(
+                    f"No apareció ningún <input type='file'> junto a '{etiqueta_boton}' en {espera_input}s"
+                )
 
-        # 2) Esperar a que el input file aparezca (inyectado en cualquier parte del DOM)
-        fin = time.time() + timeout
-        input_file = None
-        while time.time() < fin:
-            inputs = driver.find_elements(By.XPATH, "//input[@type='file' and not(@disabled)]")
-            if inputs:
-                # Tomamos el último por si el framework creó uno nuevo al hacer click
-                input_file = inputs[-1]
-                break
-            time.sleep(0.15)
-        if not input_file:
-            raise TimeoutException("No apareció ningún <input type='file'> tras pulsar el botón.")
-
-        # 3) Asegurar que se pueda escribir y cargar el archivo
-        try:
-            input_file.send_keys(ruta_archivo)
-        except ElementNotInteractableException:
-            # fuerza visibilidad si el framework lo dejó oculto
-            driver.execute_script("""
-                arguments[0].style.display='block';
-                arguments[0].style.visibility='visible';
-                arguments[0].style.opacity=1;
-            """, input_file)
-            input_file.send_keys(ruta_archivo)
+        # Cargar el archivo y esperar la subida
+        info = self._cargar_en_input(input_file, ruta_archivo, timeout=timeout)
 
-        # 4) Verificación: el widget suele actualizar el texto de “fotos seleccionadas”
+        # Verificación: el widget suele actualizar el texto de “fotos seleccionadas”
         try:
             # busca el bloque de estado cercano al botón (si existe)
-            cont_estado = driver.find_elements(
+            cont_estado = boton.find_elements(
                 By.XPATH,
-                "//div[contains(@class,'selected-photos') or contains(normalize-space(.),'fotos seleccionadas')]"
+                "./ancestor::*[contains(@class,'photo-field')][1]//div[contains(@class,'selected-photos')]"
             )
             if cont_estado:
                 wait.until_not(
@@ -80,56 +102,52 @@ class FileActions(BaseAction):
             pass
 
         print(f"✅ Archivo '{ruta_archivo}' cargado en '{etiqueta_boton}'")
+        return info
 
-        # --- segunda estrategia: buscar input cercano al botón/label (fallbacks) ---
+    def _boton_de(self, etiqueta_boton: str):
+        """Botón (o label) que abre el selector de archivo, ya desplazado a la vista."""
         boton_xpath = " | ".join([
             f"//button[contains(normalize-space(.), '{etiqueta_boton}')]",
             f"//button[.//span[contains(normalize-space(.), '{etiqueta_boton}')]]",
             f"//label[contains(normalize-space(.), '{etiqueta_boton}')]",
         ])
-        boton = wait.until(EC.presence_of_element_located((By.XPATH, boton_xpath)))
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", boton)
+        boton = self.wait.until(EC.presence_of_element_located((By.XPATH, boton_xpath)))
+        self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", boton)
+        return boton
 
-        # 2) Definir contenedores candidatos alrededor del botón
-        candidatos_contenedor = []
-        try:
-            candidatos_contenedor.append(
-                boton.find_element(By.XPATH, "./ancestor::*[contains(@class,'photo-field')][1]")
-            )
-        except Exception:
-            pass
-        try:
-            candidatos_contenedor.append(
-                boton.find_element(By.XPATH, "./ancestor::*[contains(@class,'MuiCard') or contains(@class,'card')][1]")
-            )
-        except Exception:
-            pass
+    @staticmethod
+    def _input_junto_a(boton):
+        """<input type='file'> del mismo contenedor que el botón (None si aún no existe)."""
+        # <label for="..."> apunta directamente a su input
         try:
-            candidatos_contenedor.append(
-                boton.find_element(By.XPATH, "./ancestor::*[self::div or self::section][1]")
-            )
+            objetivo = boton.get_attribute("for") if boton.tag_name == "label" else None
+            if objetivo:
+                els = boton.find_elements(By.XPATH, f"//input[@type='file' and @id='{objetivo}']")
+                if els:
+                    return els[0]
         except Exception:
             pass
-
-        candidatos_contenedor = [c for i, c in enumerate(candidatos_contenedor) if c and c not in candidatos_contenedor[:i]]
-
-        xpaths_input_rel = [
-            ".//input[@type='file']",
-            ".//input[@type='file' and contains(@accept,'image')]",
-            ".//input[contains(@type,'file')]",
-            "following::input[@type='file'][1]",
+        contenedores = [
+            "./ancestor::*[contains(@class,'photo-field')][1]",
+            "./ancestor::*[contains(@class,'MuiCard') or contains(@class,'card')][1]",
+            "./ancestor::*[self::div or self::section][1]",
         ]
+        for xp in contenedores:
+            for cont in boton.find_elements(By.XPATH, xp):
+                els = cont.find_elements(By.XPATH, ".//input[@type='file' and not(@disabled)]")
+                if els:
+                    return els[0]
+        return None
 
-        input_file = None
-        for cont in candidatos_contenedor:
-            for xp in xpaths_input_rel:
-                try:
-                    input_file = cont.find_element(By.XPATH, xp)
-                    break
-                except Exception:
-                    continue
-            if input_file:
-                break
+    def _input_file_cercano(self, etiqueta_boton: str):
+        """Busca el <input type='file'> asociado al botón/label (contenedores cercanos o el más próximo en Y)."""
+        driver = self.driver
+        boton = self._boton_de(etiqueta_boton)
+
+        input_file = self._input_junto_a(boton)
+        if input_file is None:
+            siguientes = boton.find_elements(By.XPATH, "following::input[@type='file'][1]")
+            input_file = siguientes[0] if siguientes else None
 
         if not input_file:
             candidatos_globales = driver.find_elements(By.XPATH, "//input[@type='file']")
@@ -143,18 +161,74 @@ class FileActions(BaseAction):
 
         if not input_file:
             raise Exception(f"No se encontró ningún <input type='file'> asociado a '{etiqueta_boton}'")
+        return input_file
 
+    def _cargar_en_input(self, input_file, ruta_archivo: str, timeout: float = 30,
+                         quiet_ms: int = 200, start_ms: int = 2000) -> dict:
+        """
+        Asigna el archivo al input y espera la petición de subida.
+
+        Vía CDP `DOM.setFileInputFiles` sobre el input marcado (sin depender de
+        su visibilidad); si CDP no está disponible, send_keys como antes.
+        Registra el resultado en UPLOADS.
+        """
+        driver = self.driver
+        ruta = os.path.abspath(ruta_archivo)
+        marca = None
+        token = uuid.uuid4().hex
         try:
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", input_file)
+            marca = driver.execute_script(_JS_PREPARAR_SUBIDA, input_file, token)
         except Exception:
             pass
+
+        info = {"archivo": ruta, "bytes": os.path.getsize(ruta) if os.path.exists(ruta) else None,
+                "via": None, "elapsed_ms": None, "requests": [], "timed_out": False, "no_request": False}
         try:
-            driver.execute_script("arguments[0].style.display='block'; arguments[0].removeAttribute('hidden');", input_file)
+            self._set_files_cdp(token, [ruta])
+            info["via"] = "cdp"
         except Exception:
-            pass
+            self._set_files_send_keys(input_file, ruta)
+            info["via"] = "send_keys"
 
-        input_file.send_keys(ruta_archivo)
-        print(f"✅ Archivo '{ruta_archivo}' cargado en '{etiqueta_boton}'")
+        if marca is not None:
+            try:
+                ensure_script_timeout(driver, timeout + 5)
+                res = driver.execute_async_script(
+                    _JS_ESPERAR_SUBIDA, marca["seq"], marca["t0"], int(timeout * 1000), quiet_ms, start_ms
+                )
+                info.update(res or {})
+            except Exception as e:
+                print(f"⚠️ Espera de subida interrumpida ({e.__class__.__name__})")
+        UPLOADS.append(info)
+
+        if info["timed_out"]:
+            print(f"⚠️ La subida de '{ruta}' no terminó en {timeout}s")
+        elif info["elapsed_ms"] is not None and not info["no_request"]:
+            kb = (info["bytes"] or 0) / 1024
+            print(f"📤 Subida {kb:.0f} KB vía {info['via']} en {info['elapsed_ms']} ms")
+        return info
+
+    def _set_files_cdp(self, token: str, rutas: List[str]):
+        """DOM.setFileInputFiles sobre el input con data-map-upload=token."""
+        cdp = self.driver.execute_cdp_cmd
+        root = cdp("DOM.getDocument", {"depth": 0})["root"]["nodeId"]
+        node = cdp("DOM.querySelector", {"nodeId": root, "selector": f"input[data-map-upload='{token}']"})["nodeId"]
+        if not node:
+            raise LookupError("input marcado no encontrado vía CDP")
+        cdp("DOM.setFileInputFiles", {"nodeId": node, "files": rutas})
+
+    def _set_files_send_keys(self, input_file, ruta: str):
+        """Camino clásico: send_keys (forzando visibilidad si el framework lo ocultó)."""
+        try:
+            input_file.send_keys(ruta)
+        except ElementNotInteractableException:
+            self.driver.execute_script("""
+                arguments[0].style.display='block';
+                arguments[0].style.visibility='visible';
+                arguments[0].style.opacity=1;
+                arguments[0].removeAttribute('hidden');
+            """, input_file)
+            input_file.send_keys(ruta)
 
     def _buscar_input_file_en_dom(self):
         """Busca un input[type=file] habilitado en todo el DOM."""
@@ -198,10 +272,6 @@ class FileActions(BaseAction):
         if input_file is None:
             raise Exception(f"No se encontró ningún <input type='file'> asociado a '{etiqueta_boton}'")
 
-        try:
-            driver.execute_script("arguments[0].style.display='block'; arguments[0].style.opacity=1;", input_file)
-        except Exception:
-            pass
-
-        input_file.send_keys(ruta_archivo)
+        info = self._cargar_en_input(input_file, ruta_archivo, timeout=max(timeout, 30))
         print(f"✅ Archivo '{ruta_archivo}' cargado en '{etiqueta_boton}'")
+        return info
@@ -0,0 +1,245 @@
+# utils/actions/form_index.py
+"""
+FormIndex - Índice label → control del formulario actual
+
+En lugar de evaluar XPaths `//label[contains(...)]/following::input[1]` por
+cada campo (y por cada candidato de fallback), un único script recorre
+`#auto-fields` y devuelve, para cada label (o placeholder sin label), su
+control asociado: tipo, WebElement, contenedor MUI y valor actual.
+
+El índice se cachea por driver hasta que el formulario se re-renderiza:
+- un label sin coincidencia exacta en caché provoca UNA reconstrucción antes de
+  probar los niveles "contains" (campos condicionales como 'Bar', '°C' o
+  '¿Cuáles?' aparecen al cambiar un select, y un índice viejo haría que
+  "Otros" #2 acabara en "Otros conectores")
+- un índice vacío (construido antes de que el formulario pintara) se reconstruye
+- un control obsoleto (StaleElementReference) invalida la caché
+- enviar/abrir tarea (facade) invalida explícitamente
+
+La búsqueda es tolerante a asteriscos, tildes, mayúsculas y espacios, pero
+prioriza coincidencias más estrictas:
+    1. exacto (ignorando '*' y espacios)
+    2. exacto normalizado (sin tildes, minúsculas)
+    3. contains exacto (semántica del XPath original)
+    4. contains normalizado
+
+Uso (desde las action classes):
+    entry = FormIndex.for_driver(driver).resolve("Línea de vida")
+    if entry:
+        entry["control"].send_keys("...")
+"""
+import unicodedata
+import weakref
+from typing import List, Optional
+
+
+def normalizar_label(texto: str) -> str:
+    """'Línea de vida *  ' → 'linea de vida' (sin '*', tildes, mayúsculas ni espacios extra)."""
+    t = (texto or "").replace("*", "")
+    t = unicodedata.normalize("NFD", t)
+    t = "".join(ch for ch in t if not unicodedata.combining(ch))
+    return " ".join(t.lower().split())
+
+
+def _limpiar_label(texto: str) -> str:
+    """Quita '*' y colapsa espacios, conservando tildes y mayúsculas."""
+    return " ".join((texto or "").replace("*", "").split())
+
+
+# Recorre el formulario y devuelve [{label, source, kind, control, container, value, chips}]
+# en orden de documento. Una sola ida y vuelta.
+_JS_BUILD_INDEX = """
+const root = document.querySelector(arguments[0]) || document.body;
+const CTRL = 'input:not([type=hidden]), textarea, select, canvas';
+const controls = Array.from(root.querySelectorAll(CTRL));
+const FOLLOWING = Node.DOCUMENT_POSITION_FOLLOWING;
+
+function following(node) {
+    for (const c of controls) {
+        if (node.compareDocumentPosition(c) & FOLLOWING) return c;
+    }
+    return null;
+}
+function kindOf(c, box) {
+    const tag = c.tagName.toLowerCase();
+    const type = (c.getAttribute('type') || '').toLowerCase();
+    if (tag === 'canvas') return 'canvas';
+    if (tag === 'textarea') return 'textarea';
+    if (tag === 'select') return 'select';
+    if (c.getAttribute('role') === 'combobox' || (box && box.querySelector('.MuiAutocomplete-inputRoot'))) return 'autocomplete';
+    if (['datetime-local', 'date', 'time', 'month'].includes(type)) return 'date';
+    if (type === 'number' || c.getAttribute('inputmode') === 'numeric') return 'number';
+    if (type === 'checkbox' || type === 'radio') return 'check';
+    return 'text';
+}
+function entry(anchor, label, source, c) {
+    const box = c.closest('.MuiFormControl-root');
+    return {
+        anchor: anchor, label: label, source: source, kind: kindOf(c, box),
+        control: c, container: box,
+        value: c.value === undefined ? null : c.value,
+        chips: box ? Array.from(box.querySelectorAll('.MuiChip-label')).map(s => s.textContent.trim()) : []
+    };
+}
+
+const out = [];
+const asignados = new Set();
+root.querySelectorAll('label').forEach(lbl => {
+    let c = lbl.htmlFor ? document.getElementById(lbl.htmlFor) : null;
+    if (c && !c.matches(CTRL)) c = null;
+    const cont = lbl.closest('.MuiFormControl-root');
+    if (!c && cont) c = cont.querySelector(CTRL);
+    if (!c) c = following(lbl);
+    if (!c) return;
+    asignados.add(c);
+    out.push(entry(lbl, lbl.textContent, 'label', c));
+});
+// Controles sin label pero con placeholder/aria-label (p.ej. '¿Cuáles?')
+controls.forEach(c => {
+    if (asignados.has(c)) return;
+    const ph = c.getAttribute('placeholder') || c.getAttribute('aria-label');
+    if (ph) out.push(entry(c, ph, 'placeholder', c));
+});
+out.sort((a, b) => (a.anchor === b.anchor) ? 0 :
+    (a.anchor.compareDocumentPosition(b.anchor) & FOLLOWING ? -1 : 1));
+out.forEach(e => delete e.anchor);
+return out;
+"""
+
+
+class FormIndex:
+    """Índice cacheado (por driver) de los controles del formulario visible."""
+
+    ROOT_SELECTOR = "#auto-fields"
+
+    _por_driver = weakref.WeakKeyDictionary()
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._entries: Optional[List[dict]] = None
+
+    @classmethod
+    def for_driver(cls, driver) -> "FormIndex":
+        """Devuelve (o crea) el índice cacheado de este driver."""
+        idx = cls._por_driver.get(driver)
+        if idx is None:
+            idx = cls(driver)
+            cls._por_driver[driver] = idx
+        return idx
+
+    @classmethod
+    def invalidate_for(cls, driver):
+        """Descarta la caché del driver (p.ej. tras enviar o abrir otra tarea)."""
+        idx = cls._por_driver.get(driver)
+        if idx is not None:
+            idx.invalidate()
+
+    def invalidate(self):
+        self._entries = None
+
+    def build(self) -> List[dict]:
+        """Recorre el formulario en el navegador (1 round trip) y cachea el resultado."""
+        raw = self.driver.execute_script(_JS_BUILD_INDEX, self.ROOT_SELECTOR) or []
+        for pos, e in enumerate(raw):
+            e["pos"] = pos
+            e["clean"] = _limpiar_label(e.get("label"))
+            e["norm"] = normalizar_label(e.get("label"))
+        self._entries = raw
+        return raw
+
+    @property
+    def entries(self) -> List[dict]:
+        if self._entries is None:
+            self.build()
+        return self._entries
+
+    def resolve(self, etiqueta: str, index: int = 1, after: Optional[str] = None) -> Optional[dict]:
+        """
+        Busca el control de `etiqueta`.
+
+        Args:
+            etiqueta: Texto del label (o placeholder)
+            index: N-ésima coincidencia (1-based) dentro del mejor nivel de match
+            after: Si se indica, solo considera controles posteriores a ese label
+
+        Returns:
+            dict con keys label, kind, control, container, value, chips, pos;
+            None si el formulario no tiene ese campo (tras reconstruir una vez).
+        """
+        if not self._entries:
+            # sin índice, o vacío porque se construyó antes de que el formulario pintara
+            self.build()
+            return self._resolver(etiqueta, index, after)
+
+        found, _ = self._lookup(etiqueta, index, after, exacto=True)
+        if found is not None:
+            return found
+        # "contains" sobre el índice cacheado: vale si es inequívoco y su control
+        # sigue en la página. Si no, puede faltar un campo condicional que
+        # apareció después de indexar: se reconstruye (un recorrido del DOM)
+        found, ambiguo = self._lookup(etiqueta, index, after, exacto=False)
+        if found is not None and not ambiguo and self._vigente(found):
+            return found
+        self.build()
+        return self._resolver(etiqueta, index, after)
+
+    # ---------- internos ----------
+
+    def _resolver(self, etiqueta: str, index: int, after: Optional[str]) -> Optional[dict]:
+        """Igualdad primero y, si no hay, contains (sobre el índice actual, sin reconstruir)."""
+        found, _ = self._lookup(etiqueta, index, after, exacto=True)
+        if found is None:
+            found, _ = self._lookup(etiqueta, index, after, exacto=False)
+        return found
+
+    def _vigente(self, entry: dict) -> bool:
+        """True si el control cacheado sigue conectado al documento."""
+        try:
+            return bool(self.driver.execute_script("return arguments[0].isConnected;", entry["control"]))
+        except Exception:
+            return False
+
+    def _lookup(self, etiqueta: str, index: int, after: Optional[str], exacto: bool):
+        """(entry | None, ambiguo): ambiguo si el nivel que coincidió tiene más de una candidata."""
+        entries = self.entries
+        if after is not None:
+            base, _ = self._match_n(entries, after, 1, exacto=exacto)
+            if base is None:
+                return None, False
+            entries = [e for e in entries if e["pos"] > base["pos"]]
+            # relativo a otro label manda la cercanía: sin distinguir tildes/mayúsculas
+            return self._match_n(entries, etiqueta, index, estricto=False, exacto=exacto)
+        return self._match_n(entries, etiqueta, index, exacto=exacto)
+
+    @staticmethod
+    def _match_n(entries: List[dict], etiqueta: str, index: int, estricto: bool = True,
+                 exacto: Optional[bool] = None):
+        """
+        Args:
+            exacto: True → solo niveles 1-2 (igualdad), False → solo 3-4 (contains),
+                None → todos en orden
+
+        Returns:
+            (entry | None, ambiguo) — ambiguo si el nivel que coincidió tiene más de una candidata
+        """
+        clean = _limpiar_label(etiqueta)
+        norm = normalizar_label(etiqueta)
+        if not norm:
+            return None, False
+        niveles = (
+            lambda e: e["clean"] == clean,
+            lambda e: e["norm"] == norm,
+            lambda e: clean in e["clean"],
+            lambda e: norm in e["norm"],
+        )
+        if not estricto:
+            niveles = (niveles[1], niveles[1], niveles[3], niveles[3])
+        if exacto is True:
+            niveles = niveles[:2]
+        elif exacto is False:
+            niveles = niveles[2:]
+        for cumple in niveles:
+            hits = [e for e in entries if cumple(e)]
+            if len(hits) >= index:
+                return hits[index - 1], len(hits) > 1
+        return None, False
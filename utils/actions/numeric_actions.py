@@ -34,6 +34,21 @@ class NumericActions(BaseAction):
         if svalor == "":
             raise ValueError(f"Valor vacío para campo numérico '{etiqueta}'")
 
+        def escribir(entry):
+            el = entry["control"]
+            self.scroll_into_view(el)
+            el.click()
+            el.clear()
+            el.send_keys(Keys.CONTROL, "a")
+            el.send_keys(Keys.DELETE)
+            el.send_keys(svalor)
+            return el
+
+        try:
+            return self.por_indice(etiqueta, escribir, kinds=("number", "text"))
+        except LookupError:
+            pass
+
         label_xpath = f"(//label[contains(normalize-space(.), '{etiqueta}')])[1]"
         candidates = [
             f"{label_xpath}/following::input[not(@type='hidden')][1]",
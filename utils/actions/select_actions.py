@@ -17,13 +17,116 @@ Uso desde Page Objects (a través de la facade):
     seleccion_simple(driver, wait, "Empresa", "IBISA")
     seleccion_multiple(driver, wait, "Tags", ["Tag1", "Tag2"])
 """
-from typing import List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from utils.actions.base_action import BaseAction
+from utils.actions.dom_scripts import NETWORK_HOOK_JS, PICK_OPTION_JS, TYPE_QUERY_JS
+from utils.actions.form_index import normalizar_label
+from utils.waits import ensure_script_timeout
+
+
+# Modo chips en bloque: para cada opción escribe la búsqueda con un solo evento
+# input, espera la opción con un observer, la elige y conserva el foco.
+# Devuelve los chips finales leídos una sola vez. Los chips se comparan con la
+# misma normalización (tildes/mayúsculas) con la que se eligen las opciones.
+_JS_CHIPS_BULK = TYPE_QUERY_JS + PICK_OPTION_JS + """
+const inp = arguments[0], cont = arguments[1], opciones = arguments[2], timeoutMs = arguments[3];
+const done = arguments[arguments.length - 1];
+const chips = () => Array.from(cont.querySelectorAll('.MuiChip-label')).map(s => s.textContent.trim());
+const tieneChip = t => { const n = norm(t); return chips().some(c => norm(c) === n); };
+
+(async () => {
+    const resultado = [];
+    for (const texto of opciones) {
+        if (tieneChip(texto)) { resultado.push({texto: texto, estado: 'ya estaba'}); continue; }
+        inp.focus();
+        typeQuery(inp, texto);
+        const opt = await waitForOption(texto, timeoutMs);
+        if (!opt) { resultado.push({texto: texto, estado: 'sin opción'}); continue; }
+        opt.scrollIntoView({block: 'nearest'});
+        opt.click();
+        inp.focus();
+        resultado.push({texto: texto, estado: 'ok'});
+    }
+    typeQuery(inp, '');
+    done({chips: chips(), resultado: resultado});
+})().catch(e => done({error: String(e), chips: chips(), resultado: []}));
+"""
+
+# Selección simple en una ida y vuelta: escribe la búsqueda, espera a que el
+# listbox se pueble, elige la mejor opción (exacta > normalizada > prefijo),
+# la clica y devuelve el texto elegido. Sin candidata, clica la opción visible
+# número `opcion` (score 0); si no hay ninguna devuelve {texto: null, opciones: 0}.
+_JS_PICK_SIMPLE = TYPE_QUERY_JS + PICK_OPTION_JS + """
+const inp = arguments[0], texto = arguments[1], timeoutMs = arguments[2], opcion = arguments[3];
+const done = arguments[arguments.length - 1];
+inp.focus();
+typeQuery(inp, texto);
+waitForBestOption(texto, timeoutMs, 1).then(r => {
+    if (!r) {
+        const el = visibleOptions()[opcion - 1];
+        if (!el) return done({texto: null, opciones: visibleOptions().length});
+        r = {el: el, score: 0};
+    }
+    r.el.scrollIntoView({block: 'nearest'});
+    r.el.click();
+    done({texto: r.el.textContent.trim(), score: r.score});
+}).catch(e => done({error: String(e)}));
+"""
+
+# Solo espera y devuelve la opción (sin escribir ni clicar).
+_JS_FIND_OPTION = PICK_OPTION_JS + """
+const done = arguments[arguments.length - 1];
+waitForBestOption(arguments[0], arguments[1], arguments[2]).then(r => done(r ? r.el : null));
+"""
+
+# Lupa de campos endpoint: instala el hook de red, anota la secuencia actual y
+# clica el botón (síncrono, para no clicar dos veces si la espera fallara).
+_JS_LUPA_CLICK = NETWORK_HOOK_JS + """
+const net = installNetHook();
+const seq = net.seq;
+arguments[0].click();
+return {seq: seq, t_click: performance.now()};
+"""
+
+# Espera a que terminen las peticiones que disparó la lupa.
+_JS_LUPA_WAIT = NETWORK_HOOK_JS + """
+const done = arguments[arguments.length - 1];
+waitForNetworkFrom(arguments[0], arguments[1], arguments[2], arguments[3], arguments[4]).then(done);
+"""
+
+# Registro de búsquedas endpoint de la ejecución (latencia backend por campo).
+# Solo se guardan las últimas MAX_LOOKUPS; el resumen se acumula aparte.
+MAX_LOOKUPS = 200
+ENDPOINT_LOOKUPS: Deque[dict] = deque(maxlen=MAX_LOOKUPS)
+_RESUMEN_LOOKUPS: Dict[str, dict] = {}
+
+
+def _registrar_lookup(info: dict):
+    ENDPOINT_LOOKUPS.append(info)
+    if info.get("elapsed_ms") is None:
+        return
+    r = _RESUMEN_LOOKUPS.setdefault(info["endpoint"], {"n": 0, "total_ms": 0, "max_ms": 0})
+    r["n"] += 1
+    r["total_ms"] += info["elapsed_ms"]
+    r["max_ms"] = max(r["max_ms"], info["elapsed_ms"])
+
+
+def _tiene_chip(chips, texto: str) -> bool:
+    """True si algún chip coincide con `texto` sin distinguir tildes/mayúsculas (como PICK_OPTION_JS)."""
+    n = normalizar_label(texto)
+    return any(normalizar_label(c) == n for c in chips)
+
+
+def resumen_endpoints() -> Dict[str, dict]:
+    """{campo: {"n", "avg_ms", "max_ms"}} de todas las búsquedas endpoint de la ejecución."""
+    return {campo: {"n": r["n"], "max_ms": r["max_ms"], "avg_ms": round(r["total_ms"] / r["n"])}
+            for campo, r in _RESUMEN_LOOKUPS.items()}
 
 
 def _label_exact(etiqueta: str) -> str:
@@ -56,6 +159,13 @@ class SelectActions(BaseAction):
 
     # --- helpers ported from utils/elements.py ---
     def _find_option_by_text(self, texto: str, timeout: float = 5.0):
+        """Opción del listbox con texto exacto/normalizado (observer en página; XPaths como respaldo)."""
+        try:
+            ensure_script_timeout(self.driver, timeout + 5)
+            return self.driver.execute_async_script(_JS_FIND_OPTION, texto, int(timeout * 1000), 2)
+        except Exception:
+            pass
+
         opciones_xp = [
             f"//div[@role='listbox']//li[@role='option' and normalize-space(.)='{texto}']",
             f"//div[@role='listbox']//li[normalize-space(.)='{texto}']",
@@ -87,11 +197,7 @@ class SelectActions(BaseAction):
         except Exception:
             pass
 
-        label_xpath = _label_xpath_preciso(etiqueta)
-        cont = wait.until(EC.presence_of_element_located((
-            By.XPATH, f"{label_xpath}/ancestor::div[contains(@class,'MuiFormControl-root')][1]"
-        )))
-        inp = cont.find_element(By.CSS_SELECTOR, "input[role='combobox'], input")
+        cont, inp = self._contenedor_e_input(etiqueta)
 
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", inp)
         try:
@@ -107,11 +213,50 @@ class SelectActions(BaseAction):
 
         return cont, inp
 
+    def _contenedor_e_input(self, etiqueta: str):
+        """
+        (MuiFormControl, input) del select `etiqueta`.
+
+        Primero vía FormIndex (sin XPaths globales); si el formulario aún no
+        está indexado, espera el label con el XPath preciso de siempre.
+        """
+        def desde_indice(entry):
+            cont = entry.get("container")
+            if cont is None:
+                raise LookupError(etiqueta)
+            return cont, entry["control"]
+
+        try:
+            return self.por_indice(etiqueta, desde_indice, kinds=("autocomplete", "text"))
+        except LookupError:
+            pass
+
+        label_xpath = _label_xpath_preciso(etiqueta)
+        cont = self.wait.until(EC.presence_of_element_located((
+            By.XPATH, f"{label_xpath}/ancestor::div[contains(@class,'MuiFormControl-root')][1]"
+        )))
+        inp = cont.find_element(By.CSS_SELECTOR, "input[role='combobox'], input")
+        return cont, inp
+
     # --- public methods ---
-    def seleccion_multiple(self, etiqueta: str, opciones: List[str] | str, delay_typing=0.10):
+    def seleccion_multiple(self, etiqueta: str, opciones: List[str] | str, delay_typing=0.10,
+                           rapido: bool = True):
+        """
+        Agrega chips en un autocomplete múltiple.
+
+        Con `rapido=True` (por defecto) todas las opciones se eligen en un solo
+        script (ver _seleccion_multiple_rapida); solo las que no quedaron como
+        chip pasan al camino tecla a tecla.
+        """
         if isinstance(opciones, str):
             opciones = [opciones]
 
+        if rapido:
+            objetivos = [(o or "").strip() for o in opciones if (o or "").strip()]
+            opciones = self._seleccion_multiple_rapida(etiqueta, objetivos)
+            if not opciones:
+                return
+
         cont, inp = self._ensure_focus_on_input(etiqueta)
 
         for valor in opciones:
@@ -119,7 +264,7 @@ class SelectActions(BaseAction):
             if not objetivo:
                 continue
 
-            if objetivo in self._chips_actuales(cont):
+            if _tiene_chip(self._chips_actuales(cont), objetivo):
                 continue
 
             try:
@@ -146,7 +291,7 @@ class SelectActions(BaseAction):
                     time.sleep(0.15)
                     inp.send_keys(Keys.ENTER)
                     time.sleep(0.25)
-                    if objetivo in self._chips_actuales(cont):
+                    if _tiene_chip(self._chips_actuales(cont), objetivo):
                         ok = True
                         break
                 if not ok:
@@ -160,9 +305,7 @@ class SelectActions(BaseAction):
 
             try:
                 WebDriverWait(self.driver, 4).until(
-                    EC.presence_of_element_located((
-                        By.XPATH, f".//span[contains(@class,'MuiChip-label') and normalize-space(.)='{objetivo}']"
-                    ))
+                    lambda d: _tiene_chip(self._chips_actuales(cont), objetivo)
                 )
             except Exception:
                 raise TimeoutError(
@@ -171,29 +314,73 @@ class SelectActions(BaseAction):
 
             cont, inp = self._ensure_focus_on_input(etiqueta)
 
+    def _seleccion_multiple_rapida(self, etiqueta: str, objetivos: List[str], timeout_opcion: float = 5.0) -> List[str]:
+        """
+        Modo chips en bloque: una única llamada execute_async_script.
+
+        Returns:
+            Lista de opciones que NO quedaron como chip (vacía si todo ok).
+        """
+        if not objetivos:
+            return []
+        try:
+            cont, inp = self._contenedor_e_input(etiqueta)
+            self.scroll_into_view(inp)
+            ensure_script_timeout(self.driver, timeout_opcion * len(objetivos) + 10)
+            res = self.driver.execute_async_script(
+                _JS_CHIPS_BULK, inp, cont, objetivos, int(timeout_opcion * 1000)
+            )
+        except Exception as e:
+            print(f"⚠️ Modo chips en bloque no disponible en '{etiqueta}' ({e.__class__.__name__}); tecla a tecla")
+            return objetivos
+
+        chips = res.get("chips") or []
+        faltan = [o for o in objetivos if not _tiene_chip(chips, o)]
+        print(f"✅ {len(objetivos) - len(faltan)}/{len(objetivos)} chip(s) en '{etiqueta}' en bloque")
+        if faltan:
+            print(f"⚠️ Sin chip tras modo en bloque: {faltan}")
+        return faltan
+
     def assert_chips(self, etiqueta: str, esperados: List[str]):
         cont, _ = self._ensure_focus_on_input(etiqueta)
         reales = self._chips_actuales(cont)
-        faltan = set(esperados) - reales
+        faltan = {e for e in esperados if not _tiene_chip(reales, e)}
         if faltan:
             raise AssertionError(f"Faltan chips en {etiqueta}: {faltan}. Reales={reales}")
 
-    def seleccion_simple(self, etiqueta: str, texto: str, opcion: int = 1):
+    def seleccion_simple(self, etiqueta: str, texto: str, opcion: int = 1, timeout: float = 6.0):
+        """
+        Elige `texto` en un autocomplete simple.
+
+        Camino rápido: _JS_PICK_SIMPLE resuelve la opción dentro del navegador
+        (tolera mayúsculas/tildes, p.ej. "si" → "Sí") y devuelve el texto
+        elegido. Si ninguna coincide, elige la opción visible número `opcion`;
+        si el listbox quedó vacío, ENTER. Solo si el script no pudo correr se
+        teclea y se buscan las opciones por XPath.
+        """
         driver = self.driver
         wait = self.wait
 
-        label_xpath = _label_xpath_preciso(etiqueta)
-        cont = wait.until(EC.presence_of_element_located((
-            By.XPATH, f"{label_xpath}/ancestor::div[contains(@class,'MuiFormControl-root')][1]"
-        )))
-
-        inp = cont.find_element(By.CSS_SELECTOR, "input[role='combobox'], input")
+        cont, inp = self._contenedor_e_input(etiqueta)
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", inp)
         try:
             inp.click()
         except Exception:
             driver.execute_script("arguments[0].click();", inp)
 
+        res = self._elegir_en_pagina(inp, texto, timeout, opcion)
+        if res is not None:
+            elegido = res.get("texto")
+            if elegido:
+                if res.get("score") == 0:
+                    print(f"⚠️ '{etiqueta}': ninguna opción coincide con '{texto}'; se eligió la nº {opcion} ('{elegido}')")
+                elif elegido != texto:
+                    print(f"ℹ️ '{etiqueta}': '{texto}' → opción '{elegido}'")
+                return elegido
+            # el listbox se asentó sin opciones: no hay nada que buscar por XPath
+            inp.send_keys(Keys.ENTER)
+            return None
+
         try:
             inp.send_keys(Keys.CONTROL, "a")
             inp.send_keys(Keys.DELETE)
@@ -236,6 +423,17 @@ class SelectActions(BaseAction):
         except Exception:
             driver.execute_script("arguments[0].click();", opcion_elem)
 
+    def _elegir_en_pagina(self, inp, texto: str, timeout: float, opcion: int = 1) -> Optional[dict]:
+        """Una sola llamada async: escribe, espera el listbox, puntúa y clica. None si el script falló."""
+        try:
+            ensure_script_timeout(self.driver, timeout + 5)
+            res = self.driver.execute_async_script(_JS_PICK_SIMPLE, inp, texto, int(timeout * 1000), opcion)
+        except Exception:
+            return None
+        if not res or res.get("error"):
+            return None
+        return res
+
     def campo_endpoint(self, xpath_boton_lupa: str, label_dropdown: str, opcion_texto: str, label_input: str = None, valor_input: str = None, opcion: int = 1, delay: float = 2.0):
         if label_input and valor_input:
             try:
@@ -251,10 +449,46 @@ class SelectActions(BaseAction):
         try:
             boton_lupa = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath_boton_lupa)))
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", boton_lupa)
-            self.driver.execute_script("arguments[0].click();", boton_lupa)
         except Exception:
             print(f"⚠️ No se encontró lupa en {xpath_boton_lupa}")
             return
 
-        time.sleep(delay)
+        if self._lupa_y_esperar_red(boton_lupa, label_dropdown) is None:
+            # sin hook de red: comportamiento clásico
+            self.driver.execute_script("arguments[0].click();", boton_lupa)
+            time.sleep(delay)
         self.seleccion_simple(label_dropdown, opcion_texto, opcion=opcion)
+
+    def _lupa_y_esperar_red(self, boton_lupa, endpoint: str, timeout: float = 30.0,
+                            quiet_ms: int = 150, start_ms: int = 1500) -> Optional[dict]:
+        """
+        Clica la lupa y espera a que terminen las peticiones fetch/XHR que dispara.
+
+        Registra la latencia en ENDPOINT_LOOKUPS. Devuelve el resultado de la
+        espera, o None si no se pudo instalar el hook (la lupa NO se clicó).
+        """
+        try:
+            marca = self.driver.execute_script(_JS_LUPA_CLICK, boton_lupa)
+        except Exception:
+            return None
+
+        info = {"endpoint": endpoint, "ts": time.time(), "elapsed_ms": None, "requests": [],
+                "timed_out": False, "no_request": False}
+        try:
+            ensure_script_timeout(self.driver, timeout + 5)
+            res = self.driver.execute_async_script(
+                _JS_LUPA_WAIT, marca["seq"], marca["t_click"], int(timeout * 1000), quiet_ms, start_ms
+            )
+            info.update(res or {})
+        except Exception as e:
+            # p.ej. navegación durante la espera: la lupa ya se clicó, seguimos
+            print(f"⚠️ Espera de red de '{endpoint}' interrumpida ({e.__class__.__name__})")
+        _registrar_lookup(info)
+
+        if info["no_request"]:
+            print(f"ℹ️ Lupa '{endpoint}': sin petición de red")
+        elif info["timed_out"]:
+            print(f"⚠️ Lupa '{endpoint}': la red no terminó en {timeout}s")
+        elif info["elapsed_ms"] is not None:
+            print(f"🌐 Lupa '{endpoint}': {info['elapsed_ms']} ms ({len(info['requests'])} petición/es)")
+        return info
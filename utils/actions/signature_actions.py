@@ -21,6 +21,95 @@ from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 import time
 from utils.actions.base_action import BaseAction
+from utils.actions.dom_scripts import NORMALIZE_JS
+
+
+# Firma en una sola llamada: localiza el canvas (el recibido o el siguiente al
+# label), dibuja los trazos con eventos pointer/mouse, comprueba que los
+# píxeles del canvas cambiaron y clica el botón verde 'Firmar' hermano.
+# Devuelve {found, drawn, pixel_check, button}.
+_JS_FIRMA = NORMALIZE_JS + """
+let canvas = arguments[0];
+const etiqueta = arguments[1], trazos = arguments[2], clickFirmar = arguments[3];
+
+if (!canvas && etiqueta) {
+    const objetivo = norm(etiqueta.replace(/\\*/g, ''));
+    const lbls = Array.from(document.querySelectorAll('label, span'))
+        .filter(l => l.children.length === 0 || l.tagName === 'LABEL');
+    const lbl = lbls.find(l => norm(l.textContent.replace(/\\*/g, '')) === objetivo)
+        || lbls.find(l => norm(l.textContent).includes(objetivo));
+    if (lbl) {
+        canvas = Array.from(document.querySelectorAll('canvas'))
+            .find(c => lbl.compareDocumentPosition(c) & Node.DOCUMENT_POSITION_FOLLOWING) || null;
+    }
+}
+if (!canvas) {
+    canvas = document.querySelector('.signature-field canvas, .signature-container canvas');
+}
+if (!canvas) return {found: false};
+
+canvas.scrollIntoView({block: 'center'});
+const r = canvas.getBoundingClientRect();
+
+// Estado de los píxeles: nº de píxeles no transparentes + checksum de todos
+// los bytes. null si no se pueden leer (sin contexto 2d, canvas contaminado…).
+function pixeles() {
+    try {
+        const ctx = canvas.getContext('2d');
+        if (!ctx || !canvas.width || !canvas.height) return null;
+        const px = ctx.getImageData(0, 0, canvas.width, canvas.height).data;
+        let n = 0, sum = 0;
+        for (let i = 0; i < px.length; i++) {
+            sum = (sum * 31 + px[i]) | 0;
+            if ((i & 3) === 3 && px[i] !== 0) n++;
+        }
+        return {n: n, sum: sum};
+    } catch (_) {
+        return null;
+    }
+}
+function fire(tipo, x, y, buttons) {
+    const base = {bubbles: true, cancelable: true, composed: true, view: window,
+                  clientX: x, clientY: y, screenX: x, screenY: y, button: 0, buttons: buttons};
+    const ptr = tipo.replace('mouse', 'pointer');
+    if (window.PointerEvent) {
+        canvas.dispatchEvent(new PointerEvent(ptr, Object.assign(
+            {pointerId: 1, pointerType: 'mouse', isPrimary: true, pressure: buttons ? 0.5 : 0}, base)));
+    }
+    canvas.dispatchEvent(new MouseEvent(tipo, base));
+}
+
+const antes = pixeles();
+for (let i = 0; i < trazos; i++) {
+    const x0 = r.left + Math.max(10, r.width * 0.15) + i * 12;
+    const y0 = r.top + Math.max(10, r.height * 0.5);
+    const dx = Math.max(10, r.width * 0.20);
+    fire('mousedown', x0, y0, 1);
+    for (let k = 1; k <= 12; k++) {
+        fire('mousemove', x0 + dx * k / 12, y0 + Math.sin(k / 2) * r.height * 0.08, 1);
+    }
+    fire('mouseup', x0 + dx, y0, 0);
+}
+const despues = pixeles();
+// solo cuenta como firmado si los trazos cambiaron el canvas; sin poder leerlo
+// no se da por bueno (se dibuja con ActionChains)
+const drawn = !!(antes && despues) && (antes.n !== despues.n || antes.sum !== despues.sum);
+if (!drawn) return {found: true, drawn: false, pixel_check: !!(antes && despues)};
+
+let boton = null;
+if (clickFirmar) {
+    let cont = canvas;
+    for (let i = 0; i < 4 && cont.parentElement; i++) cont = cont.parentElement;
+    const verdes = Array.from(cont.querySelectorAll('button.btn-green'));
+    const btn = verdes.find(b => b.textContent.includes('Firmar')) || verdes[0];
+    if (btn) {
+        btn.scrollIntoView({block: 'center'});
+        btn.click();
+        boton = btn.textContent.trim();
+    }
+}
+return {found: true, drawn: true, pixel_check: true, button: boton};
+"""
 
 class SignatureActions(BaseAction):
     """Hereda de BaseAction para aprovechar métodos helper comunes."""
@@ -31,6 +120,12 @@ class SignatureActions(BaseAction):
 
     def _buscar_canvas_firma(self, etiqueta: str | None):
         """Intenta encontrar el <canvas> de firma (mismos heurísticos que antes)."""
+        if etiqueta:
+            try:
+                return self.por_indice(etiqueta, lambda e: e["control"], kinds=("canvas",))
+            except LookupError:
+                pass
+
         candidatos = []
 
         if etiqueta:
@@ -59,7 +154,16 @@ class SignatureActions(BaseAction):
         raise last_exc if last_exc else TimeoutException("No se encontró ningún canvas de firma")
 
     def campo_firma(self, etiqueta: str | None = "Firma", *, trazos: int = 1, click_boton_firmar: bool = True):
-        """Dibuja en el canvas y pulsa 'Firmar' si procede."""
+        """
+        Dibuja en el canvas y pulsa 'Firmar' si procede.
+
+        Camino rápido: _firmar_en_pagina (una sola llamada). Si no encuentra el
+        canvas, o los trazos no cambiaron sus píxeles (o no se pueden leer), se
+        usa el trazo con ActionChains.
+        """
+        if self._firmar_en_pagina(etiqueta, trazos, click_boton_firmar):
+            return
+
         driver = self.driver
         canvas = self._buscar_canvas_firma(etiqueta)
 
@@ -114,3 +218,27 @@ class SignatureActions(BaseAction):
                     break
                 except Exception:
                     continue
+
+    def _firmar_en_pagina(self, etiqueta: str | None, trazos: int, click_boton_firmar: bool) -> bool:
+        """Firma con _JS_FIRMA. True si el canvas quedó dibujado (y se clicó 'Firmar' si procede)."""
+        canvas = None
+        if etiqueta:
+            try:
+                canvas = self.por_indice(etiqueta, lambda e: e["control"], kinds=("canvas",))
+            except LookupError:
+                pass
+
+        try:
+            res = self.driver.execute_script(_JS_FIRMA, canvas, etiqueta, max(1, trazos), click_boton_firmar)
+        except Exception as e:
+            print(f"⚠️ Firma rápida no disponible ({e.__class__.__name__}); se usa ActionChains")
+            return False
+
+        if not res or not res.get("found") or not res.get("drawn"):
+            return False
+        if click_boton_firmar:
+            if res.get("button"):
+                print("✅ Click en botón 'Firmar'")
+            else:
+                print(f"⚠️ Canvas firmado pero sin botón 'Firmar' cerca de '{etiqueta}'")
+        return True
@@ -22,14 +22,105 @@ import time
 from typing import Dict
 from utils.actions.base_action import BaseAction
 
+# Marca toda la tabla en una pasada: lee etiqueta y estado de cada fila y solo
+# hace click donde el estado actual difiere del deseado.
+_JS_MARCAR_TABLA = """
+const tabla = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const respuestas = arguments[1] || {}, porDefecto = arguments[2];
+if (!tabla) return null;
+
+const norm = s => (s || '').normalize('NFD').replace(/[\\u0300-\\u036f]/g, '')
+    .toLowerCase().replace(/\\s+/g, ' ').trim();
+const porNorm = {};
+Object.keys(respuestas).forEach(k => { porNorm[norm(k)] = k; });
+const usadas = new Set();
+
+function encendido(ctrl) {
+    if (ctrl.matches('input[type=checkbox], input[type=radio]')) return ctrl.checked;
+    const aria = ctrl.closest('[aria-checked]') || ctrl.closest('[aria-pressed]');
+    if (aria) return (aria.getAttribute('aria-checked') || aria.getAttribute('aria-pressed')) === 'true';
+    if (ctrl.closest('.Mui-checked') || ctrl.querySelector('.Mui-checked')) return true;
+    return null;  // sin estado legible: no se puede saber, se hace click
+}
+
+const filas = [];
+tabla.querySelectorAll('tbody > tr').forEach(fila => {
+    const celda = fila.querySelector('td');
+    if (!celda) return;
+    const texto = celda.innerText.trim();
+    const clave = (texto in respuestas) ? texto : porNorm[norm(texto)];
+    if (clave !== undefined) usadas.add(clave);
+    const deseado = String(clave !== undefined ? respuestas[clave] : porDefecto).trim();
+    const esSi = deseado.toLowerCase() === 'si';
+    const col = fila.querySelectorAll('td')[esSi ? 1 : 2];
+    const ctrl = col && (col.querySelector('input[type=checkbox], input[type=radio]') ||
+        col.querySelector('[role=switch], [aria-checked], button, div'));
+    if (!ctrl) {
+        filas.push({label: texto, deseado: deseado, cambiado: false, ok: false, motivo: 'sin control'});
+        return;
+    }
+    if (encendido(ctrl) === true) {
+        filas.push({label: texto, deseado: deseado, cambiado: false, ok: true});
+        return;
+    }
+    ctrl.scrollIntoView({block: 'center'});
+    ctrl.click();
+    filas.push({label: texto, deseado: deseado, cambiado: true, ok: encendido(ctrl) !== false});
+});
+
+return {
+    filas: filas,
+    desconocidas: Object.keys(respuestas).filter(k => !usadas.has(k))
+};
+"""
+
+
 class TableActions(BaseAction):
     """Hereda de BaseAction para aprovechar métodos helper comunes."""
     pass  # __init__ heredado de BaseAction
 
     def marcar_tabla_riesgos(self, tabla_xpath: str, respuestas: Dict[str, str], default: str = "No"):
-        """Marca filas de tabla según el dict `respuestas`.
-        Esta implementación fue migrada desde utils/elements.py (Fase 1).
+        """Marca filas de tabla según el dict `respuestas` (resto con `default`).
+
+        Todo ocurre en un único script: se lee cada fila, se compara con el
+        estado actual y solo se hace click en las que difieren.
+
+        Returns:
+            dict: {"filas": [{label, deseado, cambiado, ok[, motivo]}],
+                   "desconocidas": [claves de `respuestas` que no existen en la tabla]}
         """
+        respuestas = respuestas or {}
+        res = self._marcar_en_pagina(tabla_xpath, respuestas, default)
+        if res is None:
+            # la tabla puede estar renderizándose: esperar y reintentar una vez
+            try:
+                self.find_element(By.XPATH, tabla_xpath)
+            except TimeoutException:
+                pass
+            res = self._marcar_en_pagina(tabla_xpath, respuestas, default)
+        if res is None:
+            self._marcar_por_filas(tabla_xpath, respuestas, default)
+            return {"filas": [], "desconocidas": []}
+
+        filas = res.get("filas", [])
+        cambiadas = sum(1 for f in filas if f.get("cambiado"))
+        print(f"✅ Tabla: {len(filas)} filas, {cambiadas} marcadas, {len(filas) - cambiadas} ya estaban")
+        for f in filas:
+            if not f.get("ok"):
+                print(f"⚠️ No se pudo marcar '{f.get('label')}' ({f.get('motivo', 'estado no cambió')})")
+        for k in res.get("desconocidas", []):
+            print(f"⚠️ '{k}' no existe en la tabla (respuesta ignorada)")
+        return res
+
+    def _marcar_en_pagina(self, tabla_xpath: str, respuestas: Dict[str, str], default: str):
+        try:
+            return self.driver.execute_script(_JS_MARCAR_TABLA, tabla_xpath, respuestas, default)
+        except Exception:
+            return None
+
+    def _marcar_por_filas(self, tabla_xpath: str, respuestas: Dict[str, str], default: str = "No"):
+        """Camino fila a fila (original), usado si el script no puede ejecutarse."""
         driver = self.driver
         filas = driver.find_elements(By.XPATH, f"{tabla_xpath}//tbody/tr")
 
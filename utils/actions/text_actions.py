@@ -15,12 +15,26 @@ Uso desde Page Objects (a través de la facade):
     from utils.elements import campo_texto_por_label
     campo_texto_por_label(driver, wait, "Descripción", "Trabajo de mantenimiento")
 """
-from typing import Optional
+from typing import Dict, Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from utils.actions.base_action import BaseAction
+from utils.actions.dom_scripts import SET_NATIVE_VALUE_JS
+from utils.actions.form_index import FormIndex
+
+# Tipos de control (FormIndex) en los que se puede escribir texto libre
+TEXT_KINDS = ("text", "textarea", "number")
+
+
+# Asigna todos los valores en un solo script y devuelve la lectura posterior.
+_JS_FILL_BULK = SET_NATIVE_VALUE_JS + """
+const pares = arguments[0];
+for (const [el, val] of pares) setNativeValue(el, val);
+if (document.activeElement && document.activeElement.blur) document.activeElement.blur();
+return pares.map(([el]) => el.value);
+"""
 
 
 def _label_exact(etiqueta: str) -> str:
@@ -31,11 +45,73 @@ class TextActions(BaseAction):
     """Hereda de BaseAction para aprovechar métodos helper comunes."""
     pass  # __init__ heredado de BaseAction
 
+    def _escribir_en(self, texto: str):
+        """Devuelve una acción para `por_indice` que escribe `texto` en el control."""
+        def accion(entry):
+            el = entry["control"]
+            self.scroll_into_view(el)
+            el.clear()
+            el.send_keys(texto)
+            return el
+        return accion
+
+    def llenar_campos(self, campos: Dict[str, object]) -> dict:
+        """
+        Llena varios inputs/textareas planos en UNA llamada WebDriver.
+
+        Resuelve los controles con FormIndex, asigna los valores con el setter
+        nativo (compatible con React) + eventos input/change, y verifica todos
+        con una sola lectura. Los campos no indexados o cuyo valor no quedó
+        aplicado se escriben uno a uno (campo_texto_por_label) como respaldo.
+
+        Args:
+            campos: {label: valor}
+
+        Returns:
+            dict: {"bulk": [labels llenados en bloque], "fallback": [labels uno a uno]}
+        """
+        esperados = {lbl: str(v) for lbl, v in campos.items() if v is not None}
+        pendientes = list(esperados)
+        bulk = []
+
+        for intento in range(2):
+            pares = []
+            for lbl in pendientes:
+                entry = self.resolve_control(lbl)
+                if entry is not None and entry.get("kind") in TEXT_KINDS:
+                    pares.append((lbl, entry["control"]))
+            if not pares:
+                break
+            try:
+                leidos = self.driver.execute_script(
+                    _JS_FILL_BULK, [[el, esperados[lbl]] for lbl, el in pares]
+                )
+            except StaleElementReferenceException:
+                FormIndex.invalidate_for(self.driver)
+                continue
+            for (lbl, _), val in zip(pares, leidos or []):
+                if (val or "").strip() == esperados[lbl].strip():
+                    bulk.append(lbl)
+            break
+
+        fallback = [lbl for lbl in pendientes if lbl not in bulk]
+        for lbl in fallback:
+            self.campo_texto_por_label(lbl, esperados[lbl])
+
+        if bulk:
+            print(f"✅ {len(bulk)} campo(s) llenados en bloque: {', '.join(bulk)}")
+        return {"bulk": bulk, "fallback": fallback}
+
     def campo_texto_por_label(self, etiqueta: str, texto: str):
         """Escribe en el input/textarea asociado al label exacto."""
         driver = self.driver
         wait = self.wait
-        
+
+        try:
+            return self.por_indice(etiqueta, self._escribir_en(texto), kinds=TEXT_KINDS)
+        except LookupError:
+            pass  # formulario aún sin renderizar o label no indexado → XPaths
+
         label_xpath = f"(//label[contains(normalize-space(.), '{etiqueta}')])[1]"
         wait.until(EC.presence_of_element_located((By.XPATH, label_xpath)))
 
@@ -68,7 +144,12 @@ class TextActions(BaseAction):
         """Escribe en el N-ésimo input/textarea asociado al label indicado."""
         driver = self.driver
         wait = self.wait
-        
+
+        try:
+            return self.por_indice(etiqueta, self._escribir_en(texto), index=index, kinds=TEXT_KINDS)
+        except LookupError:
+            pass
+
         label_xpath = f"(//label[normalize-space(translate(., '*', ''))='{etiqueta}'])[{index}]"
         candidates = [
             f"{label_xpath}/following::input[not(@type='hidden')][1]",
@@ -93,7 +174,17 @@ class TextActions(BaseAction):
     def assert_input_value_by_label_index(self, etiqueta: str, expected: str, index: int = 1):
         """Asserta el valor del N-ésimo input/textarea asociado al label indicado."""
         wait = self.wait
-        
+
+        try:
+            val = self.por_indice(
+                etiqueta, lambda e: (e["control"].get_attribute("value") or "").strip(),
+                index=index, kinds=TEXT_KINDS,
+            )
+            assert val == expected.strip(), f"Esperaba '{expected}' en '{etiqueta}' index {index}, obtuve '{val}'"
+            return
+        except LookupError:
+            pass
+
         label_xpath = f"(//label[normalize-space(translate(., '*', ''))='{etiqueta}'])[{index}]"
         try:
             el = wait.until(EC.presence_of_element_located(
@@ -108,7 +199,12 @@ class TextActions(BaseAction):
         """Escribe en el 'target_label' que aparece DESPUÉS del 'base_label'."""
         driver = self.driver
         wait = self.wait
-        
+
+        try:
+            return self.por_indice(target_label, self._escribir_en(texto), after=base_label, kinds=TEXT_KINDS)
+        except LookupError:
+            pass
+
         # aseguramos que existe el base
         wait.until(EC.presence_of_element_located((By.XPATH, _label_exact(base_label))))
         # target que viene después del base
@@ -139,7 +235,13 @@ class TextActions(BaseAction):
         """Escribe en el input '¿Cuales?/¿Cuáles?' que aparece DESPUÉS del label base."""
         driver = self.driver
         wait = self.wait
-        
+
+        # el índice normaliza tildes: '¿Cuáles?' cubre también '¿Cuales?'
+        try:
+            return self.por_indice("¿Cuáles?", self._escribir_en(valor), after=base_label, kinds=TEXT_KINDS)
+        except LookupError:
+            pass
+
         # label base (exacto, ignorando '*') y su contenedor FormControl
         base_label_xpath = f"//label[normalize-space(translate(., '*', ''))='{base_label}']"
         base_cont_xpath = f"{base_label_xpath}/ancestor::div[contains(@class,'MuiFormControl-root')][1]"
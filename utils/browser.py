@@ -1,13 +1,203 @@
+"""
+Construcción de drivers y pool de navegadores "calientes".
+
+`build_driver()` crea un Chrome nuevo (arranque en frío: Chrome + chromedriver).
+`BrowserPool` mantiene N drivers ya lanzados y los entrega bajo demanda; al
+devolverlos los limpia (reset_driver) y los reutiliza en el siguiente préstamo,
+de modo que cada test no paga el arranque completo del navegador. Solo se
+lanza uno nuevo (en segundo plano) cuando se descarta un driver que no se pudo limpiar.
+
+Uso:
+    from utils.browser import BrowserPool
+
+    pool = BrowserPool(size=2, headless=True)
+    with pool.lease() as driver:
+        FlowP1(driver).run(...)
+    pool.close()
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
-def build_driver(headless: bool = False):
+from utils.command_recorder import instalar_desde_env as instalar_grabacion
+from utils.driver_profiler import instalar_desde_env
+
+
+def build_driver(headless: bool = False, user_data_dir: Optional[str] = None,
+                 download_dir: Optional[str] = None):
+    """
+    Args:
+        headless: Chrome sin ventana
+        user_data_dir: Perfil de Chrome propio (aísla cookies/caché entre workers)
+        download_dir: Carpeta de descargas (p.ej. artefactos del worker)
+    """
     options = Options()
     if headless:
         options.add_argument("--headless=new")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-notifications")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
     prefs = {"profile.default_content_setting_values.notifications": 2}
+    if download_dir:
+        prefs["download.default_directory"] = download_dir
     options.add_experimental_option("prefs", prefs)
     driver = webdriver.Chrome(options=options)
+    instalar_desde_env(driver)  # MAP_PROFILE: cuenta/mide los comandos WebDriver
+    instalar_grabacion(driver)  # MAP_RECORD: graba los comandos para reproducirlos (main.py replay)
     return driver
+
+
+def reset_driver(driver):
+    """
+    Deja el driver como recién lanzado para el siguiente préstamo:
+    cierra ventanas extra, descarta browser contexts creados por CDP
+    (RoleContextManager), borra cookies y storage y navega a about:blank.
+    """
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    try:
+        for ctx in driver.execute_cdp_cmd("Target.getBrowserContexts", {}).get("browserContextIds", []):
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": ctx})
+    except Exception:
+        pass
+
+    # localStorage/sessionStorage solo se pueden limpiar desde el origen actual
+    try:
+        driver.execute_script("try{localStorage.clear();sessionStorage.clear();}catch(_){}")
+    except Exception:
+        pass
+
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    except Exception:
+        driver.delete_all_cookies()
+
+    driver.get("about:blank")
+
+
+class BrowserPool:
+    """Pool de drivers precalentados con reposición en segundo plano."""
+
+    def __init__(self, size: int = 1, headless: bool = False,
+                 factory: Optional[Callable[[], object]] = None):
+        """
+        Args:
+            size: Número total de drivers del pool (ociosos + prestados)
+            headless: Se pasa a build_driver si no se indica factory
+            factory: Callable que crea un driver (por defecto build_driver)
+        """
+        self.size = max(1, int(size))
+        self.factory = factory or (lambda: build_driver(headless=headless))
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._launching = 0
+        self._leased = set()
+        self._closed = False
+
+    def start(self):
+        """Lanza en segundo plano los drivers iniciales (no bloquea)."""
+        self._refill()
+        return self
+
+    def acquire(self, timeout: float = 120):
+        """
+        Entrega un driver listo. Si no hay ninguno precalentado espera a que
+        termine de arrancar uno (como máximo `timeout` segundos).
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool cerrado")
+        self._refill()
+        try:
+            driver = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No hubo driver disponible en {timeout}s")
+        if isinstance(driver, Exception):
+            raise driver
+        with self._lock:
+            self._leased.add(driver)
+        # el prestado cuenta para `size`: vuelve al pool en release() y no se repone
+        return driver
+
+    def release(self, driver):
+        """Devuelve un driver al pool tras limpiar su estado (o lo cierra si sobra/falla)."""
+        with self._lock:
+            self._leased.discard(driver)
+            sobra = self._closed or self._idle.qsize() + self._launching + len(self._leased) >= self.size
+        if sobra:
+            self._quit(driver)
+            return
+        try:
+            reset_driver(driver)
+        except Exception as e:
+            print(f"⚠️ BrowserPool: no se pudo limpiar el driver ({e.__class__.__name__}); se descarta")
+            self._quit(driver)
+            self._refill()
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = 120):
+        """Context manager: `with pool.lease() as driver: ...`"""
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Cierra todos los drivers (ociosos y prestados)."""
+        with self._lock:
+            self._closed = True
+            leased = list(self._leased)
+            self._leased.clear()
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(driver, Exception):
+                self._quit(driver)
+        for driver in leased:
+            self._quit(driver)
+
+    # ---------- internos ----------
+
+    def _refill(self):
+        with self._lock:
+            if self._closed:
+                return
+            faltan = self.size - (self._idle.qsize() + self._launching + len(self._leased))
+            self._launching += max(0, faltan)
+        for _ in range(max(0, faltan)):
+            threading.Thread(target=self._launch, name="browser-pool-launch", daemon=True).start()
+
+    def _launch(self):
+        try:
+            driver = self.factory()
+        except Exception as e:
+            # se propaga al siguiente acquire() en lugar de colgarlo hasta el timeout
+            driver = e
+        with self._lock:
+            self._launching -= 1
+            closed = self._closed
+        if closed and not isinstance(driver, Exception):
+            self._quit(driver)
+            return
+        self._idle.put(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,238 @@
+# utils/command_recorder.py
+"""
+CommandRecorder - Graba el flujo de comandos WebDriver de una ejecución
+
+Envuelve `driver.command_executor.execute` (igual que utils/driver_profiler.py)
+y escribe cada comando en un JSONL comprimido con gzip:
+
+    {"format": "map-commands/1", "commit": ..., "started": ..., "pid": ...}   ← cabecera
+    {"i": 0, "t": 0.012, "dur": 3.1, "cmd": "get", "params": {...},
+     "resp": {...}, "step": "f1a"}                                          ← un comando por línea
+
+- `t`: segundos desde el inicio de la grabación; `dur`: ms de ida y vuelta
+- `params` sin sessionId; `resp` es la respuesta cruda de chromedriver
+  (valores de más de 64 KB, p.ej. capturas, se sustituyen por {"_omitido": n})
+- `step`: paso del StepEngine en curso (listener o span "step" de utils/tracing)
+
+La grabación se reproduce con utils/command_replay.py (`python main.py replay`).
+
+Activación:
+    MAP_RECORD=1                          → build_driver lo instala; se guarda en
+                                            artifacts/commands.jsonl.gz
+    MAP_RECORD=artifacts/f7n_lento        → mismo, en esa ruta (.jsonl.gz)
+
+    Cada driver graba en su propio fichero: el primero del proceso en la ruta
+    indicada y los siguientes en <ruta>_2.jsonl.gz, _3... (los que no llegan a
+    emitir comandos se borran al salir).
+
+    # o explícito
+    from utils.command_recorder import CommandRecorder
+    rec = CommandRecorder(driver, "artifacts/run.jsonl.gz").install()
+    ...
+    rec.close()
+"""
+import atexit
+import gzip
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from utils import tracing
+
+FORMAT = "map-commands/1"
+DEFAULT_PATH = os.path.join("artifacts", "commands.jsonl.gz")
+MAX_VALOR = 64 * 1024
+FUERA_DE_PASO = "(fuera de paso)"
+_FLUSH_CADA = 50
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "desconocido"
+
+
+def _compactar(valor):
+    """Sustituye valores enormes (capturas, page_source...) por su tamaño."""
+    try:
+        texto = json.dumps(valor, ensure_ascii=False, default=str)
+    except Exception:
+        return {"_omitido": -1}
+    if len(texto) > MAX_VALOR:
+        return {"_omitido": len(texto)}
+    return json.loads(texto)
+
+
+class CommandRecorder:
+    """Grabador de comandos WebDriver de un driver."""
+
+    def __init__(self, driver, path: str = DEFAULT_PATH):
+        self.driver = driver
+        self.path = path
+        self.n = 0
+        self._original = None
+        self._f = None
+        self._lock = threading.Lock()
+        self._paso: Optional[str] = None
+        self.t0 = time.perf_counter()
+
+    # ---------- instalación ----------
+
+    def install(self) -> "CommandRecorder":
+        """Abre el fichero y envuelve el transporte del driver (idempotente)."""
+        if self._original is not None:
+            return self
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._f = gzip.open(self.path, "wt", encoding="utf-8")
+        self._escribir({"format": FORMAT, "commit": _commit(), "pid": os.getpid(),
+                        "started": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        executor = self.driver.command_executor
+        self._original = executor.execute
+        executor.execute = self._execute
+        self.driver._map_recorder = self
+        self.t0 = time.perf_counter()
+        return self
+
+    def close(self):
+        """Deja de grabar y cierra el fichero (el driver sigue funcionando)."""
+        executor = self.driver.command_executor
+        if self._original is not None and executor.__dict__.get("execute") == self._execute:
+            # si debajo había otro envoltorio (p.ej. DriverProfiler) se deja en su sitio
+            if self._original == type(executor).execute.__get__(executor):
+                del executor.execute
+            else:
+                executor.execute = self._original
+        self._original = None
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+    # ---------- listener de StepEngine ----------
+
+    def on_step_start(self, step, role):
+        self._paso = step.name
+
+    def on_step_end(self, step, result):
+        self._paso = None
+        with self._lock:
+            if self._f is not None:
+                self._f.flush()
+
+    # ---------- grabación ----------
+
+    def _execute(self, command, params):
+        t = time.perf_counter()
+        try:
+            resp = self._original(command, params)
+        except Exception as e:
+            self._registrar(command, params, t, None, f"{e.__class__.__name__}: {e}")
+            raise
+        self._registrar(command, params, t, resp, None)
+        return resp
+
+    def _paso_actual(self) -> str:
+        sp = tracing.current_of("step")
+        if sp is not None:
+            return sp.name
+        return self._paso or FUERA_DE_PASO
+
+    def _registrar(self, command: str, params: dict, t: float, resp, error: Optional[str]):
+        fin = time.perf_counter()
+        linea = {
+            "t": round(t - self.t0, 4),
+            "dur": round((fin - t) * 1000, 2),
+            "cmd": command,
+            "params": _compactar({k: v for k, v in (params or {}).items() if k != "sessionId"}),
+            "step": self._paso_actual(),
+        }
+        if error is not None:
+            linea["error"] = error
+        else:
+            linea["resp"] = _compactar(resp)
+        with self._lock:
+            if self._f is None:
+                return
+            linea["i"] = self.n
+            self.n += 1
+            self._escribir(linea)
+            if self.n % _FLUSH_CADA == 0:
+                self._f.flush()
+
+    def _escribir(self, obj: dict):
+        self._f.write(json.dumps(obj, ensure_ascii=False, default=str) + "\n")
+
+
+def leer_grabacion(path: str) -> Tuple[dict, List[dict]]:
+    """(cabecera, comandos) de una grabación. Tolera un final truncado (proceso interrumpido)."""
+    lineas = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for linea in f:
+                if linea.strip():
+                    lineas.append(json.loads(linea))
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+            print(f"⚠️ Grabación truncada: {path} (se usan los comandos completos)")
+    cabecera = lineas[0] if lineas else {}
+    if cabecera.get("format") != FORMAT:
+        raise ValueError(f"Formato de grabación desconocido: {cabecera.get('format')!r}")
+    return cabecera, lineas[1:]
+
+
+def grabador_de(driver) -> Optional[CommandRecorder]:
+    """Grabador instalado en `driver` (None si no hay)."""
+    return getattr(driver, "_map_recorder", None)
+
+
+_rutas_lock = threading.Lock()
+_drivers_grabados = 0
+
+
+def _ruta_unica(ruta: str) -> str:
+    """
+    Una ruta por driver: el primero del proceso usa `ruta`, los siguientes
+    (p.ej. otro driver de un BrowserPool con size > 1) `<ruta>_2`, `_3`...
+    En procesos hijo se añade además el pid.
+    """
+    global _drivers_grabados
+    with _rutas_lock:
+        _drivers_grabados += 1
+        n = _drivers_grabados
+    base = ruta[:-len(".jsonl.gz")]
+    if mp.parent_process() is not None:
+        base += f"_{os.getpid()}"
+    if n > 1:
+        base += f"_{n}"
+    return base + ".jsonl.gz"
+
+
+def instalar_desde_env(driver) -> Optional[CommandRecorder]:
+    """Instala el grabador si MAP_RECORD está activo; el fichero se cierra al salir del proceso."""
+    valor = os.getenv("MAP_RECORD", "").strip()
+    if not valor or valor.lower() in ("0", "false", "no"):
+        return None
+    ruta = DEFAULT_PATH if valor.lower() in ("1", "true", "si", "yes") else valor
+    if not ruta.endswith(".jsonl.gz"):
+        ruta += ".jsonl.gz"
+    ruta = _ruta_unica(ruta)
+    rec = CommandRecorder(driver, ruta).install()
+
+    def _al_salir():
+        rec.close()
+        if rec.n:
+            print(f"🎞️ {rec.n} comandos WebDriver grabados en {ruta}")
+        else:
+            # driver que no llegó a usarse: no deja fichero vacío
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    atexit.register(_al_salir)
+    return rec
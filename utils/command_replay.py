@@ -0,0 +1,229 @@
+# utils/command_replay.py
+"""
+CommandReplayer - Reproduce una grabación de comandos WebDriver (utils/command_recorder.py)
+
+Re-emite cada comando grabado, en orden, sobre un driver nuevo y compara
+resultado y tiempo con la grabación:
+
+- Ids remapeados: los ids que devolvió chromedriver en la grabación
+  (elementos, shadow roots, ventanas/targets, nodeId/backendNodeId/objectId
+  de CDP) se emparejan con los de la reproducción por posición en la
+  respuesta, y se sustituyen en los parámetros de los comandos siguientes.
+- URLs: los `get` al origen grabado se redirigen a `destino` (p.ej. la app
+  local de mock_app/server.py) o, con `pagina`, todos a una página guardada.
+- Ritmo: "asap" (solo ida y vuelta, para medir transporte) o "recorded"
+  (respeta las pausas del cliente entre comandos, para reproducir un caso lento).
+
+El informe da, por comando y por paso, el tiempo grabado frente al
+reproducido y las divergencias (el comando falló en uno y no en el otro).
+
+Uso:
+    python main.py replay artifacts/commands.jsonl.gz --mock
+    python main.py replay artifacts/commands.jsonl.gz --base-url http://127.0.0.1:8765 --pace recorded
+
+    from utils.command_replay import CommandReplayer
+    informe = CommandReplayer.desde_archivo(driver, "artifacts/commands.jsonl.gz",
+                                            destino="http://127.0.0.1:8765").run()
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from utils.command_recorder import leer_grabacion
+
+W3C_ELEMENT = "element-6066-11e4-a52e-4f735466cecf"
+W3C_SHADOW = "shadow-6066-11e4-a52e-4f735466cecf"
+DEFAULT_REPORT = os.path.join("artifacts", "replay_report.json")
+
+# Comandos que no se re-emiten (la sesión la crea/cierra quien reproduce)
+SIN_REPETIR = {"newSession", "quit"}
+# Comandos cuya respuesta es un handle (o lista de handles) sin clave
+_HANDLES = {"getCurrentWindowHandle", "w3cGetCurrentWindowHandle", "getWindowHandles", "w3cGetWindowHandles"}
+# Clave → espacio de ids (handle de ventana y targetId de CDP son el mismo)
+_ESPACIOS = {
+    W3C_ELEMENT: "element", W3C_SHADOW: "shadow", "handle": "handle", "targetId": "handle",
+    "nodeId": "nodeId", "backendNodeId": "backendNodeId", "objectId": "objectId",
+    "browserContextId": "browserContextId",
+}
+# Parámetros de primer nivel de comandos WebDriver que llevan ids sin envoltorio
+_PARAMS_ID = {"id": "element", "shadowId": "shadow", "handle": "handle"}
+
+
+def _error(resp) -> Optional[str]:
+    """Texto del error de una respuesta cruda de chromedriver (None si fue bien)."""
+    if isinstance(resp, dict):
+        valor = resp.get("value")
+        if isinstance(valor, dict) and valor.get("error"):
+            return str(valor["error"])
+        if resp.get("status") not in (None, 0, 200):
+            return f"status {resp.get('status')}"
+    return None
+
+
+class CommandReplayer:
+    """Reproductor de una grabación sobre un driver."""
+
+    def __init__(self, driver, comandos: List[dict], destino: Optional[str] = None,
+                 pagina: Optional[str] = None, pace: str = "asap"):
+        self.driver = driver
+        self.comandos = comandos
+        self.destino = destino.rstrip("/") if destino else None
+        self.pagina = pagina
+        self.pace = pace
+        self.origen = self._origen_grabado()
+        self.ids: Dict[tuple, object] = {}
+
+    @classmethod
+    def desde_archivo(cls, driver, path: str, **kw) -> "CommandReplayer":
+        _, comandos = leer_grabacion(path)
+        return cls(driver, comandos, **kw)
+
+    def _origen_grabado(self) -> Optional[str]:
+        for c in self.comandos:
+            if c["cmd"] == "get":
+                u = urlsplit(c["params"].get("url", ""))
+                if u.scheme in ("http", "https"):
+                    return f"{u.scheme}://{u.netloc}"
+        return None
+
+    # ---------- remapeo ----------
+
+    def _aprender(self, grabado, nuevo, espacio: Optional[str] = None):
+        """Empareja los ids de la respuesta grabada con los de la reproducción (misma posición)."""
+        if espacio and isinstance(grabado, (str, int)) and isinstance(nuevo, (str, int)):
+            self.ids[(espacio, grabado)] = nuevo
+        elif isinstance(grabado, dict) and isinstance(nuevo, dict):
+            for k, v in grabado.items():
+                if k in nuevo:
+                    self._aprender(v, nuevo[k], _ESPACIOS.get(k))
+        elif isinstance(grabado, list) and isinstance(nuevo, list):
+            for a, b in zip(grabado, nuevo):
+                self._aprender(a, b, espacio)
+
+    def _sustituir(self, valor, espacio: Optional[str] = None):
+        if espacio and isinstance(valor, (str, int)):
+            return self.ids.get((espacio, valor), valor)
+        if isinstance(valor, dict):
+            return {k: self._sustituir(v, _ESPACIOS.get(k)) for k, v in valor.items()}
+        if isinstance(valor, list):
+            return [self._sustituir(v, espacio) for v in valor]
+        return valor
+
+    def _parametros(self, cmd: str, params: dict) -> dict:
+        nuevos = {}
+        for k, v in params.items():
+            espacio = _PARAMS_ID.get(k) if cmd != "executeCdpCommand" else None
+            nuevos[k] = self._sustituir(v, espacio or _ESPACIOS.get(k))
+        if cmd == "get" and "url" in nuevos:
+            nuevos["url"] = self._url(nuevos["url"])
+        return nuevos
+
+    def _url(self, url: str) -> str:
+        if self.pagina:
+            return self.pagina
+        if self.destino and self.origen and url.startswith(self.origen):
+            return self.destino + url[len(self.origen):]
+        return url
+
+    # ---------- reproducción ----------
+
+    def run(self, desde: int = 0, hasta: Optional[int] = None) -> dict:
+        """Reproduce los comandos [desde, hasta) y devuelve el informe."""
+        executor = self.driver.command_executor
+        comandos = [c for c in self.comandos if desde <= c["i"] and (hasta is None or c["i"] < hasta)]
+        filas, divergencias = [], []
+        saltados = 0
+        fin_previo = None
+        t_inicio = time.perf_counter()
+
+        for c in comandos:
+            if c["cmd"] in SIN_REPETIR:
+                saltados += 1
+                continue
+            if self.pace == "recorded" and fin_previo is not None:
+                pausa = c["t"] - fin_previo
+                if pausa > 0:
+                    time.sleep(pausa)
+            fin_previo = c["t"] + c["dur"] / 1000.0
+
+            params = self._parametros(c["cmd"], c.get("params") or {})
+            params["sessionId"] = self.driver.session_id
+            t0 = time.perf_counter()
+            try:
+                resp = executor.execute(c["cmd"], params)
+                error = _error(resp)
+            except Exception as e:
+                resp, error = None, f"{e.__class__.__name__}: {e}"
+            dur = (time.perf_counter() - t0) * 1000
+
+            grabado = c.get("resp")
+            error_grabado = c.get("error") or _error(grabado)
+            if resp is not None and grabado is not None:
+                if c["cmd"] in _HANDLES:
+                    self._aprender(grabado.get("value"), resp.get("value"), "handle")
+                else:
+                    self._aprender(grabado, resp)
+            if bool(error) != bool(error_grabado):
+                divergencias.append({"i": c["i"], "cmd": c["cmd"], "step": c.get("step"),
+                                     "recorded": error_grabado or "ok", "replayed": error or "ok"})
+            filas.append((c["cmd"], c.get("step"), c["dur"], dur))
+
+        return self._informe(filas, divergencias, saltados, time.perf_counter() - t_inicio)
+
+    def _informe(self, filas, divergencias, saltados: int, wall: float) -> dict:
+        def agrupar(i_clave):
+            tabla: Dict[str, list] = {}
+            for fila in filas:
+                t = tabla.setdefault(fila[i_clave] or "?", [0, 0.0, 0.0])
+                t[0] += 1
+                t[1] += fila[2]
+                t[2] += fila[3]
+            out = [{"name": k, "commands": v[0], "recorded_ms": round(v[1], 1), "replay_ms": round(v[2], 1),
+                    "delta_pct": round(100 * (v[2] / v[1] - 1), 1) if v[1] else None}
+                   for k, v in tabla.items()]
+            out.sort(key=lambda f: f["recorded_ms"], reverse=True)
+            return out
+
+        grabado = sum(f[2] for f in filas)
+        reproducido = sum(f[3] for f in filas)
+        return {
+            "commands": len(filas),
+            "skipped": saltados,
+            "divergences": len(divergencias),
+            "recorded_transport_s": round(grabado / 1000, 3),
+            "replay_transport_s": round(reproducido / 1000, 3),
+            "replay_wall_s": round(wall, 3),
+            "origin": self.origen,
+            "target": self.pagina or self.destino or self.origen,
+            "pace": self.pace,
+            "by_command": agrupar(0),
+            "by_step": agrupar(1),
+            "first_divergences": divergencias[:20],
+        }
+
+
+def imprimir_informe(informe: dict, n: int = 10):
+    print("=" * 60)
+    print(f"🎞️ Reproducidos {informe['commands']} comandos ({informe['skipped']} saltados) contra "
+          f"{informe['target']}: transporte {informe['recorded_transport_s']:.1f}s grabado → "
+          f"{informe['replay_transport_s']:.1f}s reproducido; {informe['divergences']} divergencias")
+    print("🎞️ Por paso:")
+    for p in informe["by_step"]:
+        delta = f"{p['delta_pct']:+.0f}%" if p["delta_pct"] is not None else "n/a"
+        print(f"   {p['name']:<16} {p['commands']:>6} cmd  {p['recorded_ms'] / 1000:7.2f}s → "
+              f"{p['replay_ms'] / 1000:7.2f}s  ({delta})")
+    print("🎞️ Por comando:")
+    for c in informe["by_command"][:n]:
+        print(f"   {c['name']:<28} {c['commands']:>6} cmd  {c['recorded_ms'] / 1000:7.2f}s → "
+              f"{c['replay_ms'] / 1000:7.2f}s")
+    for d in informe["first_divergences"][:5]:
+        print(f"⚠️ #{d['i']} {d['cmd']} ({d['step']}): grabado {d['recorded']}, reproducido {d['replayed']}")
+
+
+def guardar_informe(informe: dict, path: str = DEFAULT_REPORT) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    return path
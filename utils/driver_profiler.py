@@ -0,0 +1,260 @@
+# utils/driver_profiler.py
+"""
+DriverProfiler - Cuenta y mide cada comando WebDriver (ida y vuelta HTTP)
+
+Envuelve `driver.command_executor.execute` (el transporte hacia chromedriver),
+así cada find_element(s), execute_script, click, is_displayed... queda medido
+y atribuido a:
+
+- el paso en curso (listener de StepEngine, o el span "step" de utils/tracing)
+- la función de la fachada (utils/elements.py) que lo originó
+- el sitio de llamada: primera línea de nuestro código fuera de selenium
+  (p.ej. utils/retry_strategy.py:170 _force_click_send_button)
+
+Con esto se ve qué cadenas de XPath de fallback o qué bucles de polling
+cuestan más round trips.
+
+Activación:
+    MAP_PROFILE=1                       → build_driver lo instala; al cerrar el driver
+                                          (quit, o al salir del proceso) imprime el
+                                          informe y guarda artifacts/driver_profile.json
+    MAP_PROFILE=artifacts/perfil_f7n    → mismo, guardando en esa ruta (.json)
+
+    Cada driver tiene su propio informe: el primero del proceso en la ruta
+    indicada y los siguientes (p.ej. un Chrome nuevo por test con BrowserPool)
+    en <ruta>_2.json, _3...
+
+    # o explícito
+    from utils.driver_profiler import DriverProfiler
+    prof = DriverProfiler(driver).install()
+    flow.engine.add_listener(prof)
+    ...
+    prof.print_report()
+
+Con MAP_TRACE activo cada comando además aparece como span "driver" en la traza.
+"""
+import atexit
+import json
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils import tracing
+
+DEFAULT_PATH = os.path.join("artifacts", "driver_profile.json")
+FUERA_DE_PASO = "(fuera de paso)"
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ESTE = os.path.abspath(__file__)
+_SELENIUM = os.sep + "selenium" + os.sep
+_FACHADA = os.path.join(_RAIZ, "utils", "elements.py")
+
+
+def _agregar(tabla: Dict[str, list], clave: str, dur: float):
+    fila = tabla.get(clave)
+    if fila is None:
+        tabla[clave] = [1, dur]
+    else:
+        fila[0] += 1
+        fila[1] += dur
+
+
+def _filas(tabla: Dict[str, list], n: Optional[int] = None) -> list:
+    filas = [{"name": k, "commands": v[0], "seconds": round(v[1], 4),
+              "mean_ms": round(v[1] / v[0] * 1000, 2)} for k, v in tabla.items()]
+    filas.sort(key=lambda f: f["seconds"], reverse=True)
+    return filas[:n] if n else filas
+
+
+class DriverProfiler:
+    """Perfilador de comandos WebDriver de un driver."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._original = None
+        self._lock = threading.Lock()
+        self._paso: Optional[str] = None
+        # se llama una vez tras el comando "quit" (p.ej. guardar el informe)
+        self.al_cerrar: Optional[Callable[[], Any]] = None
+        self.reset()
+
+    # ---------- instalación ----------
+
+    def install(self) -> "DriverProfiler":
+        """Envuelve el transporte del driver (idempotente)."""
+        if self._original is not None:
+            return self
+        executor = self.driver.command_executor
+        self._original = executor.execute
+        executor.execute = self._execute
+        self.driver._map_profiler = self
+        return self
+
+    def uninstall(self):
+        if self._original is None:
+            return
+        executor = self.driver.command_executor
+        if executor.__dict__.get("execute") == self._execute:
+            del executor.execute
+        self._original = None
+
+    def reset(self):
+        self.total = [0, 0.0]
+        self.comandos: Dict[str, list] = {}
+        self.sitios: Dict[str, list] = {}
+        self.fachada: Dict[str, list] = {}
+        self.pasos: Dict[str, Dict[str, Any]] = {}
+        self.t_inicio = time.time()
+
+    # ---------- listener de StepEngine ----------
+
+    def on_step_start(self, step, role):
+        self._paso = step.name
+
+    def on_step_end(self, step, result):
+        self._paso = None
+
+    # ---------- medición ----------
+
+    def _execute(self, command, params):
+        sitio, funcion = self._origen()
+        t0 = time.perf_counter()
+        try:
+            with tracing.span(command, "driver", site=sitio):
+                return self._original(command, params)
+        finally:
+            self._registrar(command, time.perf_counter() - t0, sitio, funcion)
+            if command == "quit" and self.al_cerrar is not None:
+                al_cerrar, self.al_cerrar = self.al_cerrar, None
+                al_cerrar()
+
+    def _origen(self):
+        """(sitio de llamada, función de la fachada) recorriendo la pila."""
+        sitio, funcion = None, None
+        f = sys._getframe(2)
+        profundidad = 0
+        while f is not None and profundidad < 60:
+            archivo = f.f_code.co_filename
+            if sitio is None and _SELENIUM not in archivo and archivo != _ESTE:
+                rel = os.path.relpath(archivo, _RAIZ) if archivo.startswith(_RAIZ) else os.path.basename(archivo)
+                sitio = f"{rel}:{f.f_lineno} {f.f_code.co_name}"
+            if archivo == _FACHADA and not f.f_code.co_name.startswith("_"):
+                funcion = f.f_code.co_name  # nos quedamos con la más externa
+            f = f.f_back
+            profundidad += 1
+        return sitio or "?", funcion or "(sin fachada)"
+
+    def _paso_actual(self) -> str:
+        sp = tracing.current_of("step")
+        if sp is not None:
+            return sp.name
+        return self._paso or FUERA_DE_PASO
+
+    def _registrar(self, command: str, dur: float, sitio: str, funcion: str):
+        paso = self._paso_actual()
+        with self._lock:
+            self.total[0] += 1
+            self.total[1] += dur
+            _agregar(self.comandos, command, dur)
+            _agregar(self.sitios, sitio, dur)
+            _agregar(self.fachada, funcion, dur)
+            p = self.pasos.setdefault(paso, {"commands": 0, "seconds": 0.0, "by_command": {}})
+            p["commands"] += 1
+            p["seconds"] += dur
+            _agregar(p["by_command"], command, dur)
+
+    # ---------- informe ----------
+
+    def report(self, n: int = 15) -> Dict[str, Any]:
+        """Informe agregado: totales, por paso, por comando, por función de fachada y sitios."""
+        with self._lock:
+            return {
+                "commands": self.total[0],
+                "transport_seconds": round(self.total[1], 3),
+                "wall_seconds": round(time.time() - self.t_inicio, 3),
+                "steps": {k: {"commands": v["commands"], "seconds": round(v["seconds"], 3),
+                              "by_command": _filas(v["by_command"])}
+                          for k, v in self.pasos.items()},
+                "by_command": _filas(self.comandos),
+                "by_facade": _filas(self.fachada, n),
+                "top_sites": _filas(self.sitios, n),
+            }
+
+    def print_report(self, n: int = 10):
+        r = self.report(n)
+        if not r["commands"]:
+            return
+        print("=" * 60)
+        print(f"🛰️ WebDriver: {r['commands']} comandos, {r['transport_seconds']:.1f}s en transporte "
+              f"de {r['wall_seconds']:.1f}s")
+        print("🛰️ Por paso:")
+        for nombre, p in r["steps"].items():
+            top = ", ".join(f"{c['name']}×{c['commands']}" for c in p["by_command"][:3])
+            print(f"   {nombre:<16} {p['commands']:>6} cmd  {p['seconds']:7.2f}s  ({top})")
+        print("🛰️ Por función de fachada:")
+        for f in r["by_facade"]:
+            print(f"   {f['seconds']:7.2f}s  {f['commands']:>6} cmd  {f['name']}")
+        print("🛰️ Sitios de llamada más costosos:")
+        for s in r["top_sites"]:
+            print(f"   {s['seconds']:7.2f}s  {s['commands']:>6} cmd  {s['mean_ms']:6.1f} ms/cmd  {s['name']}")
+
+    def save(self, path: str = DEFAULT_PATH) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(n=50), f, indent=2, ensure_ascii=False)
+        return path
+
+
+def profiler_de(driver) -> Optional[DriverProfiler]:
+    """Perfilador instalado en `driver` (None si no hay)."""
+    return getattr(driver, "_map_profiler", None)
+
+
+_rutas_lock = threading.Lock()
+_drivers_perfilados = 0
+
+
+def _ruta_de_driver(ruta: str) -> str:
+    """`ruta` para el primer driver del proceso, `<ruta>_2.json`, `_3`... para los siguientes."""
+    global _drivers_perfilados
+    with _rutas_lock:
+        _drivers_perfilados += 1
+        n = _drivers_perfilados
+    base = ruta[:-len(".json")]
+    if mp.parent_process() is not None:
+        base += f"_{os.getpid()}"
+    if n > 1:
+        base += f"_{n}"
+    return base + ".json"
+
+
+def instalar_desde_env(driver) -> Optional[DriverProfiler]:
+    """
+    Instala el perfilador si MAP_PROFILE está activo. El informe (y su JSON,
+    uno por driver) se emite al hacer quit o, si el driver sigue vivo, al salir.
+    """
+    valor = os.getenv("MAP_PROFILE", "").strip()
+    if not valor or valor.lower() in ("0", "false", "no"):
+        return None
+    prof = DriverProfiler(driver).install()
+    ruta = DEFAULT_PATH if valor.lower() in ("1", "true", "si", "yes") else valor
+    if not ruta.endswith(".json"):
+        ruta += ".json"
+    ruta = _ruta_de_driver(ruta)
+
+    def _emitir():
+        # una sola vez: tras quit se suelta el atexit (y con él el driver)
+        atexit.unregister(_emitir)
+        try:
+            prof.print_report()
+            if prof.total[0]:
+                print(f"🛰️ Informe guardado en {prof.save(ruta)}")
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el informe de WebDriver: {e}")
+
+    prof.al_cerrar = _emitir
+    atexit.register(_emitir)
+    return prof
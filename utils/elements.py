@@ -22,6 +22,7 @@ manejan diferentes tipos de campos:
         - SignatureActions   → canvas de firma
         - TableActions       → tablas interactivas (F7n)
         - FileActions        → subida de archivos
+        - CommonActions      → esperas globales (toasts/spinners)
 
 
 ## Cómo Agregar Nuevas Interacciones
@@ -37,6 +38,12 @@ manejan diferentes tipos de campos:
    ```
 4. Los Page Objects ya pueden usar `reproducir_video()` directamente
 
+## Trazas
+
+Las funciones públicas llevan `@traced("facade")` (o `"wait"` para las esperas):
+con MAP_TRACE activo cada llamada queda como span dentro del paso y del método
+de page object que la invocó (ver `utils/tracing.py`).
+
 ## Nota Importante
 
 Este módulo NO debe contener lógica de negocio compleja. Solo debe:
@@ -65,6 +72,9 @@ from utils.actions.file_actions import FileActions
 from utils.actions.text_actions import TextActions
 from utils.actions.numeric_actions import NumericActions
 from utils.actions.date_actions import DateActions
+from utils.actions.common_actions import CommonActions
+from utils.actions.form_index import FormIndex
+from utils.tracing import traced
 
 
 # =========================
@@ -120,21 +130,26 @@ def _ensure_focus_on_input(driver, wait, etiqueta: str):
     sa = SelectActions(driver, wait)
     return sa._ensure_focus_on_input(etiqueta)
 
-def seleccion_multiple(driver, wait, etiqueta: str, opciones: List[str] | str, delay_typing=0.10):
+@traced("facade")
+def seleccion_multiple(driver, wait, etiqueta: str, opciones: List[str] | str, delay_typing=0.10,
+                       rapido: bool = True):
     """Facade wrapper: delega en SelectActions.seleccion_multiple."""
     sa = SelectActions(driver, wait)
-    return sa.seleccion_multiple(etiqueta, opciones, delay_typing=delay_typing)
+    return sa.seleccion_multiple(etiqueta, opciones, delay_typing=delay_typing, rapido=rapido)
 
+@traced("facade")
 def assert_chips(driver, wait, etiqueta: str, esperados: List[str]):
     """Aserción útil para los tests."""
     sa = SelectActions(driver, wait)
     return sa.assert_chips(etiqueta, esperados)
 
+@traced("facade")
 def seleccion_simple(driver, wait, etiqueta, texto, opcion=1):
     """Facade wrapper: delega en SelectActions.seleccion_simple."""
     sa = SelectActions(driver, wait)
     return sa.seleccion_simple(etiqueta, texto, opcion=opcion)
 
+@traced("facade")
 def campo_endpoint(
     driver, wait: WebDriverWait,
     xpath_boton_lupa: str,
@@ -152,6 +167,7 @@ def campo_endpoint(
 # Helpers básicos de elemento
 # =========================
 
+@traced("facade")
 def click_xpath(driver, wait, xpath: str, timeout: int = 15):
     locator = (By.XPATH, xpath)
     el = wait.until(EC.element_to_be_clickable(locator))
@@ -178,6 +194,7 @@ def click_xpath(driver, wait, xpath: str, timeout: int = 15):
             driver.execute_script("arguments[0].click();", el)
             return
 
+@traced("facade")
 def escribir_xpath(driver, wait: WebDriverWait, xpath: str, texto: str):
     elem = wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", elem)
@@ -190,27 +207,22 @@ def escribir_xpath(driver, wait: WebDriverWait, xpath: str, texto: str):
 # Esperas “inteligentes”
 # =========================
 
+@traced("wait")
 def esperar_notificaciones_y_cargas(driver, wait: WebDriverWait, timeout: int = 20):
-    fin = time.time() + timeout
-    while time.time() < fin:
-        try:
-            pushing = driver.find_elements(By.CLASS_NAME, "pushing")
-            toasts = driver.find_elements(By.CLASS_NAME, "push-notification-container")
-            spinners = driver.find_elements(
-                By.CSS_SELECTOR,
-                ".MuiBackdrop-root, .loading, .spinner, .MuiCircularProgress-root"
-            )
-            if not pushing and not spinners:
-                return
-        except Exception:
-            pass
-        time.sleep(0.3)
+    """Facade wrapper: delega en CommonActions.esperar_notificaciones_y_cargas.
 
+    Devuelve {"waited_on": [...], "elapsed": s, "timed_out": bool}.
+    """
+    ca = CommonActions(driver, wait)
+    return ca.esperar_notificaciones_y_cargas(timeout=timeout)
+
+@traced("wait")
 def esperar_notificacion(driver, timeout: int = 20):
     w = WebDriverWait(driver, timeout)
     w.until(EC.presence_of_element_located((By.CLASS_NAME, "push-notification-container")))
     w.until_not(EC.presence_of_element_located((By.CLASS_NAME, "pushing")))
 
+@traced("wait")
 def esperar_formulario_por_label(driver, wait: WebDriverWait, etiqueta: str, timeout_extra: int = 0):
     if timeout_extra:
         wait._timeout = max(wait._timeout, wait._timeout + timeout_extra)
@@ -223,21 +235,31 @@ def esperar_formulario_por_label(driver, wait: WebDriverWait, etiqueta: str, tim
 # Inputs por label
 # =========================
 
+@traced("facade")
 def campo_texto_por_label(driver, wait: WebDriverWait, etiqueta: str, texto: str):
     """Facade wrapper: delega en TextActions.campo_texto_por_label."""
     ta = TextActions(driver, wait)
     return ta.campo_texto_por_label(etiqueta, texto)
 
+@traced("facade")
+def llenar_formulario(driver, wait: WebDriverWait, campos: Dict[str, object]):
+    """Facade wrapper: delega en TextActions.llenar_campos (llenado en bloque)."""
+    ta = TextActions(driver, wait)
+    return ta.llenar_campos(campos)
+
+@traced("facade")
 def campo_texto_por_label_index(driver, wait, etiqueta: str, texto: str, index: int = 1):
     """Facade wrapper: delega en TextActions.campo_texto_por_label_index."""
     ta = TextActions(driver, wait)
     return ta.campo_texto_por_label_index(etiqueta, texto, index=index)
 
+@traced("facade")
 def assert_input_value_by_label_index(driver, wait, etiqueta: str, expected: str, index: int = 1):
     """Facade wrapper: delega en TextActions.assert_input_value_by_label_index."""
     ta = TextActions(driver, wait)
     return ta.assert_input_value_by_label_index(etiqueta, expected, index=index)
 
+@traced("facade")
 def campo_texto_por_label_despues_de(driver, wait, base_label: str, target_label: str, texto: str):
     """Facade wrapper: delega en TextActions.campo_texto_por_label_despues_de."""
     ta = TextActions(driver, wait)
@@ -248,6 +270,7 @@ def campo_texto_por_label_despues_de(driver, wait, base_label: str, target_label
 # Otros campos comunes
 # =========================
 
+@traced("facade")
 def escribir_fecha(driver, wait, label: str, dt_text: str, timeout: int = 10):
     """Wrapper delegating to DateActions."""
     actions = DateActions(driver, wait)
@@ -258,6 +281,7 @@ def _to_formats(dt_text):
     actions = DateActions(None, None)  # no needed for this method
     return actions._to_formats(dt_text)
 
+@traced("facade")
 def set_date_like_a_pro(driver, locator, dt_text, timeout=10):
     """Wrapper delegating to DateActions."""
     actions = DateActions(driver, None)
@@ -266,6 +290,7 @@ def set_date_like_a_pro(driver, locator, dt_text, timeout=10):
 
 
 
+@traced("facade")
 def campo_numerico(driver, wait, etiqueta: str, valor):
     """Facade wrapper: delega en NumericActions.campo_numerico."""
     na = NumericActions(driver, wait)
@@ -276,6 +301,7 @@ def campo_numerico(driver, wait, etiqueta: str, valor):
 # Envío / navegación
 # =========================
 
+@traced("facade")
 def enviar_y_confirmar(driver, wait: WebDriverWait):
     botones = wait.until(
         EC.presence_of_all_elements_located((By.XPATH, "//button[contains(@class,'btn-green')]"))
@@ -285,6 +311,7 @@ def enviar_y_confirmar(driver, wait: WebDriverWait):
     boton_enviar = botones[-1]
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", boton_enviar)
     boton_enviar.click()
+    FormIndex.invalidate_for(driver)
     print("✅ Formulario enviado")
 
     try:
@@ -297,6 +324,7 @@ def enviar_y_confirmar(driver, wait: WebDriverWait):
     except TimeoutException:
         print("⚠️ No se encontró botón azul de confirmación (posible confirmación automática).")
 
+@traced("facade")
 def abrir_siguiente_formulario(driver, wait: WebDriverWait, xpath_tarea: str, descripcion: str = "Formulario"):
     esperar_notificacion(driver)
     print("🔔 Notificación cerrada")
@@ -304,24 +332,56 @@ def abrir_siguiente_formulario(driver, wait: WebDriverWait, xpath_tarea: str, de
     driver.execute_script("arguments[0].click();", elem)
     print(f"✅ Se abrió {descripcion}")
 
-def abrir_tarea_por_texto(driver, wait: WebDriverWait, texto_formulario: str, descripcion: str | None = None):
+
+class TareaAmbigua(LookupError):
+    """Hay varias tareas con el mismo texto y ninguna menciona el contexto pedido."""
+
+
+@traced("facade")
+def abrir_tarea_por_texto(driver, wait: WebDriverWait, texto_formulario: str, descripcion: str | None = None,
+                          contexto: str | None = None, exigir_contexto: bool = False):
+    """
+    Abre la tarea cuyo texto contiene `texto_formulario`.
+
+    Con `contexto` (p.ej. el id del permiso) se prefiere el task-item que
+    además lo menciona; si ninguno lo hace se abre la primera coincidencia.
+    Con `exigir_contexto` (lotes) eso solo se admite si la coincidencia es
+    única: con varias se lanza TareaAmbigua en lugar de abrir la de otro permiso.
+    """
     esperar_notificaciones_y_cargas(driver, wait, timeout=20)
     xpaths = [
         f"//div[contains(@class,'task-item')]//span[contains(normalize-space(.), \"{texto_formulario}\")]",
         f"//div[contains(@class,'form') and contains(normalize-space(.), \"{texto_formulario}\")]",
         f"//*[@id='task-info']//span[contains(normalize-space(.), \"{texto_formulario}\")]",
     ]
+    xp_ctx = (
+        f"//div[contains(@class,'task-item')][contains(normalize-space(.), \"{texto_formulario}\") "
+        f"and contains(normalize-space(.), \"{contexto}\")]"
+    ) if contexto else None
     last_exc: Optional[Exception] = None
     for xp in xpaths:
         try:
             el = wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-            driver.execute_script("arguments[0].click();", el)
-            print(f"✅ Se abrió {descripcion or texto_formulario}")
-            return
         except Exception as e:
             last_exc = e
             continue
+        # la lista ya pintó: el task-item del contexto se busca sin esperar
+        etiqueta = descripcion or texto_formulario
+        if xp_ctx:
+            items = driver.find_elements(By.XPATH, xp_ctx)
+            if items:
+                el, etiqueta = items[0], f"{etiqueta} ({contexto})"
+            elif exigir_contexto and len(driver.find_elements(By.XPATH, xpaths[0])) > 1:
+                raise TareaAmbigua(
+                    f"Varias tareas '{texto_formulario}' y ninguna menciona '{contexto}'"
+                )
+            else:
+                print(f"ℹ️ Ninguna tarea '{texto_formulario}' menciona '{contexto}'; se abre la primera")
+        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
+        driver.execute_script("arguments[0].click();", el)
+        FormIndex.invalidate_for(driver)
+        print(f"✅ Se abrió {etiqueta}")
+        return
     print(f"⚠️ No se pudo abrir la tarea por texto: '{texto_formulario}'. Último error: {last_exc}")
     if last_exc:
         raise last_exc
@@ -332,6 +392,7 @@ def abrir_tarea_por_texto(driver, wait: WebDriverWait, texto_formulario: str, de
 # Tabla de riesgos (F7n)
 # =========================
 
+@traced("facade")
 def marcar_tabla_riesgos(
     driver,
     wait: WebDriverWait,
@@ -346,6 +407,7 @@ def marcar_tabla_riesgos(
     ta = TableActions(driver, wait)
     return ta.marcar_tabla_riesgos(tabla_xpath, respuestas, default=default)
 
+@traced("wait")
 def esperar_label_flexible(driver, etiqueta: str, timeout: float = 12.0):
     """
     Espera a que exista un control identificado por 'etiqueta' aunque el render sea perezoso.
@@ -388,6 +450,7 @@ def esperar_label_flexible(driver, etiqueta: str, timeout: float = 12.0):
 
     raise TimeoutException(f"No apareció el campo con etiqueta '{etiqueta}' dentro del tiempo.")
 
+@traced("facade")
 def campo_cuales_para(driver, wait, base_label: str, valor: str, timeout: int = 10):
     """Facade wrapper: delega en TextActions.campo_cuales_para."""
     ta = TextActions(driver, wait)
@@ -399,6 +462,7 @@ def _buscar_canvas_firma(driver, wait, etiqueta: str | None):
     return sa._buscar_canvas_firma(etiqueta)
 
 
+@traced("facade")
 def campo_firma(
     driver,
     wait,
@@ -412,6 +476,7 @@ def campo_firma(
     return sa.campo_firma(etiqueta=etiqueta, trazos=trazos, click_boton_firmar=click_boton_firmar)
 
 
+@traced("facade")
 def subir_archivo(driver, wait, etiqueta_boton: str, ruta_archivo: str, timeout: int = 30):
     """Facade wrapper: delega en FileActions.subir_archivo.
 
@@ -427,6 +492,7 @@ def _buscar_input_file_en_dom(driver):
     return fa._buscar_input_file_en_dom()
 
 
+@traced("facade")
 def subir_archivo_por_boton(driver, wait, etiqueta_boton: str, ruta_archivo: str, timeout: int = 6):
     """Facade wrapper: delega en FileActions.subir_archivo_por_boton."""
     fa = FileActions(driver, wait)
@@ -0,0 +1,69 @@
+# utils/fixture_files.py
+"""
+Archivos de prueba generados al vuelo (sin rutas fijas de una máquina concreta).
+
+`imagen_png(kb)` crea un PNG válido de aproximadamente `kb` kilobytes en un
+directorio temporal y devuelve su ruta absoluta. Los píxeles son aleatorios,
+así que la compresión apenas reduce el tamaño y el archivo pesa lo pedido.
+Se reutiliza el mismo archivo mientras exista (una generación por tamaño).
+
+Uso:
+    from utils.fixture_files import imagen_png
+    ruta = imagen_png(200)          # ~200 KB
+    subir_archivo(driver, wait, "Seleccionar una foto", ruta)
+"""
+import os
+import struct
+import tempfile
+import zlib
+from typing import Optional
+
+ANCHO_PX = 256
+_DIR_DEFECTO = os.path.join(tempfile.gettempdir(), "map_fixtures")
+
+
+def _chunk(tipo: bytes, datos: bytes) -> bytes:
+    crc = zlib.crc32(tipo + datos) & 0xFFFFFFFF
+    return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", crc)
+
+
+def imagen_png(kb: int = 200, directorio: Optional[str] = None, nombre: Optional[str] = None) -> str:
+    """
+    Genera (o reutiliza) un PNG RGB de ~`kb` KB.
+
+    Args:
+        kb: Tamaño aproximado en kilobytes (mínimo 1)
+        directorio: Carpeta destino (por defecto <tmp>/map_fixtures)
+        nombre: Nombre del archivo (por defecto foto_<kb>kb.png)
+
+    Returns:
+        Ruta absoluta del archivo.
+    """
+    kb = max(1, int(kb))
+    directorio = directorio or _DIR_DEFECTO
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.abspath(os.path.join(directorio, nombre or f"foto_{kb}kb.png"))
+    if os.path.exists(ruta):
+        return ruta
+
+    fila = 1 + ANCHO_PX * 3                      # byte de filtro + RGB
+    alto = max(1, -(-kb * 1024 // fila))         # ceil
+    crudo = b"".join(b"\x00" + os.urandom(ANCHO_PX * 3) for _ in range(alto))
+
+    png = b"\x89PNG\r\n\x1a\n"
+    png += _chunk(b"IHDR", struct.pack(">IIBBBBB", ANCHO_PX, alto, 8, 2, 0, 0, 0))
+    png += _chunk(b"IDAT", zlib.compress(crudo, 1))
+    png += _chunk(b"IEND", b"")
+
+    # temporal propio de este proceso: varios workers pueden generar el mismo
+    # archivo a la vez y cada os.replace deja en `ruta` un PNG completo
+    fd, tmp = tempfile.mkstemp(dir=directorio, prefix=os.path.basename(ruta) + ".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(png)
+        os.replace(tmp, ruta)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return ruta
@@ -12,6 +12,8 @@ Responsabilidades:
 - Esperar que aparezca/desaparezca una tarea en la lista
 - Volver a la vista de tareas después de enviar
 - Refrescar y sincronizar estado de la UI
+- Detectar asignación de tareas desde la propia página (MutationObserver),
+  sin recargas completas
 
 Uso:
     from utils.navigation_helper import NavigationHelper
@@ -25,11 +27,52 @@ from typing import Optional
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from utils.waits import ensure_script_timeout
+
+
+# Observa el DOM hasta que el XPath de la tarea aparezca (visible) o desaparezca.
+_JS_WATCH_TASK = """
+const xp = arguments[0], modo = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const t0 = performance.now();
+let finished = false, obs = null, timer = null;
+
+function visible() {
+    const r = document.evaluate(xp, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < r.snapshotLength; i++) {
+        if (r.snapshotItem(i).getClientRects().length) return true;
+    }
+    return false;
+}
+function finish(matched) {
+    if (finished) return;
+    finished = true;
+    if (obs) obs.disconnect();
+    clearTimeout(timer);
+    done({matched: matched, elapsed_ms: performance.now() - t0});
+}
+function check() {
+    const v = visible();
+    if ((modo === 'appear' && v) || (modo === 'disappear' && !v)) finish(true);
+}
+
+check();
+if (!finished) {
+    obs = new MutationObserver(check);
+    obs.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(() => finish(false), timeoutMs);
+}
+"""
 
 
 class NavigationHelper:
     """Asistente para navegación y esperas en la aplicación."""
 
+    # Recarga forzada si la lista no cambia en este tiempo. Corto (como el
+    # polling original, 2-3 s) hasta confirmar que la app actualiza la lista con
+    # el push; si lo hace, el observer detecta antes y la recarga casi no ocurre.
+    RECARGA_CADA = 5.0
+
     def __init__(self, driver, wait, base_url: str):
         """
         Args:
@@ -67,76 +110,143 @@ class NavigationHelper:
             )
             self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
 
-    def wait_for_task_to_appear(self, texto: str, timeout: int = 90, refresh_cada: float = 3.0):
+    def wait_for_task_to_appear(self, texto: str, timeout: int = 90, refresh_cada: float = 3.0,
+                                recarga_cada: Optional[float] = None):
         """
-        Refresca la home y espera a que la tarea con 'texto' sea clickeable.
+        Espera a que la tarea con 'texto' sea clickeable en la lista de tareas.
 
         Útil para esperar que una tarea se asigne al usuario actual.
 
+        La detección ocurre dentro de la página (MutationObserver sobre la
+        lista, que la app actualiza al llegar la notificación push), sin
+        recargar. Si pasan `recarga_cada` segundos sin cambios se recarga la
+        home, por si la lista no se actualiza con la notificación.
+
         Args:
             texto: Texto de la tarea a buscar
             timeout: Tiempo máximo de espera en segundos
-            refresh_cada: Frecuencia de refresco en segundos
+            refresh_cada: Frecuencia de refresco (solo en el modo polling de respaldo)
+            recarga_cada: Segundos de observación antes de forzar una recarga
+                (por defecto RECARGA_CADA)
 
         Raises:
             TimeoutException: Si la tarea no aparece en el tiempo especificado
         """
-        from utils.elements import esperar_notificaciones_y_cargas
-
-        xp = (
-            f"//div[contains(@class,'task-item')]//span[contains(normalize-space(.), \"{texto}\")]"
-            f"|//div[contains(@class,'form') and contains(normalize-space(.), \"{texto}\")]"
-            f"|//*[@id='task-info']//span[contains(normalize-space(.), \"{texto}\")]"
-        )
-
+        xp = self._task_xpath(texto)
         fin = time.time() + timeout
-        while time.time() < fin:
-            try:
-                self.driver.get(self.base_url)
-            except Exception:
-                pass
-
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=20)
+        recarga_cada = recarga_cada or self.RECARGA_CADA
+        self._ensure_on_tasks_list()
 
-            try:
+        while time.time() < fin:
+            restante = fin - time.time()
+            found = self._watch_task(xp, "appear", min(restante, recarga_cada))
+            if found is None:
+                return self._poll_task_to_appear(xp, texto, fin, refresh_cada)
+            if found:
                 self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
                 return
-            except Exception:
-                time.sleep(refresh_cada)
+            if time.time() < fin:
+                self._reload_tasks_list()
 
         raise TimeoutException(f"No apareció la tarea '{texto}' en {timeout}s")
 
-    def wait_for_task_to_disappear(self, texto: str, timeout: int = 60, refresh_cada: float = 2.0):
+    def wait_for_task_to_disappear(self, texto: str, timeout: int = 60, refresh_cada: float = 2.0,
+                                   recarga_cada: Optional[float] = None):
         """
-        Refresca la home y espera a que la tarea con 'texto' YA NO se vea (desasignación).
+        Espera a que la tarea con 'texto' YA NO se vea (desasignación).
 
         Útil para verificar que una tarea fue reasignada a otro usuario.
+        Igual que wait_for_task_to_appear: observa la lista en la página y
+        recarga si no hubo cambios en `recarga_cada` segundos.
 
         Args:
             texto: Texto de la tarea a buscar
             timeout: Tiempo máximo de espera en segundos
-            refresh_cada: Frecuencia de refresco en segundos
+            refresh_cada: Frecuencia de refresco (solo en el modo polling de respaldo)
+            recarga_cada: Segundos de observación antes de forzar una recarga
+                (por defecto RECARGA_CADA)
         """
-        from utils.elements import esperar_notificaciones_y_cargas
+        xp = self._task_xpath(texto)
+        fin = time.time() + timeout
+        recarga_cada = recarga_cada or self.RECARGA_CADA
+        self._ensure_on_tasks_list()
+
+        while time.time() < fin:
+            restante = fin - time.time()
+            gone = self._watch_task(xp, "disappear", min(restante, recarga_cada))
+            if gone is None:
+                return self._poll_task_to_disappear(xp, fin, refresh_cada)
+            if gone:
+                return
+            if time.time() < fin:
+                self._reload_tasks_list()
+
+    # ---------- internos: observación de la lista de tareas ----------
 
-        xp = (
+    @staticmethod
+    def _task_xpath(texto: str) -> str:
+        return (
             f"//div[contains(@class,'task-item')]//span[contains(normalize-space(.), \"{texto}\")]"
             f"|//div[contains(@class,'form') and contains(normalize-space(.), \"{texto}\")]"
             f"|//*[@id='task-info']//span[contains(normalize-space(.), \"{texto}\")]"
         )
 
-        fin = time.time() + timeout
+    def _ensure_on_tasks_list(self):
+        """Navega a la home solo si no estamos ya en la vista de tareas."""
+        try:
+            en_lista = self.driver.execute_script(
+                "return location.href.indexOf(arguments[0]) === 0 && "
+                "!!document.querySelector('#tasks, #task-info, .tasks, .task-list');",
+                self.base_url,
+            )
+        except Exception:
+            en_lista = False
+        if not en_lista:
+            self._reload_tasks_list()
+
+    def _reload_tasks_list(self):
+        from utils.elements import esperar_notificaciones_y_cargas
+
+        try:
+            self.driver.get(self.base_url)
+        except Exception:
+            pass
+        esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=20)
+
+    def _watch_task(self, xp: str, modo: str, segundos: float) -> Optional[bool]:
+        """
+        Observa la página hasta que la tarea aparezca/desaparezca o pasen `segundos`.
+
+        Returns:
+            True si se cumplió, False si venció el plazo, None si el script
+            no pudo ejecutarse (p.ej. la página navegó) → usar polling.
+        """
+        try:
+            ensure_script_timeout(self.driver, segundos + 5)
+            res = self.driver.execute_async_script(_JS_WATCH_TASK, xp, modo, int(segundos * 1000))
+        except Exception:
+            return None
+        if res.get("matched"):
+            print(f"🔔 Tarea {'asignada' if modo == 'appear' else 'desasignada'} "
+                  f"tras {res.get('elapsed_ms', 0) / 1000:.1f}s (sin recargar)")
+        return bool(res.get("matched"))
+
+    def _poll_task_to_appear(self, xp: str, texto: str, fin: float, refresh_cada: float):
+        """Modo de respaldo: recarga + espera bloqueante + sleep (comportamiento original)."""
         while time.time() < fin:
+            self._reload_tasks_list()
             try:
-                self.driver.get(self.base_url)
+                self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
+                return
             except Exception:
-                pass
-
-            esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=20)
+                time.sleep(refresh_cada)
+        raise TimeoutException(f"No apareció la tarea '{texto}'")
 
+    def _poll_task_to_disappear(self, xp: str, fin: float, refresh_cada: float):
+        while time.time() < fin:
+            self._reload_tasks_list()
             if not self.driver.find_elements(By.XPATH, xp):
                 return
-
             time.sleep(refresh_cada)
 
     def send_and_return_to_list(
@@ -0,0 +1,238 @@
+# utils/perf_budgets.py
+"""
+Perf Budgets - Plugin de pytest con presupuestos de tiempo y control de regresiones
+
+Registra, para cada test, la duración de cada paso del StepEngine
+(StepResult.seconds) y de cada cambio de rol, y la compara con:
+
+1. Presupuestos absolutos de data/perf_budgets.yaml (p.ej. f1a < 20 s, cambio de rol < 8 s)
+2. Una baseline guardada (artifacts/perf_baseline.json): regresión si el tiempo
+   supera la baseline en más de `regression_pct` % y de `min_delta_s` segundos
+
+Solo se miden los tests marcados p1/mock o que usan el fixture `driver`;
+los unitarios con pasos falsos no cuentan.
+
+Cada ejecución se añade a artifacts/perf_history.jsonl (commit + tiempos por
+test) para poder comparar a lo largo del tiempo.
+
+Opciones:
+    --perf-mode warn|fail|off      warn (defecto): avisa; fail: marca el test como fallido
+    --perf-budgets PATH            YAML de presupuestos (defecto data/perf_budgets.yaml)
+    --perf-baseline PATH           JSON de baseline (defecto artifacts/perf_baseline.json)
+    --perf-regression PCT          Sobrescribe regression_pct del YAML
+    --perf-update-baseline         Guarda los tiempos de esta ejecución como nueva baseline
+
+Registro (tests/conftest.py):
+    pytest_plugins = ["utils.perf_budgets"]
+
+Uso:
+    pytest -m p1 --perf-mode fail
+    pytest -m p1 --perf-update-baseline      # tras una ejecución de referencia
+"""
+import json
+import os
+import statistics
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+import pytest
+import yaml
+
+ROLE_SWITCH = "role_switch"
+TOTAL = "total"
+DEFAULT_BUDGETS = os.path.join("data", "perf_budgets.yaml")
+DEFAULT_BASELINE = os.path.join("artifacts", "perf_baseline.json")
+DEFAULT_HISTORY = os.path.join("artifacts", "perf_history.jsonl")
+
+
+class PerfBudgetWarning(UserWarning):
+    """Presupuesto o baseline excedidos en modo warn."""
+
+
+class PerfRecorder:
+    """Listener de StepEngine: acumula las duraciones de pasos y cambios de rol."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def on_step_end(self, step, result):
+        if result.status == "ok":
+            self.samples.setdefault(step.name, []).append(result.seconds)
+
+    def on_role_switch(self, old, new, seconds):
+        self.samples.setdefault(ROLE_SWITCH, []).append(seconds)
+
+    def medidas(self) -> Dict[str, float]:
+        """Por clave: mediana de pasos; máximo de cambios de rol; total = suma de pasos."""
+        out = {}
+        pasos = 0.0
+        for clave, valores in self.samples.items():
+            if clave == ROLE_SWITCH:
+                out[clave] = round(max(valores), 3)
+            else:
+                out[clave] = round(statistics.median(valores), 3)
+                pasos += sum(valores)
+        if pasos:
+            out[TOTAL] = round(pasos, 3)
+        return out
+
+
+def cargar_budgets(path: str) -> dict:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def cargar_baseline(path: str) -> dict:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("tests", {})
+
+
+def limite(budgets: dict, clave: str) -> Optional[float]:
+    if clave in (ROLE_SWITCH, TOTAL):
+        return budgets.get(clave)
+    return (budgets.get("steps") or {}).get(clave)
+
+
+def evaluar(medidas: Dict[str, float], budgets: dict, baseline: Optional[Dict[str, float]] = None,
+            regression_pct: Optional[float] = None) -> List[str]:
+    """
+    Compara las medidas de un test con presupuestos y baseline.
+
+    Returns:
+        Lista de violaciones legibles (vacía si todo está dentro de lo esperado).
+    """
+    pct = budgets.get("regression_pct", 25) if regression_pct is None else regression_pct
+    min_delta = budgets.get("min_delta_s", 0.0)
+    baseline = baseline or {}
+    violaciones = []
+    for clave, seg in medidas.items():
+        tope = limite(budgets, clave)
+        if tope is not None and seg > tope:
+            violaciones.append(f"{clave}: {seg:.1f}s supera el presupuesto de {tope}s")
+        base = baseline.get(clave)
+        if base and seg > base * (1 + pct / 100.0) and seg - base > min_delta:
+            violaciones.append(f"{clave}: {seg:.1f}s es {100 * (seg / base - 1):.0f}% más lento "
+                               f"que la baseline ({base:.1f}s, tolerancia {pct}%)")
+    return violaciones
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "desconocido"
+
+
+def _escribir_json(path: str, data: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# ---------- hooks de pytest ----------
+
+def pytest_addoption(parser):
+    g = parser.getgroup("perf", "Presupuestos de tiempo (utils/perf_budgets.py)")
+    g.addoption("--perf-mode", choices=["warn", "fail", "off"], default=os.getenv("MAP_PERF_MODE", "warn"))
+    g.addoption("--perf-budgets", default=DEFAULT_BUDGETS)
+    g.addoption("--perf-baseline", default=DEFAULT_BASELINE)
+    g.addoption("--perf-regression", type=float, default=None, help="Tolerancia de regresión en %")
+    g.addoption("--perf-update-baseline", action="store_true")
+
+
+def pytest_configure(config):
+    if config.getoption("--perf-mode") == "off":
+        return
+    config._map_perf = {
+        "budgets": cargar_budgets(config.getoption("--perf-budgets")),
+        "baseline": cargar_baseline(config.getoption("--perf-baseline")),
+        "results": {},
+    }
+
+
+# Solo se miden tests que recorren el flujo en un navegador (no los unitarios con pasos falsos)
+MARCAS_MEDIDAS = ("p1", "mock")
+
+
+def _medible(item) -> bool:
+    return "driver" in getattr(item, "fixturenames", ()) or any(
+        item.get_closest_marker(m) for m in MARCAS_MEDIDAS
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    estado = getattr(item.config, "_map_perf", None)
+    if estado is None or not _medible(item):
+        yield
+        return
+    from flows.engine import StepEngine
+
+    rec = PerfRecorder()
+    StepEngine.GLOBAL_LISTENERS.append(rec)
+    try:
+        yield
+    finally:
+        StepEngine.GLOBAL_LISTENERS.remove(rec)
+        medidas = rec.medidas()
+        if medidas:
+            violaciones = evaluar(medidas, estado["budgets"], estado["baseline"].get(item.nodeid),
+                                  item.config.getoption("--perf-regression"))
+            estado["results"][item.nodeid] = {"measures": medidas, "violations": violaciones}
+            item.user_properties.append(("perf", medidas))
+            if violaciones and item.config.getoption("--perf-mode") == "warn":
+                item.warn(PerfBudgetWarning("; ".join(violaciones)))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    estado = getattr(item.config, "_map_perf", None)
+    if estado is None or rep.when != "call":
+        return
+    violaciones = estado["results"].get(item.nodeid, {}).get("violations")
+    if not violaciones:
+        return
+    texto = "⏱️ Presupuesto de tiempo excedido:\n  " + "\n  ".join(violaciones)
+    if item.config.getoption("--perf-mode") == "fail" and rep.passed:
+        rep.outcome = "failed"
+        rep.longrepr = texto
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    estado = getattr(config, "_map_perf", None)
+    if not estado or not estado["results"]:
+        return
+    tr = terminalreporter
+    tr.section("perf budgets")
+    for nodeid, r in estado["results"].items():
+        base = estado["baseline"].get(nodeid, {})
+        tr.write_line(nodeid)
+        for clave, seg in r["measures"].items():
+            tope = limite(estado["budgets"], clave)
+            extra = f"  (presupuesto {tope}s)" if tope is not None else ""
+            if base.get(clave):
+                extra += f"  (baseline {base[clave]:.1f}s, {100 * (seg / base[clave] - 1):+.0f}%)"
+            marca = "❌" if any(v.startswith(f"{clave}:") for v in r["violations"]) else "  "
+            tr.write_line(f"  {marca} {clave:<16} {seg:7.1f}s{extra}")
+
+    commit = _commit()
+    linea = {"commit": commit, "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+             "tests": {k: v["measures"] for k, v in estado["results"].items()}}
+    os.makedirs(os.path.dirname(os.path.abspath(DEFAULT_HISTORY)), exist_ok=True)
+    with open(DEFAULT_HISTORY, "a", encoding="utf-8") as f:
+        f.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+    if config.getoption("--perf-update-baseline"):
+        ruta = config.getoption("--perf-baseline")
+        tests = dict(estado["baseline"])
+        tests.update(linea["tests"])
+        _escribir_json(ruta, {"commit": commit, "created": linea["ts"], "tests": tests})
+        tr.write_line(f"📌 Baseline actualizada en {ruta}")
@@ -26,6 +26,8 @@ from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils import tracing
+
 
 class RetryStrategy:
     """Estrategias de reintentos para operaciones frágiles de Selenium."""
@@ -39,12 +41,15 @@ class RetryStrategy:
         self.driver = driver
         self.wait = wait
 
+    @tracing.traced("retry")
     def retry_open_task(
         self,
         texto: str,
         descripcion: Optional[str] = None,
         intentos: int = 3,
-        backoff: Tuple[float, ...] = (0.8, 1.2, 2.0)
+        backoff: Tuple[float, ...] = (0.8, 1.2, 2.0),
+        contexto: Optional[str] = None,
+        exigir_contexto: bool = False,
     ):
         """
         Intenta abrir una tarea por texto con reintentos y backoff exponencial.
@@ -60,17 +65,22 @@ class RetryStrategy:
             descripcion: Descripción para logs (opcional, usa texto por defecto)
             intentos: Número máximo de intentos
             backoff: Tupla con tiempos de espera en segundos para cada intento
+            contexto: Texto adicional (p.ej. id del permiso) para preferir la tarea que lo menciona
+            exigir_contexto: Con varias coincidencias, no abrir ninguna que no mencione `contexto`
 
         Raises:
             TimeoutException: Si no se pudo abrir tras todos los intentos
+            TareaAmbigua: Con `exigir_contexto`, si la tarea no se puede distinguir (no se reintenta)
         """
         from utils.elements import esperar_notificaciones_y_cargas, abrir_tarea_por_texto
 
         last = None
         for i in range(intentos):
             try:
-                esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=30)
-                abrir_tarea_por_texto(self.driver, self.wait, texto, descripcion or texto)
+                with tracing.span(f"abrir tarea intento {i + 1}", "retry", tarea=texto):
+                    esperar_notificaciones_y_cargas(self.driver, self.wait, timeout=30)
+                    abrir_tarea_por_texto(self.driver, self.wait, texto, descripcion or texto,
+                                          contexto=contexto, exigir_contexto=exigir_contexto)
                 return
             except TimeoutException as e:
                 last = e
@@ -84,6 +94,7 @@ class RetryStrategy:
 
         raise last or TimeoutException(f"No se pudo abrir '{texto}' tras {intentos} intentos")
 
+    @tracing.traced("retry")
     def robust_send_confirm(self, max_reintentos: int = 4):
         """
         Intenta enviar y confirmar con reintentos robustos.
@@ -109,14 +120,15 @@ class RetryStrategy:
             except Exception as e:
                 print(f"⚠️ Reintento enviar_y_confirmar (intento {intento}): {e.__class__.__name__}")
 
-                # Estrategia 1: Cerrar overlays y quitar foco
-                self._close_overlays()
+                with tracing.span(f"recuperar envío intento {intento}", "retry", error=e.__class__.__name__):
+                    # Estrategia 1: Cerrar overlays y quitar foco
+                    self._close_overlays()
 
-                # Estrategia 2: Scroll al pie
-                self._scroll_to_bottom()
+                    # Estrategia 2: Scroll al pie
+                    self._scroll_to_bottom()
 
-                # Estrategia 3: Click forzado por JS al botón verde visible más profundo
-                success = self._force_click_send_button()
+                    # Estrategia 3: Click forzado por JS al botón verde visible más profundo
+                    success = self._force_click_send_button()
 
                 if success:
                     # Esperar fin de notificaciones/cargas y salir OK
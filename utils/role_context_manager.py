@@ -0,0 +1,148 @@
+# utils/role_context_manager.py
+"""
+RoleContextManager - Un contexto de navegador aislado por rol
+
+Alternativa a SessionManager para flujos multi-rol: en lugar de cerrar sesión y
+volver a entrar en la misma pestaña, cada usuario vive en su propio
+*browser context* de Chrome (equivalente a una ventana incógnito: cookies y
+storage aislados) creado vía CDP dentro del MISMO proceso de Chrome.
+
+Todos los roles se loguean una sola vez al inicio; cambiar de rol es solo
+cambiar la pestaña activa del driver.
+
+Responsabilidades:
+- Crear/cerrar browser contexts con Target.createBrowserContext
+- Abrir una pestaña por contexto y loguear al usuario en ella
+- Activar la pestaña del rol pedido (y refrescar su lista de tareas)
+
+Uso:
+    from utils.role_context_manager import RoleContextManager
+
+    contexts = RoleContextManager(driver, wait, login_page)
+    contexts.adopt_current("usuario@example.com")    # pestaña ya logueada
+    contexts.open_all({"operador": {"email": "...", "password": "..."}})
+    contexts.activate("operador@example.com")
+    contexts.close()
+"""
+import time
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException
+
+
+class RoleContextManager:
+    """Mantiene una pestaña logueada por usuario, cada una en un contexto aislado."""
+
+    def __init__(self, driver, wait, login_page):
+        """
+        Args:
+            driver: WebDriver de Selenium (Chrome)
+            wait: WebDriverWait configurado
+            login_page: Instancia de LoginPage para loguear cada contexto
+        """
+        self.driver = driver
+        self.wait = wait
+        self.login_page = login_page
+        # email -> {"context_id": str | None, "handle": str}
+        self._contexts = {}
+        self._origin_handle: Optional[str] = None
+
+    def adopt_current(self, email: str):
+        """Registra la pestaña actual (contexto por defecto, ya logueada) para `email`."""
+        handle = self.driver.current_window_handle
+        self._origin_handle = self._origin_handle or handle
+        self._contexts[email] = {"context_id": None, "handle": handle}
+
+    def open(self, email: str, password: str):
+        """Crea un contexto aislado para `email`, abre una pestaña y loguea en ella."""
+        if self._origin_handle is None:
+            self._origin_handle = self.driver.current_window_handle
+
+        cdp = self.driver.execute_cdp_cmd
+        before = set(self.driver.window_handles)
+        context_id = cdp("Target.createBrowserContext", {"disposeOnDetach": True})["browserContextId"]
+        target_id = cdp("Target.createTarget", {
+            "url": "about:blank",
+            "browserContextId": context_id,
+        })["targetId"]
+
+        handle = self._wait_new_handle(before, target_id)
+        self._contexts[email] = {"context_id": context_id, "handle": handle}
+
+        self.driver.switch_to.window(handle)
+        self.login_page.open()
+        self.login_page.login(email, password)
+        print(f"✅ Contexto aislado listo para {email}")
+
+    def open_all(self, roles: dict):
+        """
+        Loguea por adelantado todos los roles de `data_roles`.
+
+        Args:
+            roles: {"operador": {"email": ..., "password": ...}, ...}
+        """
+        for nombre, cred in (roles or {}).items():
+            if cred.get("email") in self._contexts:
+                continue
+            print(f"🔐 Abriendo contexto para rol '{nombre}'")
+            self.open(cred["email"], cred["password"])
+
+    def has(self, email: str) -> bool:
+        return email in self._contexts
+
+    def activate(self, email: str, password: Optional[str] = None):
+        """
+        Cambia la pestaña activa a la del usuario `email`.
+
+        Si aún no tiene contexto y se pasa `password`, lo crea y loguea.
+        Tras cambiar recarga la vista de tareas, ya que las asignaciones
+        pudieron cambiar mientras la pestaña estaba en segundo plano.
+        """
+        if email not in self._contexts:
+            if password is None:
+                raise KeyError(f"No hay contexto abierto para {email}")
+            self.open(email, password)
+            return
+
+        self.driver.switch_to.window(self._contexts[email]["handle"])
+        try:
+            self.driver.get(self.login_page.base_url)
+        except Exception:
+            pass
+        print(f"🔀 Contexto activo → {email}")
+
+    def close(self):
+        """Cierra las pestañas y descarta los contextos creados; vuelve a la pestaña original."""
+        cdp = self.driver.execute_cdp_cmd
+        for email, ctx in list(self._contexts.items()):
+            if ctx["context_id"] is None:
+                continue
+            try:
+                self.driver.switch_to.window(ctx["handle"])
+                self.driver.close()
+            except Exception:
+                pass
+            try:
+                cdp("Target.disposeBrowserContext", {"browserContextId": ctx["context_id"]})
+            except Exception:
+                pass
+            self._contexts.pop(email, None)
+
+        if self._origin_handle:
+            try:
+                self.driver.switch_to.window(self._origin_handle)
+            except Exception:
+                pass
+
+    def _wait_new_handle(self, before: set, target_id: str, timeout: float = 10) -> str:
+        """chromedriver expone la pestaña nueva como window handle (≈ targetId)."""
+        fin = time.time() + timeout
+        while time.time() < fin:
+            nuevos = [h for h in self.driver.window_handles if h not in before]
+            for h in nuevos:
+                if h == target_id or h.endswith(target_id):
+                    return h
+            if len(nuevos) == 1:
+                return nuevos[0]
+            time.sleep(0.1)
+        raise TimeoutException(f"chromedriver no expuso la pestaña del target {target_id}")
@@ -2,24 +2,27 @@
 """
 SessionManager - Gestión de Sesiones Multi-Usuario
 
-Clase especializada para manejar login, logout y cambios de sesión entre diferentes
+Clase especializada para manejar login y cambios de sesión entre diferentes
 roles de usuario en los flujos de pruebas automatizadas.
 
 Esta clase fue extraída de FlowP1._cambiar_sesion() como parte del patrón de
 refactorización "Single Responsibility Principle".
 
 Responsabilidades:
-- Logout del usuario actual (múltiples estrategias)
+- Limpieza de cookies/storage del usuario actual (vía CDP, sin logout en el servidor)
 - Login con nuevas credenciales
 - Verificación de sesión activa
-- Manejo de pantallas intermedias
+- Snapshots de sesión por rol (cookies + localStorage/sessionStorage) para
+  cambiar de rol restaurando el estado vía CDP en lugar de login por UI
 
 Uso:
     from utils.session_manager import SessionManager
 
     session_mgr = SessionManager(driver, wait, login_page)
+    session_mgr.capture_snapshot("usuario@example.com")   # tras el login inicial
     session_mgr.change_session("operador@example.com", "password123")
 """
+import json
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
@@ -29,26 +32,35 @@ from selenium.webdriver.support.ui import WebDriverWait
 class SessionManager:
     """Gestiona cambios de sesión entre diferentes usuarios/roles."""
 
-    def __init__(self, driver, wait, login_page):
+    # Campos que acepta Network.setCookies (Network.getAllCookies devuelve más)
+    _COOKIE_PARAMS = (
+        "name", "value", "domain", "path", "secure", "httpOnly",
+        "sameSite", "expires", "priority", "sourceScheme", "sourcePort", "partitionKey",
+    )
+
+    def __init__(self, driver, wait, login_page, snapshot_ttl: float = 20 * 60):
         """
         Args:
             driver: WebDriver de Selenium
             wait: WebDriverWait configurado
             login_page: Instancia de LoginPage para manejar el login
+            snapshot_ttl: Segundos que se considera válido un snapshot de sesión
         """
         self.driver = driver
         self.wait = wait
         self.login_page = login_page
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshots = {}
 
     def change_session(self, email: str, password: str):
         """
-        Cierra sesión del usuario actual y entra con nuevas credenciales.
-
-        Soporta dos flujos:
-        - Navbar con menú de usuario → Cerrar Sesión
-        - Página /user con botón directo "Cerrar Sesión"
+        Cambia al usuario indicado.
 
-        Si ya estamos deslogueados, entra directo al login.
+        Si existe un snapshot vigente de ese usuario, lo restaura (una sola
+        navegación). Si no, limpia cookies y storage vía CDP y entra con las
+        credenciales. No se cierra sesión por UI: el logout del servidor
+        invalidaría el token que guarda el snapshot del usuario saliente
+        (p.ej. el solicitante, que se restaura en F11).
 
         Args:
             email: Email del nuevo usuario
@@ -56,118 +68,164 @@ class SessionManager:
         """
         print(f"🔄 Cambiando sesión → {email}")
 
-        # 1) Ir directo a /user (suele mostrar botón 'Cerrar Sesión')
-        try:
-            self.driver.get("https://apperator.ibisagroup.com/user")
-        except Exception:
-            pass
-
-        # 2) Intentar cerrar sesión en /user
-        cerro = self._try_logout_from_user_page()
+        if self.restore_snapshot(email):
+            print("✅ Sesión restaurada desde snapshot")
+            return
 
-        # 3) Si no se pudo desde /user, intentar vía navbar (menú de usuario)
-        if not cerro:
-            cerro = self._try_logout_from_navbar()
+        self._login_limpio(email, password)
+        self.capture_snapshot(email)
 
-        # 4) Esperar a estar en login (o dar click en "Ingresar" si aparece)
-        self._handle_intermediate_screen()
+    def _login_limpio(self, email: str, password: str):
+        """Login desde un navegador sin estado de sesión (camino usado cuando no hay snapshot)."""
+        self._limpiar_estado()
 
-        # 5) Loguear con el nuevo usuario (método ya tolerante de landing)
-        self.login_page.open()       # navega a base_url
-        self.login_page.login(email, password)
-
-        # 6) Confirmar que estamos dentro (navbar/tareas)
+        self.login_page.open()       # navega a base_url, ya sin sesión
+        self.login_page.login(email, password)  # también pulsa "Ingresar" si aparece
         self._verify_login_success()
 
         print("✅ Sesión iniciada con nuevo rol")
 
-    def _try_logout_from_user_page(self) -> bool:
+    def _limpiar_estado(self):
         """
-        Intenta cerrar sesión desde la página /user.
-
-        Returns:
-            bool: True si se logró cerrar sesión, False en caso contrario
+        Borra cookies y storage del origen de la app sin tocar el servidor
+        (la sesión anterior sigue válida para su snapshot).
         """
-        logout_xpaths = [
-            "//button[contains(., 'Cerrar Sesión') or contains(., 'Cerrar sesión')]",
-            "//*[@id='logout' or @data-testid='logout']",
-            "//a[contains(., 'Cerrar Sesión') or contains(., 'Cerrar sesión')]",
-        ]
-
-        for xp in logout_xpaths:
-            try:
-                btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
-                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                self.driver.execute_script("arguments[0].click();", btn)
-                print("✅ Clic en 'Cerrar Sesión' (vista /user)")
-                return True
-            except Exception:
-                continue
+        origen = self.login_page.base_url
+        cdp = self.driver.execute_cdp_cmd
+        try:
+            cdp("Network.clearBrowserCookies", {})
+            cdp("Storage.clearDataForOrigin", {
+                "origin": origen, "storageTypes": "local_storage,indexeddb,service_workers,cache_storage",
+            })
+        except Exception:
+            # sin CDP (otro navegador): WebDriver estándar
+            self.driver.delete_all_cookies()
+        # sessionStorage es por pestaña: se limpia desde la página actual si es del origen
+        try:
+            self.driver.execute_script(
+                "if (location.origin === arguments[0]) { try { localStorage.clear(); sessionStorage.clear(); }"
+                " catch (_) {} }", origen
+            )
+        except Exception:
+            pass
 
-        return False
+    # =======================
+    #   Snapshots por rol
+    # =======================
 
-    def _try_logout_from_navbar(self) -> bool:
+    def capture_snapshot(self, email: str) -> bool:
         """
-        Intenta cerrar sesión desde el navbar (menú de usuario).
+        Guarda el estado de autenticación actual (cookies + storage) para `email`.
+
+        Debe llamarse con la sesión de ese usuario ya iniciada.
 
         Returns:
-            bool: True si se logró cerrar sesión, False en caso contrario
+            bool: True si se pudo capturar
         """
         try:
-            # Ir a home por si acaso
-            self.driver.get("https://apperator.ibisagroup.com/")
-
-            # Abrir menú de usuario (puede ser avatar o botón con nombre)
-            menu_user_xps = [
-                "//*[@id='navbar']//button[contains(@class,'user') or contains(@class,'avatar') or @aria-haspopup='menu']",
-                "//*[@id='navbar']//*[contains(@class,'avatar') or contains(@class,'MuiAvatar-root')]",
-                "//*[@id='navbar']//button",
-            ]
-
-            opened = False
-            for xp in menu_user_xps:
-                try:
-                    btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
-                    self.driver.execute_script("arguments[0].click();", btn)
-                    opened = True
-                    break
-                except Exception:
-                    continue
+            cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+            storage = self.driver.execute_script(
+                "const dump = s => { const o = {}; for (let i = 0; i < s.length; i++) {"
+                " const k = s.key(i); o[k] = s.getItem(k); } return o; };"
+                "return {local: dump(window.localStorage), session: dump(window.sessionStorage)};"
+            )
+        except Exception as e:
+            print(f"⚠️ No se pudo capturar snapshot de {email}: {e.__class__.__name__}")
+            return False
+
+        self._snapshots[email] = {
+            "cookies": cookies,
+            "local": storage.get("local") or {},
+            "session": storage.get("session") or {},
+            "ts": time.time(),
+        }
+        return True
+
+    def has_valid_snapshot(self, email: str) -> bool:
+        """True si hay snapshot de `email` dentro del TTL y sin cookies vencidas."""
+        snap = self._snapshots.get(email)
+        if not snap:
+            return False
+        now = time.time()
+        if now - snap["ts"] > self.snapshot_ttl:
+            return False
+        # cookies de sesión traen expires=-1; las persistentes no deben estar vencidas
+        return all(c.get("expires", -1) <= 0 or c["expires"] > now for c in snap["cookies"])
+
+    def restore_snapshot(self, email: str) -> bool:
+        """
+        Restaura el snapshot de `email`: limpia cookies/storage, inyecta el estado
+        guardado vía CDP y hace una única navegación a base_url.
 
-            if not opened:
-                return False
+        Si el snapshot venció o la app no reconoce la sesión restaurada, lo
+        descarta y devuelve False para que se haga login con credenciales.
+        """
+        if not self.has_valid_snapshot(email):
+            self._snapshots.pop(email, None)
+            return False
 
-            # Click en opción "Cerrar Sesión" del menú
-            logout_xpaths = [
-                "//button[contains(., 'Cerrar Sesión') or contains(., 'Cerrar sesión')]",
-                "//*[@id='logout' or @data-testid='logout']",
-                "//a[contains(., 'Cerrar Sesión') or contains(., 'Cerrar sesión')]",
+        snap = self._snapshots[email]
+        cdp = self.driver.execute_cdp_cmd
+        script_id = None
+        try:
+            cdp("Network.enable", {})
+            cdp("Network.clearBrowserCookies", {})
+            cookies = [
+                {k: v for k, v in c.items() if k in self._COOKIE_PARAMS and not (k == "expires" and v <= 0)}
+                for c in snap["cookies"]
             ]
-
-            for xp in logout_xpaths:
+            if cookies:
+                cdp("Network.setCookies", {"cookies": cookies})
+
+            # El storage se inyecta antes de que corra el JS de la app en la próxima carga
+            source = (
+                "(function(){ try {"
+                " localStorage.clear(); sessionStorage.clear();"
+                f" const l = {json.dumps(snap['local'])}, s = {json.dumps(snap['session'])};"
+                " for (const k in l) localStorage.setItem(k, l[k]);"
+                " for (const k in s) sessionStorage.setItem(k, s[k]);"
+                " } catch (_) {} })();"
+            )
+            script_id = cdp("Page.addScriptToEvaluateOnNewDocument", {"source": source}).get("identifier")
+            self.driver.get(self.login_page.base_url)
+        except Exception as e:
+            print(f"⚠️ No se pudo restaurar snapshot de {email}: {e.__class__.__name__}")
+            self._snapshots.pop(email, None)
+            return False
+        finally:
+            if script_id:
                 try:
-                    item = self.wait.until(EC.element_to_be_clickable((By.XPATH, xp)))
-                    self.driver.execute_script("arguments[0].click();", item)
-                    print("✅ Clic en 'Cerrar Sesión' (menú navbar)")
-                    return True
+                    cdp("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
                 except Exception:
-                    continue
+                    pass
 
-        except Exception:
-            pass
+        if self._is_logged_in(timeout=8):
+            return True
 
+        print(f"ℹ️ Snapshot de {email} ya no es válido en el servidor; se usa login con credenciales")
+        self._snapshots.pop(email, None)
         return False
 
-    def _handle_intermediate_screen(self):
+    def _is_logged_in(self, timeout: float = 8, asentar: float = 0.5) -> bool:
         """
-        Maneja pantalla intermedia con botón "Ingresar" si aparece.
+        True si la lista de tareas (datos del servidor) aparece y el login no
+        vuelve a mostrarse en `asentar` segundos.
+
+        El navbar solo no basta: la app lo pinta desde el token guardado antes
+        de que el servidor lo rechace.
         """
+        login_xp = "//*[@id='no-loged-screen'] | //input[@type='email' or @name='email']"
         try:
-            from utils.elements import click_xpath
-            click_xpath(self.driver, self.wait, "//*[@id='no-loged-screen']/button")
-            print("ℹ️ Pantalla intermedia 'Ingresar' detectada y clickeada")
+            WebDriverWait(self.driver, timeout).until(lambda d: d.find_elements(
+                By.XPATH,
+                "//*[@id='task-info' or contains(@class,'tasks') or contains(@class,'task-list')] | " + login_xp
+            ))
+            if self.driver.find_elements(By.XPATH, login_xp):
+                return False
+            time.sleep(asentar)
+            return not self.driver.find_elements(By.XPATH, login_xp)
         except Exception:
-            pass
+            return False
 
     def _verify_login_success(self):
         """
@@ -0,0 +1,290 @@
+# utils/tracing.py
+"""
+Tracing - Spans anidados para saber dónde se va el tiempo de un flujo
+
+Jerarquía típica de una ejecución de FlowP1:
+
+    step (f1a)                      ← StepEngine.run_step
+      page (F1aPermisoTrabajoPage.fill_form)
+        facade (seleccion_simple)   ← @traced en utils/elements.py
+          wait / retry              ← esperas globales y reintentos
+
+Se activa con la variable de entorno MAP_TRACE (o `enable()`):
+    MAP_TRACE=1                     → artifacts/trace.json + artifacts/trace.jsonl
+    MAP_TRACE=artifacts/mi_run      → artifacts/mi_run.json + artifacts/mi_run.jsonl
+
+Al terminar el proceso exporta:
+- Chrome trace-event JSON (abrir en https://ui.perfetto.dev o chrome://tracing)
+- JSONL plano (un span por línea) para análisis con pandas/jq
+y muestra un resumen con los spans más lentos y el tiempo propio por nombre.
+
+Desactivado, `span()` devuelve un objeto nulo compartido y `@traced` llama
+directamente a la función: el coste es una comprobación de un booleano.
+
+Uso:
+    from utils import tracing
+
+    with tracing.span("abrir tarea", "step", tarea=texto):
+        ...
+
+    @tracing.traced("facade")
+    def seleccion_simple(driver, wait, etiqueta, texto, opcion=1):
+        ...
+"""
+import atexit
+import functools
+import json
+import multiprocessing as mp
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_PREFIX = os.path.join("artifacts", "trace")
+MAX_SPANS = int(os.getenv("MAP_TRACE_MAX", "200000"))
+
+_ACTIVO = False
+_prefijo: Optional[str] = None
+_spans: List[Dict[str, Any]] = []
+_lock = threading.Lock()
+_local = threading.local()
+_t_base = time.perf_counter()
+_atexit_registrado = False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    """Span abierto; al salir del `with` se registra con su duración y tiempo propio."""
+
+    __slots__ = ("name", "cat", "args", "t0", "hijos", "depth", "parent")
+
+    def __init__(self, name: str, cat: str, args: Dict[str, Any]):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.t0 = 0.0
+        self.hijos = 0.0
+        self.depth = 0
+        self.parent: Optional[str] = None
+
+    def set(self, **args):
+        """Añade argumentos al span (p.ej. resultado) antes de cerrarlo."""
+        self.args.update(args)
+
+    def __enter__(self):
+        pila = _pila()
+        if pila:
+            self.parent = pila[-1].name
+        self.depth = len(pila)
+        pila.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, exc, tb):
+        dur = time.perf_counter() - self.t0
+        pila = _pila()
+        if pila and pila[-1] is self:
+            pila.pop()
+        if pila:
+            pila[-1].hijos += dur
+        if tipo is not None:
+            self.args["error"] = tipo.__name__
+        _registrar({
+            "name": self.name,
+            "cat": self.cat,
+            "ts_us": round((self.t0 - _t_base) * 1e6),
+            "dur_us": round(dur * 1e6),
+            "self_us": round(max(0.0, dur - self.hijos) * 1e6),
+            "depth": self.depth,
+            "parent": self.parent,
+            "tid": threading.get_ident(),
+            "thread": threading.current_thread().name,
+            "args": self.args,
+        })
+        return False
+
+
+def _pila() -> List[Span]:
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def _registrar(registro: Dict[str, Any]):
+    with _lock:
+        if len(_spans) < MAX_SPANS:
+            _spans.append(registro)
+
+
+# ---------- API ----------
+
+def enabled() -> bool:
+    return _ACTIVO
+
+
+def enable(prefijo: Optional[str] = None, al_salir: bool = True):
+    """Activa el tracing; con `al_salir` exporta y resume al terminar el proceso."""
+    global _ACTIVO, _prefijo, _atexit_registrado
+    _ACTIVO = True
+    _prefijo = prefijo or _prefijo or DEFAULT_PREFIX
+    if al_salir and not _atexit_registrado:
+        atexit.register(_al_salir)
+        _atexit_registrado = True
+
+
+def disable():
+    global _ACTIVO
+    _ACTIVO = False
+
+
+def reset():
+    """Descarta los spans registrados (los abiertos siguen su curso)."""
+    with _lock:
+        _spans.clear()
+
+
+def span(name: str, cat: str = "app", **args):
+    """Context manager de un span; objeto nulo si el tracing está desactivado."""
+    if not _ACTIVO:
+        return _NULL
+    return Span(name, cat, args)
+
+
+def traced(cat: str = "app", name: Optional[str] = None):
+    """
+    Decorador: envuelve cada llamada en un span con el nombre de la función.
+
+    El primer argumento de texto (etiqueta, xpath, texto de tarea...) se guarda
+    como `target` para distinguir llamadas a la misma función.
+    """
+    def deco(fn: Callable):
+        nombre = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            if not _ACTIVO:
+                return fn(*a, **kw)
+            objetivo = next((x for x in a if isinstance(x, str)), None)
+            with Span(nombre, cat, {"target": objetivo[:120]} if objetivo else {}):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def current() -> Optional[Span]:
+    """Span más interno abierto en este hilo (None si no hay)."""
+    pila = getattr(_local, "pila", None)
+    return pila[-1] if pila else None
+
+
+def current_of(cat: str) -> Optional[Span]:
+    """Span abierto más interno de la categoría `cat` (p.ej. "step", "facade")."""
+    for s in reversed(getattr(_local, "pila", None) or []):
+        if s.cat == cat:
+            return s
+    return None
+
+
+def spans() -> List[Dict[str, Any]]:
+    with _lock:
+        return list(_spans)
+
+
+# ---------- exportación y resumen ----------
+
+def export_chrome(path: str) -> str:
+    """Exporta en formato Chrome trace-event (eventos completos "X")."""
+    pid = os.getpid()
+    eventos = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"MAP {pid}"}}]
+    hilos = {}
+    for s in spans():
+        hilos.setdefault(s["tid"], s["thread"])
+        eventos.append({"name": s["name"], "cat": s["cat"], "ph": "X", "ts": s["ts_us"],
+                        "dur": s["dur_us"], "pid": pid, "tid": s["tid"], "args": s["args"]})
+    for tid, nombre in hilos.items():
+        eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nombre}})
+    _escribir(path, json.dumps({"traceEvents": eventos, "displayTimeUnit": "ms"}, ensure_ascii=False, default=str))
+    return path
+
+
+def export_jsonl(path: str) -> str:
+    """Exporta un span por línea (orden de cierre)."""
+    _escribir(path, "".join(json.dumps(s, ensure_ascii=False, default=str) + "\n" for s in spans()))
+    return path
+
+
+def top(n: int = 10) -> List[Dict[str, Any]]:
+    """Los `n` spans individuales más largos."""
+    return sorted(spans(), key=lambda s: s["dur_us"], reverse=True)[:n]
+
+
+def por_nombre(n: int = 10) -> List[Dict[str, Any]]:
+    """Agregado por (cat, nombre): llamadas, total y tiempo propio, ordenado por tiempo propio."""
+    agg: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans():
+        a = agg.setdefault((s["cat"], s["name"]),
+                           {"cat": s["cat"], "name": s["name"], "calls": 0, "total_us": 0, "self_us": 0})
+        a["calls"] += 1
+        a["total_us"] += s["dur_us"]
+        a["self_us"] += s["self_us"]
+    return sorted(agg.values(), key=lambda a: a["self_us"], reverse=True)[:n]
+
+
+def print_summary(n: int = 10):
+    if not _spans:
+        return
+    print("=" * 60)
+    print(f"🔎 Trazas: {len(_spans)} span(s); {n} más lentos:")
+    for s in top(n):
+        print(f"   {s['dur_us'] / 1e6:8.2f}s  [{s['cat']}] {s['name']}"
+              + (f"  ← {s['parent']}" if s["parent"] else ""))
+    print("🔎 Tiempo propio por nombre:")
+    for a in por_nombre(n):
+        print(f"   {a['self_us'] / 1e6:8.2f}s  [{a['cat']}] {a['name']} ×{a['calls']}")
+
+
+def finish(prefijo: Optional[str] = None, n: int = 10) -> Optional[Dict[str, str]]:
+    """Exporta <prefijo>.json/.jsonl y muestra el resumen; None si no hay spans."""
+    if not _spans:
+        return None
+    prefijo = prefijo or _prefijo or DEFAULT_PREFIX
+    if mp.parent_process() is not None:
+        prefijo = f"{prefijo}_{os.getpid()}"  # workers del runner: un archivo por proceso
+    rutas = {"chrome": export_chrome(prefijo + ".json"), "jsonl": export_jsonl(prefijo + ".jsonl")}
+    print_summary(n)
+    print(f"🔎 Trazas exportadas en {rutas['chrome']} (Perfetto) y {rutas['jsonl']}")
+    return rutas
+
+
+def _al_salir():
+    try:
+        finish()
+    except Exception as e:
+        print(f"⚠️ No se pudieron exportar las trazas: {e}")
+
+
+def _escribir(path: str, texto: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(texto)
+
+
+_env = os.getenv("MAP_TRACE", "").strip()
+if _env and _env.lower() not in ("0", "false", "no"):
+    enable(None if _env.lower() in ("1", "true", "si", "yes") else _env)
@@ -4,3 +4,10 @@ DEFAULT_TIMEOUT = 15
 
 def build_wait(driver, timeout: int = DEFAULT_TIMEOUT):
     return WebDriverWait(driver, timeout)
+
+def ensure_script_timeout(driver, segundos: float):
+    """Sube el script timeout del driver (execute_async_script) solo si no alcanza."""
+    actual = getattr(driver, "_map_script_timeout", 0)
+    if actual < segundos:
+        driver.set_script_timeout(segundos)
+        driver._map_script_timeout = segundos